@@ -1,7 +1,8 @@
 from ninja import NinjaAPI, Schema, Swagger
 
-from api.api.v1 import budgets, categories, content, documents, events, expenses, invoices, leads, marketing_campaigns, orders, payments, property, quotes, services, stats
+from api.api.v1 import batch, budgets, categories, clients, content, documents, events, expenses, invoices, leads, marketing_campaigns, orders, payments, property, quotes, services, stats, sync
 from api.utils.auth import AuthBearer
+from api.utils.renderers import ORJSONParser, ORJSONRenderer
 
 
 # Initialize NinjaAPI with authentication
@@ -10,6 +11,8 @@ api = NinjaAPI(
     version="1.0.0",
     docs_url="/docs/",
     auth=AuthBearer(),  # Require authentication for all endpoints by default
+    renderer=ORJSONRenderer(),
+    parser=ORJSONParser(),
     docs=Swagger(settings={"persistAuthorization": True})
 
 )
@@ -21,8 +24,10 @@ class HealthCheckResponse(Schema):
     message: str
 
 # Register routers (all protected by default auth)
+api.add_router("/batch", batch.router)
 api.add_router("/budgets", budgets.router)
 api.add_router("/categories", categories.router)
+api.add_router("/clients", clients.router)
 api.add_router("/content", content.router)
 api.add_router("/documents", documents.router)
 api.add_router("/events", events.router)
@@ -36,3 +41,4 @@ api.add_router("/marketing-campaigns", marketing_campaigns.router)
 api.add_router("/payments", payments.router)
 api.add_router("/properties", property.router)
 api.add_router("/stats", stats.router)
+api.add_router("/sync", sync.router)
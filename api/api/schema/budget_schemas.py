@@ -1,4 +1,4 @@
-from ninja import Schema
+from ninja import Field, Schema
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
@@ -24,7 +24,7 @@ class BudgetUpdate(Schema):
 
 class BudgetOut(Schema):
     id: int
-    invoice_id: int
+    invoice_id: int = Field(..., validation_alias="invoice_id_id")  # the FK field itself is named invoice_id
     project_id: str
     budget_date: date
     amount: Decimal
@@ -35,6 +35,23 @@ class BudgetOut(Schema):
     updated_at: datetime
 
 
+class BudgetStatusBreakdownOut(Schema):
+    draft: int
+    approved: int
+    paid: int
+    cancelled: int
+
+
+class BudgetSummaryOut(Schema):
+    project_id: str
+    total_budget: Decimal
+    paid_budget: Decimal
+    approved_budget: Decimal
+    draft_budget: Decimal
+    budget_count: int
+    status_breakdown: BudgetStatusBreakdownOut
+
+
 class BudgetListOut(Schema):
     count: int
     results: List[BudgetOut]
@@ -1,5 +1,84 @@
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar
+
 from ninja import Schema
 
 class MessageSchema(Schema):
     """Schema for success/error messages"""
     detail: str
+
+
+ItemT = TypeVar('ItemT')
+
+
+class BatchGetIn(Schema):
+    """IDs to fetch; duplicates are returned once"""
+    ids: List[int]
+
+
+class BatchGetOut(Schema, Generic[ItemT]):
+    """Records in the requested order, and the requested IDs that do not exist"""
+    items: List[ItemT]
+    missing: List[int]
+
+
+class BatchCallIn(Schema):
+    """One call of a batch; `path` is relative to the API root and may carry a query string"""
+    id: Optional[str] = None
+    method: Literal['GET', 'POST', 'PUT', 'PATCH', 'DELETE'] = 'GET'
+    path: str
+    body: Any = None
+
+
+class BatchIn(Schema):
+    """Calls run in order; `parallel` runs consecutive GETs concurrently, `atomic` runs everything in one transaction"""
+    requests: List[BatchCallIn]
+    parallel: bool = False
+    atomic: bool = False
+
+
+class BatchCallOut(Schema):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+
+class BatchOut(Schema):
+    """Responses in request order; `rolled_back` when an atomic batch failed"""
+    responses: List[BatchCallOut]
+    rolled_back: bool
+
+
+class BulkImportIn(Schema):
+    """Rows to import, each shaped like the resource's create payload"""
+    rows: List[Dict[str, Any]]
+
+
+class BulkRowErrorOut(Schema):
+    row: int
+    errors: Dict[str, str]
+
+
+class BulkImportOut(Schema):
+    created: int
+    failed: int
+    errors: List[BulkRowErrorOut]
+
+
+class BulkStatusIn(Schema):
+    """Target status plus the rows to move: explicit IDs, list-route filters, or both"""
+    status: str
+    ids: Optional[List[int]] = None
+    filters: Optional[Dict[str, str]] = None
+
+
+class SyncPageOut(Schema):
+    """Rows changed and IDs deleted after the cursor; send `cursor` back to continue"""
+    items: List[Dict[str, Any]]
+    deleted: List[int]
+    cursor: str
+    has_more: bool
+
+
+class BulkStatusOut(Schema):
+    status: str
+    updated: int
@@ -1,5 +1,5 @@
 from ninja import Schema
-from typing import Optional, List
+from typing import Any, Optional, List, Dict
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -51,6 +51,17 @@ class ServiceOut(Schema):
     created_by: str
 
 
+class CatalogOut(Schema):
+    """Full catalog, or with since_version the changes since that version"""
+    version: int
+    since_version: Optional[int] = None
+    full: bool
+    services: List[ServiceOut]
+    categories: List[ServiceCategoryOut]
+    deleted_services: List[int]
+    deleted_categories: List[int]
+
+
 # Client Reference Schema (for embedded client info)
 class ClientRefOut(Schema):
     """Client reference info - data comes from main backend"""
@@ -327,6 +338,60 @@ class ServiceStatsOut(Schema):
     total_orders: int
     total_quotes: int
     total_invoices: int
+    status_breakdown: Optional[Dict[str, Dict[str, int]]] = None
+
+
+# Client Overview Schemas
+class ClientTotalsOut(Schema):
+    leads: int
+    quotes: int
+    orders: int
+    open_orders: int
+    invoices: int
+    overdue_invoices: int
+    invoiced: Decimal
+    paid: Decimal
+    outstanding_balance: Decimal
+    properties: int
+    documents: int
+
+
+class ClientOverviewOut(Schema):
+    """Most recent records per resource (list-route items, relations as IDs) and totals over all of them"""
+    client_id: str
+    totals: ClientTotalsOut
+    leads: List[Dict[str, Any]]
+    quotes: List[Dict[str, Any]]
+    orders: List[Dict[str, Any]]
+    invoices: List[Dict[str, Any]]
+    properties: List[Dict[str, Any]]
+    documents: List[Dict[str, Any]]
+
+
+class CacheRouteStatsOut(Schema):
+    route: str
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class CacheStatsOut(Schema):
+    routes: List[CacheRouteStatsOut]
+    # per-process tier counters: local_hits, shared_hits, misses, sets, early_refreshes
+    backend: Dict[str, int]
+
+
+class DatabaseStatsOut(Schema):
+    alias: str
+    vendor: str
+    conn_max_age: Optional[int]
+    health_checks: bool
+    # server connections this process has opened (from the pool's counters when pooled)
+    opened: int
+    # connections borrowed from the pool, when pooled
+    checkouts: Optional[int] = None
+    # psycopg_pool counters (pool_size, pool_available, requests_waiting, ...) when pooled
+    pool: Optional[Dict[str, int]] = None
 
 
 # Error Schemas
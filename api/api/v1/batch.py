@@ -0,0 +1,14 @@
+from ninja import Router
+
+from api.api.schema.others import BatchIn, BatchOut, MessageSchema
+from api.utils.batch import run_batch
+
+
+router = Router(tags=["Batch"])
+
+
+@router.post("", response={200: BatchOut, 400: MessageSchema})
+def batch(request, payload: BatchIn):
+    """Run several API calls with one authentication; see api.utils.batch."""
+    root = request.path[:-len("batch")]
+    return run_batch(request, root, payload.requests, parallel=payload.parallel, atomic=payload.atomic)
@@ -4,17 +4,36 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from django.core.exceptions import ValidationError
 
-from api.api.schema.budget_schemas import BudgetIn, BudgetOut, BudgetUpdate
-from api.api.schema.others import MessageSchema
+from api.api.schema.budget_schemas import BudgetIn, BudgetOut, BudgetUpdate, BudgetSummaryOut
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.budget import Budget
+from api.utils.auth import AsyncAuthBearer
+from api.utils.batch_get import batch_get
+from api.utils.dashboard import abudget_summaries
+from api.utils.export import ExportFormat, stream_export
+from api.utils.projection import project, projected
 from ninja.pagination import paginate, LimitOffsetPagination
 
 
 router = Router(tags=["Budgets"])
 
 
+def _filter_budgets(budgets, status=None, project_id=None, payment_method=None, search=None):
+    """Filters shared by the list and export routes."""
+    if status:
+        budgets = budgets.filter(status=status)
+    if project_id:
+        budgets = budgets.filter(project_id=project_id)
+    if payment_method:
+        budgets = budgets.filter(payment_method=payment_method)
+    if search:
+        budgets = budgets.filter(Q(project_id__icontains=search))
+    return budgets
+
+
 @router.get("", response=List[BudgetOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def list_budgets(
     request,
     status: str = None,
@@ -23,18 +42,21 @@ def list_budgets(
     search: str = None
 ):
     """List all budgets with optional filtering."""
-    budgets = Budget.objects.all()
+    return _filter_budgets(Budget.objects.all(), status, project_id, payment_method, search)
 
-    if status:
-        budgets = budgets.filter(status=status)
-    if project_id:
-        budgets = budgets.filter(project_id=project_id)
-    if payment_method:
-        budgets = budgets.filter(payment_method=payment_method)
-    if search:
-        budgets = budgets.filter(Q(project_id__icontains=search))
 
-    return budgets
+@router.get("/export")
+def export_budgets(
+    request,
+    format: ExportFormat = "csv",
+    status: str = None,
+    project_id: str = None,
+    payment_method: str = None,
+    search: str = None
+):
+    """Stream every matching budget as CSV or NDJSON."""
+    budgets = _filter_budgets(Budget.objects.all(), status, project_id, payment_method, search)
+    return stream_export(budgets, BudgetOut, format, "budgets")
 
 
 @router.post("", response={201: BudgetOut, 400: MessageSchema})
@@ -49,10 +71,25 @@ def create_budget(request, payload: BudgetIn):
         return 400, {'detail': str(e)}
 
 
+@router.get("/summary", response=List[BudgetSummaryOut], auth=AsyncAuthBearer())
+async def get_budget_summaries(request, project_ids: str):
+    """Get budget summaries for several projects (comma-separated project_ids)."""
+    ids = list(dict.fromkeys(pid.strip() for pid in project_ids.split(",") if pid.strip()))
+    return await abudget_summaries(ids)
+
+
+@router.post("/batch-get", response={200: BatchGetOut[BudgetOut], 400: MessageSchema})
+@projected
+def batch_get_budgets(request, payload: BatchGetIn):
+    """Get several budgets by ID, in the requested order."""
+    return batch_get(request, Budget.objects.all(), payload.ids)
+
+
 @router.get("/{budget_id}", response=BudgetOut)
+@projected
 def get_budget(request, budget_id: int):
     """Get a specific budget by ID."""
-    return get_object_or_404(Budget, id=budget_id)
+    return get_object_or_404(project(request, Budget.objects.all()), id=budget_id)
 
 
 @router.put("/{budget_id}", response={200: BudgetOut, 400: MessageSchema, 404: MessageSchema})
@@ -85,33 +122,14 @@ def delete_budget(request, budget_id: int):
 
 @router.get("/invoice/{invoice_id}", response=List[BudgetOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_budgets_by_invoice(request, invoice_id: int):
     """Get all budgets for a specific invoice ID."""
     budgets = Budget.objects.filter(invoice_id=invoice_id)
     return budgets
 
 
-@router.get("/project/{project_id}/summary")
-def get_project_budget_summary(request, project_id: str):
+@router.get("/project/{project_id}/summary", response=BudgetSummaryOut, auth=AsyncAuthBearer())
+async def get_project_budget_summary(request, project_id: str):
     """Get budget summary for a specific project."""
-    budgets = Budget.objects.filter(project_id=project_id)
-
-    total_budget = sum(budget.amount for budget in budgets)
-    paid_budget = sum(budget.amount for budget in budgets.filter(status="paid"))
-    approved_budget = sum(budget.amount for budget in budgets.filter(status="approved"))
-    draft_budget = sum(budget.amount for budget in budgets.filter(status="draft"))
-
-    return {
-        "project_id": project_id,
-        "total_budget": total_budget,
-        "paid_budget": paid_budget,
-        "approved_budget": approved_budget,
-        "draft_budget": draft_budget,
-        "budget_count": budgets.count(),
-        "status_breakdown": {
-            "draft": budgets.filter(status="draft").count(),
-            "approved": budgets.filter(status="approved").count(),
-            "paid": budgets.filter(status="paid").count(),
-            "cancelled": budgets.filter(status="cancelled").count()
-        }
-    }
+    return (await abudget_summaries([project_id]))[0]
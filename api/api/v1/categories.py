@@ -4,8 +4,11 @@ from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 
 from api.api.schema.schemas import ServiceCategoryIn, ServiceCategoryOut
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.service import ServiceCategory
+from api.utils.batch_get import batch_get
+from api.utils.projection import project, projected
+from api.utils.response_cache import cached
 from ninja.pagination import paginate, LimitOffsetPagination
 
 
@@ -13,7 +16,9 @@ router = Router(tags=["Categories"])
 
 
 @router.get("", response=List[ServiceCategoryOut])
+@cached(tags=['categories'])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def list_categories(request):
     return ServiceCategory.objects.all()
 
@@ -29,9 +34,17 @@ def create_category(request, payload: ServiceCategoryIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[ServiceCategoryOut], 400: MessageSchema})
+@projected
+def batch_get_categories(request, payload: BatchGetIn):
+    """Get several categories by ID, in the requested order."""
+    return batch_get(request, ServiceCategory.objects.all(), payload.ids)
+
+
 @router.get("/{category_id}", response=ServiceCategoryOut)
+@projected
 def get_category(request, category_id: int):
-    return get_object_or_404(ServiceCategory, id=category_id)
+    return get_object_or_404(project(request, ServiceCategory.objects.all()), id=category_id)
 
 
 @router.put("/{category_id}", response={200: ServiceCategoryOut, 400: MessageSchema, 404: MessageSchema})
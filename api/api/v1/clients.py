@@ -0,0 +1,14 @@
+from ninja import Router
+
+from api.api.schema.schemas import ClientOverviewOut
+from api.utils.auth import AsyncAuthBearer
+from api.utils.overview import DEFAULT_RECENT, client_overview
+
+
+router = Router(tags=["Clients"])
+
+
+@router.get("/{client_id}/overview", response=ClientOverviewOut, auth=AsyncAuthBearer())
+async def get_client_overview(request, client_id: str, recent: int = DEFAULT_RECENT):
+    """Recent leads, quotes, orders, invoices, properties and documents of a client, with totals."""
+    return await client_overview(client_id, recent)
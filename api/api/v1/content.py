@@ -10,8 +10,12 @@ from api.api.schema.content_schemas import (
     ContentOut,
     ContentUpdate
 )
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.content import Content
+from api.utils.batch_get import batch_get
+from api.utils.conditional import conditional
+from api.utils.projection import project, projected
+from api.utils.response_cache import cached
 
 
 router = Router(tags=["Content"])
@@ -19,6 +23,8 @@ router = Router(tags=["Content"])
 
 @router.get("", response=List[ContentOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected(fast_path=True)
+@conditional(Content)
 def list_content(
     request,
     status: str = None,
@@ -64,10 +70,19 @@ def create_content(request, payload: ContentIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[ContentOut], 400: MessageSchema})
+@projected
+def batch_get_content(request, payload: BatchGetIn):
+    """Get several content items by ID, in the requested order."""
+    return batch_get(request, Content.objects.all(), payload.ids)
+
+
 @router.get("/{content_id}", response=ContentOut)
+@projected
+@conditional(Content, id='content_id')
 def get_content(request, content_id: int):
     """Get a specific content by ID."""
-    return get_object_or_404(Content, id=content_id)
+    return get_object_or_404(project(request, Content.objects.all()), id=content_id)
 
 
 @router.put("/{content_id}", response={200: ContentOut, 400: MessageSchema, 404: MessageSchema})
@@ -99,13 +114,17 @@ def delete_content(request, content_id: int):
 
 
 @router.get("/slug/{slug}", response=ContentOut)
+@cached(tags=['content'])
+@projected
+@conditional(Content, slug='slug')
 def get_content_by_slug(request, slug: str):
     """Get content by slug."""
-    return get_object_or_404(Content, slug=slug)
+    return get_object_or_404(project(request, Content.objects.all()), slug=slug)
 
 
 @router.get("/author/{author_id}/content", response=List[ContentOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_author_content(request, author_id: str):
     """Get all content by a specific author."""
     contents = Content.objects.filter(author_id=author_id)
@@ -114,6 +133,7 @@ def get_author_content(request, author_id: str):
 
 @router.get("/platform/{platform}/content", response=List[ContentOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_platform_content(request, platform: str):
     """Get all content for a specific platform."""
     contents = Content.objects.filter(platform=platform)
@@ -174,6 +194,7 @@ def increment_comments(request, content_id: int):
 
 @router.get("/scheduled/upcoming", response=List[ContentOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_upcoming_scheduled_content(request):
     """Get upcoming scheduled content."""
     from django.utils import timezone
@@ -6,8 +6,10 @@ from ninja.pagination import paginate, LimitOffsetPagination
 from django.core.exceptions import ValidationError
 
 from api.api.schema.document_schemas import DocumentIn, DocumentOut, DocumentUpdate
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.document import Document
+from api.utils.batch_get import batch_get
+from api.utils.projection import project, projected
 
 
 router = Router(tags=["Documents"])
@@ -15,6 +17,7 @@ router = Router(tags=["Documents"])
 
 @router.get("", response=List[DocumentOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def list_documents(
     request,
     user_id: str = None,
@@ -23,7 +26,7 @@ def list_documents(
     search: str = None
 ):
     """List all documents with optional filtering."""
-    documents = Document.objects.select_related('order', 'property').all()
+    documents = Document.objects.all()
 
     if user_id:
         documents = documents.filter(user_id=user_id)
@@ -52,11 +55,19 @@ def create_document(request, payload: DocumentIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[DocumentOut], 400: MessageSchema})
+@projected
+def batch_get_documents(request, payload: BatchGetIn):
+    """Get several documents by ID, in the requested order."""
+    return batch_get(request, Document.objects.all(), payload.ids)
+
+
 @router.get("/{document_id}", response=DocumentOut)
+@projected
 def get_document(request, document_id: int):
     """Get a specific document by ID."""
     return get_object_or_404(
-        Document.objects.select_related('order', 'property'),
+        project(request, Document.objects.all()),
         id=document_id
     )
 
@@ -91,23 +102,26 @@ def delete_document(request, document_id: int):
 
 @router.get("/user/{user_id}/documents", response=List[DocumentOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_user_documents(request, user_id: str):
     """Get all documents for a specific user."""
-    documents = Document.objects.filter(user_id=user_id).select_related('order', 'property')
+    documents = Document.objects.filter(user_id=user_id)
     return documents
 
 
 @router.get("/order/{order_id}/documents", response=List[DocumentOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_order_documents(request, order_id: int):
     """Get all documents for a specific order."""
-    documents = Document.objects.filter(order_id=order_id).select_related('order', 'property')
+    documents = Document.objects.filter(order_id=order_id)
     return documents
 
 
 @router.get("/property/{property_id}/documents", response=List[DocumentOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_property_documents(request, property_id: int):
     """Get all documents for a specific property."""
-    documents = Document.objects.filter(property_id=property_id).select_related('order', 'property')
+    documents = Document.objects.filter(property_id=property_id)
     return documents
@@ -14,8 +14,13 @@ from api.api.schema.event_schemas import (
     EventRegistrationOut,
     EventRegistrationUpdate
 )
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, BulkStatusIn, BulkStatusOut, MessageSchema
 from api.models.event import Event, EventRegistration
+from api.utils.batch_get import batch_get
+from api.utils.conditional import conditional
+from api.utils.projection import project, projected
+from api.utils.response_cache import cached
+from api.utils.transitions import bulk_status
 
 
 router = Router(tags=["Events"])
@@ -24,6 +29,8 @@ router = Router(tags=["Events"])
 # Event CRUD Operations
 @router.get("", response=List[EventOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected(fast_path=True)
+@conditional(Event)
 def list_events(
     request,
     status: str = None,
@@ -73,10 +80,19 @@ def create_event(request, payload: EventIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[EventOut], 400: MessageSchema})
+@projected
+def batch_get_events(request, payload: BatchGetIn):
+    """Get several events by ID, in the requested order."""
+    return batch_get(request, Event.objects.all(), payload.ids)
+
+
 @router.get("/{event_id}", response=EventOut)
+@projected
+@conditional(Event, id='event_id')
 def get_event(request, event_id: int):
     """Get a specific event by ID."""
-    return get_object_or_404(Event, id=event_id)
+    return get_object_or_404(project(request, Event.objects.all()), id=event_id)
 
 
 @router.put("/{event_id}", response={200: EventOut, 400: MessageSchema, 404: MessageSchema})
@@ -109,7 +125,9 @@ def delete_event(request, event_id: int):
 
 # Event Filtered Views
 @router.get("/upcoming/all", response=List[EventOut])
+@cached(tags=['events'])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_upcoming_events(request):
     """Get all upcoming events."""
     events = Event.objects.filter(event_date__gte=timezone.now().date()).order_by('event_date', 'start_time')
@@ -118,6 +136,7 @@ def get_upcoming_events(request):
 
 @router.get("/past/all", response=List[EventOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_past_events(request):
     """Get all past events."""
     events = Event.objects.filter(event_date__lt=timezone.now().date()).order_by('-event_date', '-start_time')
@@ -125,7 +144,9 @@ def get_past_events(request):
 
 
 @router.get("/featured/all", response=List[EventOut])
+@cached(tags=['events'])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_featured_events(request):
     """Get all featured events."""
     events = Event.objects.filter(is_featured=True)
@@ -134,6 +155,7 @@ def get_featured_events(request):
 
 @router.get("/type/{event_type}/events", response=List[EventOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_events_by_type(request, event_type: str):
     """Get all events of a specific type."""
     events = Event.objects.filter(event_type=event_type)
@@ -142,6 +164,7 @@ def get_events_by_type(request, event_type: str):
 
 @router.get("/organizer/{organizer_id}/events", response=List[EventOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_organizer_events(request, organizer_id: str):
     """Get all events by a specific organizer."""
     events = Event.objects.filter(organizer_id=organizer_id)
@@ -168,8 +191,22 @@ def decrement_event_registration(request, event_id: int):
 
 
 # EventRegistration CRUD Operations
+def _filter_registrations(registrations, event_id=None, attendee_id=None, status=None, payment_status=None):
+    """Filters shared by the list and bulk status routes."""
+    if event_id:
+        registrations = registrations.filter(event_id=event_id)
+    if attendee_id:
+        registrations = registrations.filter(attendee_id=attendee_id)
+    if status:
+        registrations = registrations.filter(status=status)
+    if payment_status:
+        registrations = registrations.filter(payment_status=payment_status)
+    return registrations
+
+
 @router.get("/registrations/all", response=List[EventRegistrationOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def list_registrations(
     request,
     event_id: int = None,
@@ -178,18 +215,7 @@ def list_registrations(
     payment_status: str = None
 ):
     """List all event registrations with optional filtering."""
-    registrations = EventRegistration.objects.select_related('event').all()
-
-    if event_id:
-        registrations = registrations.filter(event_id=event_id)
-    if attendee_id:
-        registrations = registrations.filter(attendee_id=attendee_id)
-    if status:
-        registrations = registrations.filter(status=status)
-    if payment_status:
-        registrations = registrations.filter(payment_status=payment_status)
-
-    return registrations
+    return _filter_registrations(EventRegistration.objects.all(), event_id, attendee_id, status, payment_status)
 
 
 @router.post("/registrations", response={201: EventRegistrationOut, 400: MessageSchema, 404: MessageSchema})
@@ -225,10 +251,17 @@ def create_registration(request, payload: EventRegistrationIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/registrations/bulk-status", response={200: BulkStatusOut, 400: MessageSchema})
+def update_registration_statuses(request, payload: BulkStatusIn):
+    """Move the selected registrations (e.g. check in attendees) to a new status in one UPDATE."""
+    return bulk_status(EventRegistration.objects.all(), payload, _filter_registrations)
+
+
 @router.get("/registrations/{registration_id}", response=EventRegistrationOut)
+@projected
 def get_registration(request, registration_id: int):
     """Get a specific event registration by ID."""
-    return get_object_or_404(EventRegistration.objects.select_related('event'), id=registration_id)
+    return get_object_or_404(project(request, EventRegistration.objects.all()), id=registration_id)
 
 
 @router.put("/registrations/{registration_id}", response={200: EventRegistrationOut, 400: MessageSchema, 404: MessageSchema})
@@ -266,6 +299,7 @@ def delete_registration(request, registration_id: int):
 
 @router.get("/{event_id}/registrations", response=List[EventRegistrationOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_event_registrations(request, event_id: int):
     """Get all registrations for a specific event."""
     registrations = EventRegistration.objects.filter(event_id=event_id)
@@ -273,14 +307,16 @@ def get_event_registrations(request, event_id: int):
 
 
 @router.get("/registrations/confirmation/{confirmation_code}", response=EventRegistrationOut)
+@projected
 def get_registration_by_confirmation(request, confirmation_code: str):
     """Get registration by confirmation code."""
-    return get_object_or_404(EventRegistration.objects.select_related('event'), confirmation_code=confirmation_code)
+    return get_object_or_404(project(request, EventRegistration.objects.all()), confirmation_code=confirmation_code)
 
 
 @router.get("/attendee/{attendee_id}/registrations", response=List[EventRegistrationOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_attendee_registrations(request, attendee_id: str):
     """Get all registrations for a specific attendee."""
-    registrations = EventRegistration.objects.filter(attendee_id=attendee_id).select_related('event')
+    registrations = EventRegistration.objects.filter(attendee_id=attendee_id)
     return registrations
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import List
 from ninja import Router
 from django.shortcuts import get_object_or_404
@@ -6,25 +7,20 @@ from ninja.pagination import paginate, LimitOffsetPagination
 from django.core.exceptions import ValidationError
 
 from api.api.schema.expense_schemas import ExpenseIn, ExpenseOut, ExpenseUpdate
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, BulkImportIn, BulkImportOut, BulkStatusIn, BulkStatusOut, MessageSchema
 from api.models.expenses import Expense
+from api.utils.batch_get import batch_get
+from api.utils.export import ExportFormat, stream_export
+from api.utils.bulk import MAX_REQUEST_ROWS, bulk_import
+from api.utils.projection import project, projected
+from api.utils.transitions import bulk_status
 
 
 router = Router(tags=["Expenses"])
 
 
-@router.get("", response=List[ExpenseOut])
-@paginate(LimitOffsetPagination, page_size=10)
-def list_expenses(
-    request,
-    status: str = None,
-    category: str = None,
-    user_id: str = None,
-    search: str = None
-):
-    """List all expenses with optional filtering."""
-    expenses = Expense.objects.all()
-
+def _filter_expenses(expenses, status=None, category=None, user_id=None, search=None, date_from=None, date_to=None):
+    """Filters shared by the list and export routes."""
     if status:
         expenses = expenses.filter(status=status)
     if category:
@@ -35,10 +31,46 @@ def list_expenses(
         expenses = expenses.filter(
             Q(description__icontains=search) | Q(user_id__icontains=search)
         )
-
+    # date is the partition key, so a date range only scans its months
+    if date_from:
+        expenses = expenses.filter(date__gte=date_from)
+    if date_to:
+        expenses = expenses.filter(date__lte=date_to)
     return expenses
 
 
+@router.get("", response=List[ExpenseOut])
+@paginate(LimitOffsetPagination, page_size=10)
+@projected
+def list_expenses(
+    request,
+    status: str = None,
+    category: str = None,
+    user_id: str = None,
+    search: str = None,
+    date_from: date = None,
+    date_to: date = None
+):
+    """List all expenses with optional filtering."""
+    return _filter_expenses(Expense.objects.all(), status, category, user_id, search, date_from, date_to)
+
+
+@router.get("/export")
+def export_expenses(
+    request,
+    format: ExportFormat = "csv",
+    status: str = None,
+    category: str = None,
+    user_id: str = None,
+    search: str = None,
+    date_from: date = None,
+    date_to: date = None
+):
+    """Stream every matching expense as CSV or NDJSON."""
+    expenses = _filter_expenses(Expense.objects.all(), status, category, user_id, search, date_from, date_to)
+    return stream_export(expenses, ExpenseOut, format, "expenses")
+
+
 @router.post("", response={201: ExpenseOut, 400: MessageSchema})
 def create_expense(request, payload: ExpenseIn):
     """Create a new expense."""
@@ -51,10 +83,32 @@ def create_expense(request, payload: ExpenseIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/bulk", response={200: BulkImportOut, 400: MessageSchema})
+def import_expenses(request, payload: BulkImportIn):
+    """Import many expenses at once; invalid rows are reported without aborting the rest."""
+    if len(payload.rows) > MAX_REQUEST_ROWS:
+        return 400, {'detail': f"At most {MAX_REQUEST_ROWS} rows per request; use the import_rows command for larger files"}
+    return 200, bulk_import(Expense, ExpenseIn, payload.rows).as_dict()
+
+
+@router.post("/bulk-status", response={200: BulkStatusOut, 400: MessageSchema})
+def update_expense_statuses(request, payload: BulkStatusIn):
+    """Move the selected expenses (by ID and/or list filters) to a new status in one UPDATE."""
+    return bulk_status(Expense.objects.all(), payload, _filter_expenses)
+
+
+@router.post("/batch-get", response={200: BatchGetOut[ExpenseOut], 400: MessageSchema})
+@projected
+def batch_get_expenses(request, payload: BatchGetIn):
+    """Get several expenses by ID, in the requested order."""
+    return batch_get(request, Expense.objects.all(), payload.ids)
+
+
 @router.get("/{expense_id}", response=ExpenseOut)
+@projected
 def get_expense(request, expense_id: int):
     """Get a specific expense by ID."""
-    return get_object_or_404(Expense, id=expense_id)
+    return get_object_or_404(project(request, Expense.objects.all()), id=expense_id)
 
 
 @router.put("/{expense_id}", response={200: ExpenseOut, 400: MessageSchema, 404: MessageSchema})
@@ -87,6 +141,7 @@ def delete_expense(request, expense_id: int):
 
 @router.get("/user/{user_id}/expenses", response=List[ExpenseOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_user_expenses(request, user_id: str):
     """Get all expenses for a specific user."""
     expenses = Expense.objects.filter(user_id=user_id)
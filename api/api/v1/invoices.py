@@ -5,22 +5,21 @@ from django.db.models import Q
 from django.core.exceptions import ValidationError
 
 from api.api.schema.schemas import InvoiceIn, InvoiceOut, InvoiceUpdate
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, BulkStatusIn, BulkStatusOut, MessageSchema
 from api.models.payment import Invoice, InvoiceItem
+from api.utils.batch_get import batch_get
+from api.utils.conditional import conditional
+from api.utils.export import ExportFormat, stream_export
+from api.utils.projection import project, projected, subset_schema
+from api.utils.transitions import bulk_status
 from ninja.pagination import paginate, LimitOffsetPagination
 
 
 router = Router(tags=["Invoices"])
 
 
-@router.get("", response=List[InvoiceOut])
-@paginate(LimitOffsetPagination, page_size=10)
-def list_invoices(request, status: str = None, client_id: str = None, search: str = None):
-    """List all invoices with optional filtering."""
-    invoices = Invoice.objects.select_related(
-        'service', 'service__category', 'order', 'lead'
-    ).prefetch_related('items').all()
-
+def _filter_invoices(invoices, status=None, client_id=None, search=None):
+    """Filters shared by the list and export routes."""
     if status:
         invoices = invoices.filter(status=status)
     if client_id:
@@ -29,10 +28,25 @@ def list_invoices(request, status: str = None, client_id: str = None, search: st
         invoices = invoices.filter(
             Q(invoice_number__icontains=search) | Q(client_name__icontains=search)
         )
-
     return invoices
 
 
+@router.get("", response=List[InvoiceOut])
+@paginate(LimitOffsetPagination, page_size=10)
+@projected(expandable=True, fast_path=True)
+@conditional(Invoice)
+def list_invoices(request, status: str = None, client_id: str = None, search: str = None):
+    """List all invoices with optional filtering."""
+    return _filter_invoices(Invoice.objects.all(), status, client_id, search)
+
+
+@router.get("/export")
+def export_invoices(request, format: ExportFormat = "csv", status: str = None, client_id: str = None, search: str = None):
+    """Stream every matching invoice as CSV or NDJSON (relations as IDs, line items in NDJSON)."""
+    invoices = _filter_invoices(Invoice.objects.all(), status, client_id, search)
+    return stream_export(invoices, subset_schema(InvoiceOut, expand=()), format, "invoices")
+
+
 @router.post("", response={201: InvoiceOut, 400: MessageSchema})
 def create_invoice(request, payload: InvoiceIn):
     """Create a new invoice with optional line items."""
@@ -51,13 +65,26 @@ def create_invoice(request, payload: InvoiceIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/bulk-status", response={200: BulkStatusOut, 400: MessageSchema})
+def update_invoice_statuses(request, payload: BulkStatusIn):
+    """Move the selected invoices (by ID and/or list filters) to a new status in one UPDATE."""
+    return bulk_status(Invoice.objects.all(), payload, _filter_invoices)
+
+
+@router.post("/batch-get", response={200: BatchGetOut[InvoiceOut], 400: MessageSchema})
+@projected(expandable=True)
+def batch_get_invoices(request, payload: BatchGetIn):
+    """Get several invoices by ID, in the requested order."""
+    return batch_get(request, Invoice.objects.all(), payload.ids)
+
+
 @router.get("/{invoice_id}", response=InvoiceOut)
+@projected(expandable=True)
+@conditional(Invoice, id='invoice_id')
 def get_invoice(request, invoice_id: int):
     """Get a specific invoice by ID."""
     return get_object_or_404(
-        Invoice.objects.select_related(
-            'service', 'service__category', 'order', 'lead'
-        ).prefetch_related('items'),
+        project(request, Invoice.objects.all()),
         id=invoice_id
     )
 
@@ -5,8 +5,10 @@ from django.db.models import Q
 from django.core.exceptions import ValidationError
 
 from api.api.schema.schemas import ServiceLeadIn, ServiceLeadOut, ServiceLeadUpdate
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.service import ServiceLead
+from api.utils.batch_get import batch_get
+from api.utils.projection import project, projected
 from ninja.pagination import paginate, LimitOffsetPagination
 
 
@@ -15,9 +17,10 @@ router = Router(tags=["Service Leads"])
 
 @router.get("", response=List[ServiceLeadOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def list_leads(request, status: str = None, client_id: str = None, search: str = None):
     """List all service leads with optional filtering."""
-    leads = ServiceLead.objects.select_related('service', 'service__category').all()
+    leads = ServiceLead.objects.all()
 
     if status:
         leads = leads.filter(status=status)
@@ -43,11 +46,19 @@ def create_lead(request, payload: ServiceLeadIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[ServiceLeadOut], 400: MessageSchema})
+@projected
+def batch_get_leads(request, payload: BatchGetIn):
+    """Get several leads by ID, in the requested order."""
+    return batch_get(request, ServiceLead.objects.all(), payload.ids)
+
+
 @router.get("/{lead_id}", response=ServiceLeadOut)
+@projected
 def get_lead(request, lead_id: int):
     """Get a specific service lead by ID."""
     return get_object_or_404(
-        ServiceLead.objects.select_related('service', 'service__category'),
+        project(request, ServiceLead.objects.all()),
         id=lead_id
     )
 
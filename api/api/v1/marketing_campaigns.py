@@ -10,8 +10,10 @@ from api.api.schema.marketing_campaign_schemas import (
     MarketingCampaignOut,
     MarketingCampaignUpdate
 )
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.marketing_campaign import MarketingCampaign
+from api.utils.batch_get import batch_get
+from api.utils.projection import project, projected
 
 
 router = Router(tags=["Marketing Campaigns"])
@@ -19,6 +21,7 @@ router = Router(tags=["Marketing Campaigns"])
 
 @router.get("", response=List[MarketingCampaignOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def list_campaigns(
     request,
     status: str = None,
@@ -52,10 +55,18 @@ def create_campaign(request, payload: MarketingCampaignIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[MarketingCampaignOut], 400: MessageSchema})
+@projected
+def batch_get_marketing_campaigns(request, payload: BatchGetIn):
+    """Get several campaigns by ID, in the requested order."""
+    return batch_get(request, MarketingCampaign.objects.all(), payload.ids)
+
+
 @router.get("/{campaign_id}", response=MarketingCampaignOut)
+@projected
 def get_campaign(request, campaign_id: int):
     """Get a specific marketing campaign by ID."""
-    return get_object_or_404(MarketingCampaign, id=campaign_id)
+    return get_object_or_404(project(request, MarketingCampaign.objects.all()), id=campaign_id)
 
 
 @router.put("/{campaign_id}", response={200: MarketingCampaignOut, 400: MessageSchema, 404: MessageSchema})
@@ -88,6 +99,7 @@ def delete_campaign(request, campaign_id: int):
 
 @router.get("/status/{status}/campaigns", response=List[MarketingCampaignOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_campaigns_by_status(request, status: str):
     """Get all campaigns with a specific status."""
     campaigns = MarketingCampaign.objects.filter(status=status)
@@ -96,6 +108,7 @@ def get_campaigns_by_status(request, status: str):
 
 @router.get("/channel/{channel}/campaigns", response=List[MarketingCampaignOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_campaigns_by_channel(request, channel: str):
     """Get all campaigns for a specific channel."""
     campaigns = MarketingCampaign.objects.filter(channel=channel)
@@ -4,8 +4,10 @@ from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 
 from api.api.schema.schemas import ServiceOrderIn, ServiceOrderOut, ServiceOrderUpdate
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.service import ServiceOrder
+from api.utils.batch_get import batch_get
+from api.utils.projection import project, projected
 from ninja.pagination import paginate, LimitOffsetPagination
 
 
@@ -14,11 +16,10 @@ router = Router(tags=["Service Orders"])
 
 @router.get("", response=List[ServiceOrderOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected(expandable=True)
 def list_orders(request, order_status: str = None, payment_status: str = None, client_id: str = None):
     """List all service orders with optional filtering."""
-    orders = ServiceOrder.objects.select_related(
-        'service', 'service__category', 'quote'
-    ).all()
+    orders = ServiceOrder.objects.all()
 
     if order_status:
         orders = orders.filter(order_status=order_status)
@@ -42,11 +43,19 @@ def create_order(request, payload: ServiceOrderIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[ServiceOrderOut], 400: MessageSchema})
+@projected(expandable=True)
+def batch_get_orders(request, payload: BatchGetIn):
+    """Get several orders by ID, in the requested order."""
+    return batch_get(request, ServiceOrder.objects.all(), payload.ids)
+
+
 @router.get("/{order_id}", response=ServiceOrderOut)
+@projected(expandable=True)
 def get_order(request, order_id: int):
     """Get a specific service order by ID."""
     return get_object_or_404(
-        ServiceOrder.objects.select_related('service', 'service__category', 'quote'),
+        project(request, ServiceOrder.objects.all()),
         id=order_id
     )
 
@@ -1,26 +1,51 @@
+from datetime import date
 from typing import List
 from ninja import Router
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 
 from api.api.schema.schemas import PaymentIn, PaymentOut
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.payment import Payment
+from api.utils.batch_get import batch_get
+from api.utils.export import ExportFormat, stream_export
+from api.utils.projection import project, projected
 from ninja.pagination import paginate, LimitOffsetPagination
 
 
 router = Router(tags=["Payments"])
 
 
+def _filter_payments(payments, invoice_id=None, date_from=None, date_to=None):
+    """Filters shared by the list and export routes."""
+    if invoice_id:
+        payments = payments.filter(invoice_id=invoice_id)
+    # payment_date is the partition key, so a date range only scans its months
+    if date_from:
+        payments = payments.filter(payment_date__gte=date_from)
+    if date_to:
+        payments = payments.filter(payment_date__lte=date_to)
+    return payments
+
+
 @router.get("", response=List[PaymentOut])
 @paginate(LimitOffsetPagination, page_size=10)
-def list_payments(request, invoice_id: int = None):
-    payments = Payment.objects.all()
+@projected
+def list_payments(request, invoice_id: int = None, date_from: date = None, date_to: date = None):
+    return _filter_payments(Payment.objects.all(), invoice_id, date_from, date_to)
 
-    if invoice_id:
-        payments = payments.filter(invoice_id=invoice_id)
 
-    return payments
+@router.get("/export")
+def export_payments(
+    request,
+    format: ExportFormat = "csv",
+    invoice_id: int = None,
+    date_from: date = None,
+    date_to: date = None
+):
+    """Stream every matching payment as CSV or NDJSON."""
+    payments = _filter_payments(Payment.objects.all(), invoice_id, date_from, date_to)
+    return stream_export(payments, PaymentOut, format, "payments")
 
 
 @router.post("", response={201: PaymentOut, 400: MessageSchema})
@@ -34,9 +59,17 @@ def create_payment(request, payload: PaymentIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[PaymentOut], 400: MessageSchema})
+@projected
+def batch_get_payments(request, payload: BatchGetIn):
+    """Get several payments by ID, in the requested order."""
+    return batch_get(request, Payment.objects.all(), payload.ids)
+
+
 @router.get("/{payment_id}", response=PaymentOut)
+@projected
 def get_payment(request, payment_id: int):
-    return get_object_or_404(Payment, id=payment_id)
+    return get_object_or_404(project(request, Payment.objects.all()), id=payment_id)
 
 
 @router.delete("/{payment_id}", response={200: MessageSchema, 400: MessageSchema, 404: MessageSchema})
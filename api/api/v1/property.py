@@ -6,38 +6,29 @@ from ninja.pagination import paginate, LimitOffsetPagination
 from django.core.exceptions import ValidationError
 
 from api.api.schema.property_schemas import PropertyIn, PropertyOut, PropertyUpdate, PropertyStatsOut
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, BulkImportIn, BulkImportOut, MessageSchema
 from api.models.property import Property
+from api.utils.auth import AsyncAuthBearer
+from api.utils.batch_get import batch_get
+from api.utils.bulk import MAX_REQUEST_ROWS, bulk_import
+from api.utils.conditional import conditional
+from api.utils.dashboard import aproperty_stats
+from api.utils.projection import project, projected
 
 
 router = Router(tags=["Properties"])
 
 
-@router.get("/stats", response=PropertyStatsOut)
-def get_property_stats(request):
+@router.get("/stats", response=PropertyStatsOut, auth=AsyncAuthBearer())
+async def get_property_stats(request):
     """Get property statistics for dashboard."""
-    total = Property.objects.count()
-    available = Property.objects.filter(status='available').count()
-    reserved = Property.objects.filter(status='reserved').count()
-    sold_rented = Property.objects.filter(Q(status='sold') | Q(status='rented')).count()
-
-    for_sale = Property.objects.filter(category='sale').count()
-    for_rent = Property.objects.filter(category='rent').count()
-    for_lease = Property.objects.filter(category='lease').count()
-
-    return {
-        "total_properties": total,
-        "available": available,
-        "reserved": reserved,
-        "sold_rented": sold_rented,
-        "for_sale": for_sale,
-        "for_rent": for_rent,
-        "for_lease": for_lease
-    }
+    return await aproperty_stats()
 
 
 @router.get("", response=List[PropertyOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
+@conditional(Property)
 def list_properties(
     request,
     category: str = None,
@@ -76,10 +67,27 @@ def create_property(request, payload: PropertyIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/bulk", response={200: BulkImportOut, 400: MessageSchema})
+def import_properties(request, payload: BulkImportIn):
+    """Import many properties at once; invalid rows are reported without aborting the rest."""
+    if len(payload.rows) > MAX_REQUEST_ROWS:
+        return 400, {'detail': f"At most {MAX_REQUEST_ROWS} rows per request; use the import_rows command for larger files"}
+    return 200, bulk_import(Property, PropertyIn, payload.rows).as_dict()
+
+
+@router.post("/batch-get", response={200: BatchGetOut[PropertyOut], 400: MessageSchema})
+@projected
+def batch_get_properties(request, payload: BatchGetIn):
+    """Get several properties by ID, in the requested order."""
+    return batch_get(request, Property.objects.all(), payload.ids)
+
+
 @router.get("/{property_id}", response=PropertyOut)
+@projected
+@conditional(Property, id='property_id')
 def get_property(request, property_id: int):
     """Get a specific property by ID."""
-    return get_object_or_404(Property, id=property_id)
+    return get_object_or_404(project(request, Property.objects.all()), id=property_id)
 
 
 @router.put("/{property_id}", response={200: PropertyOut, 400: MessageSchema, 404: MessageSchema})
@@ -112,6 +120,7 @@ def delete_property(request, property_id: int):
 
 @router.get("/client/{client_id}/properties", response=List[PropertyOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def get_client_properties(request, client_id: str):
     """Get all properties for a specific client."""
     properties = Property.objects.filter(client_id=client_id)
@@ -4,8 +4,10 @@ from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 
 from api.api.schema.schemas import QuoteIn, QuoteOut, QuoteUpdate
-from api.api.schema.others import MessageSchema
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.service import Quote
+from api.utils.batch_get import batch_get
+from api.utils.projection import project, projected
 from ninja.pagination import paginate, LimitOffsetPagination
 
 
@@ -14,9 +16,10 @@ router = Router(tags=["Quotes"])
 
 @router.get("", response=List[QuoteOut])
 @paginate(LimitOffsetPagination, page_size=10)
+@projected
 def list_quotes(request, status: str = None, client_id: str = None):
     """List all quotes with optional filtering."""
-    quotes = Quote.objects.select_related('service', 'service__category').all()
+    quotes = Quote.objects.all()
 
     if status:
         quotes = quotes.filter(status=status)
@@ -38,11 +41,19 @@ def create_quote(request, payload: QuoteIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[QuoteOut], 400: MessageSchema})
+@projected
+def batch_get_quotes(request, payload: BatchGetIn):
+    """Get several quotes by ID, in the requested order."""
+    return batch_get(request, Quote.objects.all(), payload.ids)
+
+
 @router.get("/{quote_id}", response=QuoteOut)
+@projected
 def get_quote(request, quote_id: int):
     """Get a specific quote by ID."""
     return get_object_or_404(
-        Quote.objects.select_related('service', 'service__category'),
+        project(request, Quote.objects.all()),
         id=quote_id
     )
 
@@ -4,17 +4,23 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from django.core.exceptions import ValidationError
 
-from api.api.schema.schemas import ServiceIn, ServiceOut, ServiceUpdate
-from api.api.schema.others import MessageSchema
+from api.api.schema.schemas import CatalogOut, ServiceIn, ServiceOut, ServiceUpdate
+from api.api.schema.others import BatchGetIn, BatchGetOut, MessageSchema
 from api.models.service import Service
+from api.utils.batch_get import batch_get
+from api.utils.catalog import catalog_response
+from api.utils.projection import project, projected
+from api.utils.response_cache import cached
 
 
 router = Router(tags=["Services"])
 
 
 @router.get("", response=List[ServiceOut])
+@cached(tags=['services', 'categories'])
+@projected
 def list_services(request, status: str = None, category_id: int = None, search: str = None):
-    services = Service.objects.select_related('category').all()
+    services = Service.objects.all()
 
     if status:
         services = services.filter(status=status)
@@ -28,6 +34,12 @@ def list_services(request, status: str = None, category_id: int = None, search:
     return services
 
 
+@router.get("/catalog", response=CatalogOut)
+def get_catalog(request, since_version: int = None):
+    """All services and categories from the versioned catalog snapshot; since_version= returns only changes."""
+    return catalog_response(request, since_version)
+
+
 @router.post("", response={201: ServiceOut, 400: MessageSchema})
 def create_service(request, payload: ServiceIn):
     try:
@@ -39,9 +51,17 @@ def create_service(request, payload: ServiceIn):
         return 400, {'detail': str(e)}
 
 
+@router.post("/batch-get", response={200: BatchGetOut[ServiceOut], 400: MessageSchema})
+@projected
+def batch_get_services(request, payload: BatchGetIn):
+    """Get several services by ID, in the requested order."""
+    return batch_get(request, Service.objects.all(), payload.ids)
+
+
 @router.get("/{service_id}", response=ServiceOut)
+@projected
 def get_service(request, service_id: int):
-    return get_object_or_404(Service.objects.select_related('category'), id=service_id)
+    return get_object_or_404(project(request, Service.objects.all()), id=service_id)
 
 
 @router.put("/{service_id}", response={200: ServiceOut, 400: MessageSchema, 404: MessageSchema})
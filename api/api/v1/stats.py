@@ -1,18 +1,60 @@
+from typing import List
+
+from django.http import StreamingHttpResponse
 from ninja import Router
 
-from api.api.schema.schemas import ServiceStatsOut
-from api.models.payment import Invoice
-from api.models.service import Quote, Service, ServiceOrder
+from api.api.schema.schemas import CacheStatsOut, DatabaseStatsOut, ServiceStatsOut
+from api.utils.auth import AsyncAuthBearer
+from api.utils.counters import TRACKED_MODELS, aread_counters, total_key
+from api.utils.db_connections import database_stats
+from api.utils.live import PROPERTIES_TOPIC, STATS_TOPIC, budgets_topic, event_stream
+from api.utils.response_cache import backend_stats, cache_stats
 
 
 router = Router()
 
 
-@router.get("", response=ServiceStatsOut, tags=["Statistics"])
-def get_stats(request):
-    return {
-        "total_services": Service.objects.count(),
-        "total_orders": ServiceOrder.objects.count(),
-        "total_quotes": Quote.objects.count(),
-        "total_invoices": Invoice.objects.count(),
+@router.get("", response=ServiceStatsOut, tags=["Statistics"], auth=AsyncAuthBearer(), exclude_unset=True)
+async def get_stats(request, include_breakdown: bool = False):
+    """Totals per resource; `status_breakdown` is only present with `include_breakdown=true`."""
+    counters = await aread_counters(include_breakdown)
+    stats = {
+        f"total_{prefix}": counters.get(total_key(prefix), 0)
+        for prefix, _ in TRACKED_MODELS.values()
     }
+
+    if include_breakdown:
+        breakdown = {}
+        for key, value in counters.items():
+            prefix, _, status = key.partition(".status.")
+            if status:
+                breakdown.setdefault(prefix, {})[status] = value
+        stats["status_breakdown"] = breakdown
+
+    return stats
+
+
+@router.get("/cache", response=CacheStatsOut, tags=["Statistics"])
+def get_cache_stats(request):
+    return {"routes": cache_stats(), "backend": backend_stats()}
+
+
+@router.get("/database", response=List[DatabaseStatsOut], tags=["Statistics"])
+def get_database_stats(request):
+    """Connection reuse settings, connections opened and pool counters, per database, for this process."""
+    return database_stats()
+
+
+@router.get("/stream", tags=["Statistics"], auth=AsyncAuthBearer())
+async def stream_stats(request, projects: str = None):
+    """
+    Server-Sent Events with changes to /stats, /properties/stats and the
+    budget summaries of `projects` (comma-separated project IDs).
+    """
+    topics = [STATS_TOPIC, PROPERTIES_TOPIC]
+    if projects:
+        topics.extend(budgets_topic(pid.strip()) for pid in projects.split(",") if pid.strip())
+    response = StreamingHttpResponse(event_stream(topics), content_type="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from ninja import Router
+
+from api.api.schema.content_schemas import ContentOut
+from api.api.schema.document_schemas import DocumentOut
+from api.api.schema.event_schemas import EventOut
+from api.api.schema.expense_schemas import ExpenseOut
+from api.api.schema.others import MessageSchema, SyncPageOut
+from api.api.schema.property_schemas import PropertyOut
+from api.api.schema.schemas import InvoiceOut, ServiceOrderOut
+from api.utils.sync import DEFAULT_LIMIT, InvalidCursor, SyncResource, sync_page
+
+
+router = Router(tags=["Sync"])
+
+# the list schema of each synced resource; relations are sent as IDs
+SCHEMAS = {
+    'invoices': InvoiceOut,
+    'orders': ServiceOrderOut,
+    'events': EventOut,
+    'content': ContentOut,
+    'properties': PropertyOut,
+    'documents': DocumentOut,
+    'expenses': ExpenseOut,
+}
+
+
+@router.get("/{resource}", response={200: SyncPageOut, 400: MessageSchema})
+def sync_resource(
+    request,
+    resource: SyncResource,
+    cursor: str = None,
+    updated_since: datetime = None,
+    limit: int = DEFAULT_LIMIT
+):
+    """Rows changed and IDs deleted since the cursor (or updated_since), in (updated_at, id) order."""
+    try:
+        return 200, sync_page(resource, SCHEMAS[resource], cursor, updated_since, limit)
+    except InvalidCursor as e:
+        return 400, {'detail': str(e)}
@@ -0,0 +1,63 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.api.schema.expense_schemas import ExpenseIn
+from api.api.schema.property_schemas import PropertyIn
+from api.models.expenses import Expense
+from api.models.property import Property
+from api.utils.bulk import DEFAULT_BATCH_SIZE, bulk_import
+
+
+def expense_rows(count):
+    start = date(2025, 1, 1)
+    for n in range(count):
+        yield {
+            'user_id': f"{n % 50 + 1}", 'date': str(start + timedelta(days=n % 365)),
+            'description': f"Field expense {n}", 'amount': f"{n % 500 + 1}.25",
+            'category': ('travel', 'food', 'equipment')[n % 3],
+        }
+
+
+def property_rows(count):
+    for n in range(count):
+        yield {
+            'name': f"Listing {n}", 'property_type': ('residential', 'commercial', 'land')[n % 3],
+            'category': ('sale', 'rent', 'lease')[n % 3], 'location': f"{n} Marina Road, Lagos",
+            'price': f"{25000000 + n}.00", 'size': "450.00", 'bedrooms': n % 5, 'client_id': f"{n % 200 + 1}",
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark bulk_import throughput against one create() per row. "
+        "All rows are written inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help="Rows per resource (default 100000)")
+        parser.add_argument('--baseline-rows', type=int, default=2000, help="Rows created one at a time for comparison")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        rows, baseline, batch_size = options['rows'], options['baseline_rows'], options['batch_size']
+        self.stdout.write(f"{'resource':<12}{'per-row rows/s':>16}{'bulk rows/s':>14}{'speedup':>10}")
+
+        for name, model, schema, generate in (
+            ('expenses', Expense, ExpenseIn, expense_rows),
+            ('properties', Property, PropertyIn, property_rows),
+        ):
+            with transaction.atomic():
+                started = time.perf_counter()
+                for row in generate(baseline):
+                    model.objects.create(**schema(**row).dict())
+                per_row = baseline / (time.perf_counter() - started)
+
+                started = time.perf_counter()
+                result = bulk_import(model, schema, generate(rows), batch_size=batch_size)
+                bulk = result.created / (time.perf_counter() - started)
+                transaction.set_rollback(True)
+
+            self.stdout.write(f"{name:<12}{per_row:>16,.0f}{bulk:>14,.0f}{bulk / per_row:>9.1f}x")
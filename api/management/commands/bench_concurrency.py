@@ -0,0 +1,121 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+
+from api.utils.auth_client import AsyncAuthClient, AuthClient
+
+
+HEADERS = {"Authorization": "Bearer bench-token"}
+
+
+class InFlight:
+    """Counts requests waiting on the (simulated) auth service at once."""
+
+    def __init__(self):
+        self.current = self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.current -= 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a route under a WSGI-style thread pool and under the ASGI handler, "
+        "with the auth service replaced by a fixed delay, and compare how many requests "
+        "each keeps in flight."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/stats', help="Route to request (default /api/v1/stats)")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per mode (default 200)")
+        parser.add_argument('--threads', type=int, default=8, help="WSGI worker threads (default 8)")
+        parser.add_argument('--auth-latency-ms', type=float, default=50, help="Simulated auth service latency")
+
+    @override_settings(ALLOWED_HOSTS=['testserver'])
+    def handle(self, *args, **options):
+        path, count, threads = options['path'], options['requests'], options['threads']
+        latency = options['auth_latency_ms'] / 1000
+
+        self.stdout.write(f"{'mode':<16}{'req/s':>10}{'in flight':>11}{'p50 ms':>10}{'p95 ms':>10}")
+        self.report(f"wsgi x{threads}", *self.run_wsgi(path, count, threads, latency))
+        self.report("asgi", *self.run_asgi(path, count, latency))
+
+    def simulate_auth(self, latency):
+        """Patch both auth clients to wait ``latency`` seconds the way each really would."""
+        in_flight = InFlight()
+
+        def verify_token(client, token):
+            with in_flight:
+                time.sleep(latency)
+            return True, 1
+
+        async def averify_token(client, token):
+            with in_flight:
+                await asyncio.sleep(latency)
+            return True, 1
+
+        patches = (
+            mock.patch.object(AuthClient, 'verify_token', verify_token),
+            mock.patch.object(AsyncAuthClient, 'verify_token', averify_token),
+        )
+        return in_flight, patches
+
+    def run_wsgi(self, path, count, threads, latency):
+        in_flight, patches = self.simulate_auth(latency)
+        client = Client()
+
+        def request(_):
+            started = time.perf_counter()
+            response = client.get(path, headers=HEADERS)
+            self.ensure_ok(response)
+            return time.perf_counter() - started
+
+        with patches[0], patches[1], ThreadPoolExecutor(threads) as pool:
+            request(None)  # warm up
+            started = time.perf_counter()
+            timings = list(pool.map(request, range(count)))
+            elapsed = time.perf_counter() - started
+        return count / elapsed, in_flight.peak, timings
+
+    def run_asgi(self, path, count, latency):
+        in_flight, patches = self.simulate_auth(latency)
+        client = AsyncClient()
+
+        async def request():
+            started = time.perf_counter()
+            response = await client.get(path, headers=HEADERS)
+            self.ensure_ok(response)
+            return time.perf_counter() - started
+
+        async def run():
+            await request()  # warm up
+            started = time.perf_counter()
+            timings = await asyncio.gather(*(request() for _ in range(count)))
+            return count / (time.perf_counter() - started), timings
+
+        with patches[0], patches[1]:
+            rate, timings = asyncio.run(run())
+        return rate, in_flight.peak, timings
+
+    def ensure_ok(self, response):
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code}: {response.content[:200]!r}")
+
+    def report(self, mode, rate, peak, timings):
+        timings = sorted(timings)
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        self.stdout.write(f"{mode:<16}{rate:>10,.0f}{peak:>11}{p50:>10.1f}{p95:>10.1f}")
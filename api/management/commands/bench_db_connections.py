@@ -0,0 +1,77 @@
+import statistics
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.test import Client, override_settings
+
+from api.utils.auth_client import AuthClient
+from api.utils.db_connections import is_pooled, opened
+
+
+HEADERS = {"Authorization": "Bearer bench-token"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a database-backed route with a new connection per request and with "
+        "connections kept open (persistent, or the configured pool), to show the "
+        "share of request latency spent opening connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/expenses', help="Route to request (default /api/v1/expenses)")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per mode (default 200)")
+        parser.add_argument('--database', default='default', help="Database alias (default 'default')")
+
+    @override_settings(ALLOWED_HOSTS=['testserver'])
+    def handle(self, *args, **options):
+        path, count, alias = options['path'], options['requests'], options['database']
+        settings_dict = connections[alias].settings_dict
+        configured = settings_dict['CONN_MAX_AGE']
+
+        self.stdout.write(f"{'mode':<24}{'opened':>8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+        with mock.patch.object(AuthClient, 'verify_token', return_value=(True, 1)):
+            if is_pooled(alias):
+                # Django refuses CONN_MAX_AGE with a pool, so compare against the pool as configured
+                self.report("pooled", *self.run(path, count, alias))
+            else:
+                try:
+                    settings_dict['CONN_MAX_AGE'] = 0
+                    self.report("new per request", *self.run(path, count, alias))
+                    settings_dict['CONN_MAX_AGE'] = configured or 600
+                    self.report(f"persistent ({settings_dict['CONN_MAX_AGE']}s)", *self.run(path, count, alias))
+                finally:
+                    settings_dict['CONN_MAX_AGE'] = configured
+                    connections[alias].close()
+
+    def run(self, path, count, alias):
+        client = Client()
+        connections[alias].close()
+
+        def request():
+            response = client.get(path, headers=HEADERS)
+            # the test client skips the request_finished cleanup a server runs
+            close_old_connections()
+            self.ensure_ok(response)
+
+        request()  # warm up
+        before = opened(alias)
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            request()
+            timings.append(time.perf_counter() - started)
+        return opened(alias) - before, timings
+
+    def ensure_ok(self, response):
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code}: {response.content[:200]!r}")
+
+    def report(self, mode, count, timings):
+        timings = sorted(timings)
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        mean = statistics.mean(timings) * 1000
+        self.stdout.write(f"{mode:<24}{count:>8}{p50:>10.1f}{p95:>10.1f}{mean:>10.1f}")
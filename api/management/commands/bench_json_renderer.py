@@ -0,0 +1,83 @@
+import json
+import time
+from datetime import date, datetime, time as dt_time, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from ninja.parser import Parser
+from ninja.renderers import JSONRenderer
+
+from api.api.schema.budget_schemas import BudgetOut
+from api.api.schema.event_schemas import EventOut
+from api.api.schema.schemas import InvoiceIn, InvoiceOut, PaymentOut
+from api.utils.projection import nested_schema
+from api.utils.renderers import ORJSONParser, ORJSONRenderer
+
+
+SAMPLES = {
+    int: 42,
+    float: 37.5,
+    bool: True,
+    str: "Sample text value",
+    Decimal: Decimal('1075.25'),
+    date: date(2025, 3, 1),
+    datetime: datetime(2025, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc),
+    dt_time: dt_time(9, 30),
+}
+
+
+def sample(schema, many: int = 3):
+    """A representative payload for ``schema``, with ``many`` items in nested lists."""
+    data = {}
+    for name, field_info in schema.model_fields.items():
+        nested, is_many = nested_schema(field_info.annotation)
+        if nested is not None:
+            data[name] = [sample(nested, many) for _ in range(many)] if is_many else sample(nested, many)
+            continue
+        annotation = field_info.annotation
+        for arg in getattr(annotation, '__args__', ()):
+            if arg in SAMPLES:
+                annotation = arg
+        data[name] = SAMPLES.get(annotation, [])
+    return data
+
+
+class Command(BaseCommand):
+    help = "Benchmark the orjson renderer/parser against Ninja's stock JSON renderer/parser."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help="Items per rendered page (default 100)")
+        parser.add_argument('--repeat', type=int, default=50, help="Timed runs per case; the best is reported")
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        stock, fast = JSONRenderer(), ORJSONRenderer()
+
+        self.stdout.write(f"{'payload':<28}{'stock ms':>12}{'orjson ms':>12}{'speedup':>10}")
+        for schema in (InvoiceOut, PaymentOut, BudgetOut, EventOut):
+            page = {'items': [sample(schema) for _ in range(rows)], 'count': rows}
+            self.report(
+                f"{schema.__name__} x{rows}",
+                self.best(repeat, lambda: stock.render(None, page, response_status=200)),
+                self.best(repeat, lambda: fast.render(None, page, response_status=200)),
+            )
+
+        body = json.dumps(sample(InvoiceIn, many=50), cls=stock.encoder_class)
+        request = RequestFactory().post('/', data=body, content_type='application/json')
+        self.report(
+            "parse InvoiceIn (50 items)",
+            self.best(repeat, lambda: Parser().parse_body(request)),
+            self.best(repeat, lambda: ORJSONParser().parse_body(request)),
+        )
+
+    def report(self, label, stock, fast):
+        self.stdout.write(f"{label:<28}{stock * 1000:>12.2f}{fast * 1000:>12.2f}{stock / fast:>9.1f}x")
+
+    def best(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,107 @@
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.api import api
+from api.api.schema.content_schemas import ContentOut
+from api.api.schema.event_schemas import EventOut
+from api.api.schema.schemas import InvoiceOut
+from api.models.content import Content
+from api.models.event import Event
+from api.models.payment import Invoice, InvoiceItem
+from api.models.service import Service, ServiceCategory
+from api.utils.projection import parse_paths, plan_for, subset_schema
+from api.utils.row_encoder import encoder_for
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark rows/sec of list serialization through pydantic versus the row encoder "
+        "fast path. Rows are seeded in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help="Rows seeded per table (default 1000)")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case; the best is reported")
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        expanded = parse_paths('service.category,order.quote.service.category,lead.service.category')
+        cases = [
+            ('list_invoices', Invoice, subset_schema(InvoiceOut, expand=())),
+            ('list_invoices?expand=...', Invoice, subset_schema(InvoiceOut, expand=expanded)),
+            ('list_events', Event, EventOut),
+            ('list_content', Content, ContentOut),
+        ]
+
+        with transaction.atomic():
+            self.seed(rows)
+            self.stdout.write(f"{'route':<28}{'pydantic rows/s':>18}{'fast path rows/s':>20}{'speedup':>10}")
+            for label, model, schema in cases:
+                regular = self.best(repeat, lambda: self.serialize_regular(model, schema))
+                fast = self.best(repeat, lambda: self.serialize_fast(model, schema))
+                self.stdout.write(
+                    f"{label:<28}{rows / regular:>18,.0f}{rows / fast:>20,.0f}{regular / fast:>9.1f}x"
+                )
+            transaction.set_rollback(True)
+
+    def best(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def serialize_regular(self, model, schema):
+        queryset = plan_for(model, schema).apply(model.objects.all())
+        data = [schema.model_validate(obj).model_dump() for obj in queryset]
+        return api.renderer.render(None, data, response_status=200)
+
+    def serialize_fast(self, model, schema):
+        encoder = encoder_for(model, schema)
+        data = encoder.encode(encoder.queryset(model.objects.all()))
+        return api.renderer.render(None, data, response_status=200)
+
+    def seed(self, rows):
+        category = ServiceCategory.objects.create(name=f"Benchmark {uuid.uuid4().hex[:8]}")
+        service = Service.objects.create(
+            name="Benchmark", category=category, description="Benchmark service",
+            base_price=Decimal('100.00'), delivery_time="1 week", created_by="1",
+        )
+        today = date.today()
+        invoices = Invoice.objects.bulk_create(
+            Invoice(
+                invoice_number=f"BENCH-{uuid.uuid4().hex[:12].upper()}", client_id="1",
+                client_name="Benchmark client", service=service, issue_date=today, due_date=today,
+                subtotal=Decimal('1000.00'), tax_amount=Decimal('75.00'), total_amount=Decimal('1075.00'),
+                amount_paid=Decimal('100.00'), created_by="1",
+            )
+            for _ in range(rows)
+        )
+        InvoiceItem.objects.bulk_create(
+            InvoiceItem(
+                invoice=invoice, description=f"Line {line}", quantity=Decimal('2'),
+                unit_price=Decimal('250.00'), total=Decimal('500.00'),
+            )
+            for invoice in invoices for line in range(2)
+        )
+        Event.objects.bulk_create(
+            Event(
+                name=f"Benchmark event {n}", event_type='webinar', event_date=today + timedelta(days=n % 60),
+                venue_name="Hall", city="Lagos", max_registrations=100, current_registrations=n % 100,
+                registration_fee=Decimal('25.00'), tags="bench,events",
+            )
+            for n in range(rows)
+        )
+        Content.objects.bulk_create(
+            Content(
+                title=f"Benchmark post {n}", slug=f"bench-{uuid.uuid4().hex[:12]}", platform='website',
+                body="Lorem ipsum " * 50, views=n, likes=n // 3, shares=n // 7, comments=n // 11,
+            )
+            for n in range(rows)
+        )
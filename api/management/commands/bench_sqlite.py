@@ -0,0 +1,91 @@
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+
+# SQLite's own behaviour: rollback journal, deferred transactions, Python's 5 s busy timeout
+DEFAULT_OPTIONS = {}
+
+ACCOUNTS = 10
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent read-then-write transactions (like recording a payment) against "
+        "a scratch SQLite file with SQLite's defaults and with the tuned OPTIONS from "
+        "settings, and compare throughput and 'database is locked' failures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent writers (default 8)")
+        parser.add_argument('--transactions', type=int, default=200, help="Transactions per writer (default 200)")
+
+    def handle(self, *args, **options):
+        tuned = settings.DATABASES['default'].get('OPTIONS', {})
+        if not tuned.get('init_command'):
+            self.stderr.write("settings.DATABASES['default'] has no SQLite tuning (TRY_LOCAL_DB/SQLITE_PERFORMANCE_MODE)")
+            return
+
+        self.stdout.write(f"{'mode':<10}{'txn/s':>10}{'failed':>8}{'p50 ms':>10}{'p95 ms':>10}")
+        with tempfile.TemporaryDirectory() as directory:
+            for mode, sqlite_options in (('defaults', DEFAULT_OPTIONS), ('tuned', tuned)):
+                alias = f'bench_{mode}'
+                self.add_database(alias, Path(directory) / f'{mode}.sqlite3', sqlite_options)
+                try:
+                    self.report(mode, *self.run(alias, options['threads'], options['transactions']))
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+
+    def add_database(self, alias, name, sqlite_options):
+        connections.settings[alias] = {
+            **connections['default'].settings_dict, 'NAME': str(name), 'OPTIONS': dict(sqlite_options),
+        }
+        with connections[alias].cursor() as cursor:
+            cursor.execute("CREATE TABLE account (id INTEGER PRIMARY KEY, balance INTEGER NOT NULL)")
+            cursor.executemany("INSERT INTO account (id, balance) VALUES (%s, 0)", [(i,) for i in range(ACCOUNTS)])
+
+    def run(self, alias, threads, count):
+        timings, failures = [], []
+        lock = threading.Lock()
+
+        def writer(index):
+            local_timings, failed = [], 0
+            try:
+                for n in range(count):
+                    account = (index + n) % ACCOUNTS
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+                            cursor.execute("SELECT balance FROM account WHERE id = %s", [account])
+                            balance = cursor.fetchone()[0]
+                            cursor.execute("UPDATE account SET balance = %s WHERE id = %s", [balance + 1, account])
+                    except OperationalError:
+                        failed += 1
+                    local_timings.append(time.perf_counter() - started)
+            finally:
+                connections[alias].close()
+            with lock:
+                timings.extend(local_timings)
+                failures.append(failed)
+
+        workers = [threading.Thread(target=writer, args=(index,)) for index in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        return (threads * count - sum(failures)) / elapsed, sum(failures), timings
+
+    def report(self, mode, rate, failed, timings):
+        timings = sorted(timings)
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        self.stdout.write(f"{mode:<10}{rate:>10,.0f}{failed:>8}{p50:>10.1f}{p95:>10.1f}")
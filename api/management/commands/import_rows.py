@@ -0,0 +1,59 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.api.schema.expense_schemas import ExpenseIn
+from api.api.schema.property_schemas import PropertyIn
+from api.models.expenses import Expense
+from api.models.property import Property
+from api.utils.bulk import DEFAULT_BATCH_SIZE, bulk_import
+
+
+# resource name -> (model, create schema)
+IMPORTABLE = {
+    'expenses': (Expense, ExpenseIn),
+    'properties': (Property, PropertyIn),
+}
+
+
+def read_rows(path: Path):
+    """Stream dict rows from a .csv, .ndjson/.jsonl or .json (array) file."""
+    if path.suffix == '.csv':
+        with path.open(newline='', encoding='utf-8') as handle:
+            yield from csv.DictReader(handle)
+    elif path.suffix in ('.ndjson', '.jsonl'):
+        with path.open(encoding='utf-8') as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.suffix == '.json':
+        with path.open(encoding='utf-8') as handle:
+            yield from json.load(handle)
+    else:
+        raise CommandError(f"Unsupported file type {path.suffix!r}; use .csv, .ndjson, .jsonl or .json")
+
+
+class Command(BaseCommand):
+    help = "Bulk import expenses or properties from a CSV, NDJSON or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=sorted(IMPORTABLE))
+        parser.add_argument('path', type=Path)
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--show-errors', type=int, default=20, help="Row errors to print (default 20)")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+        model, schema = IMPORTABLE[options['resource']]
+
+        result = bulk_import(model, schema, read_rows(path), batch_size=options['batch_size'])
+
+        for error in result.errors[:options['show_errors']]:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        if result.failed > options['show_errors']:
+            self.stderr.write(f"... and {result.failed - options['show_errors']} more")
+        self.stdout.write(self.style.SUCCESS(f"Created {result.created} {options['resource']}, {result.failed} rows failed"))
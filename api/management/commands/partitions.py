@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from api.utils import partitions
+from api.utils.partitions import PARTITIONED_TABLES, PartitionError
+
+
+def month(value: str):
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise CommandError(f"Expected a month as YYYY-MM, got {value!r}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage monthly partitions of the payment and expense tables (PostgreSQL): "
+        "'convert' partitions a table once, 'create' adds upcoming months (run daily), "
+        "'detach' archives old months without blocking writes, 'list' shows them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['convert', 'create', 'detach', 'list'])
+        parser.add_argument('resources', nargs='*',
+                            help=f"Any of {', '.join(sorted(PARTITIONED_TABLES))} (default: all)")
+        parser.add_argument('--months-ahead', type=int, help="Months to create ahead (default API_PARTITION_MONTHS_AHEAD)")
+        parser.add_argument('--before', type=month, help="detach: months before this one (YYYY-MM)")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        action, using = options['action'], options['database']
+        if action == 'detach' and options['before'] is None:
+            raise CommandError("detach needs --before YYYY-MM")
+        unknown = set(options['resources']) - PARTITIONED_TABLES.keys()
+        if unknown:
+            raise CommandError(f"Unknown resources: {', '.join(sorted(unknown))}")
+        for resource in options['resources'] or sorted(PARTITIONED_TABLES):
+            spec = PARTITIONED_TABLES[resource]
+            try:
+                if action == 'convert':
+                    created = partitions.convert(spec, options['months_ahead'], using)
+                    self.stdout.write(self.style.SUCCESS(f"{spec.table}: partitioned into {len(created)} months"))
+                elif action == 'create':
+                    created = partitions.ensure_partitions(spec, options['months_ahead'], using=using)
+                    self.stdout.write(f"{spec.table}: created {', '.join(created) or 'nothing'}")
+                elif action == 'detach':
+                    detached = partitions.detach(spec, options['before'], using)
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{spec.table}: detached {', '.join(detached) or 'nothing'}; archive and drop them when ready"
+                    ))
+                elif not partitions.is_partitioned(spec, using):
+                    self.stdout.write(f"{spec.table}: not partitioned")
+                else:
+                    for first_day, name in partitions.partitions(spec, using).items():
+                        self.stdout.write(f"{spec.table}: {first_day:%Y-%m} {name}")
+            except PartitionError as e:
+                raise CommandError(f"{spec.table}: {e}")
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models.sync import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than API_SYNC_TOMBSTONE_DAYS (run periodically, e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.API_SYNC_TOMBSTONE_DAYS,
+            help="Keep tombstones this many days (default API_SYNC_TOMBSTONE_DAYS)",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstones older than {options['days']} days"))
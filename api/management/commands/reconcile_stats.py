@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute the /stats counters from the source tables (run periodically, e.g. from cron)."
+
+    def handle(self, *args, **options):
+        values = reconcile()
+        for key, value in sorted(values.items()):
+            self.stdout.write(f"{key}: {value}")
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {len(values)} counters"))
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_statcounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("resource", models.CharField(max_length=50)),
+                ("object_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="content",
+            index=models.Index(fields=["updated_at", "id"], name="api_content_updated_aaf9b1_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(fields=["updated_at", "id"], name="api_documen_updated_76a5ac_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["updated_at", "id"], name="api_event_updated_45b71f_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(fields=["updated_at", "id"], name="api_expense_updated_eb83b8_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["updated_at", "id"], name="api_invoice_updated_bdf963_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(fields=["updated_at", "id"], name="api_propert_updated_e5f69b_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="serviceorder",
+            index=models.Index(fields=["updated_at", "id"], name="api_service_updated_33bafa_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["resource", "id"], name="api_tombsto_resourc_4e37cf_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["resource", "deleted_at"], name="api_tombsto_resourc_57bd7b_idx"),
+        ),
+    ]
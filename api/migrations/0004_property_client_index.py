@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_sync_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(fields=["client_id"], name="api_propert_client__72fba9_idx"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_property_client_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(fields=["date"], name="api_expense_date_f214eb_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(fields=["payment_date"], name="api_payment_payment_d80323_idx"),
+        ),
+    ]
@@ -4,3 +4,5 @@ from .payment import *
 from .property import *
 from .service import *
 from .document import *
+from .stats import *
+from .sync import *
@@ -64,6 +64,11 @@ class Budget(models.Model):
     def __str__(self):
         return f"{self.invoice_id} - {self.project_id}"
 
+    # Model fields read by each computed property (see api.utils.projection)
+    PROJECTION_DEPENDENCIES = {
+        'amount_display': ['amount'],
+    }
+
     @property
     def amount_display(self):
         return f"{self.amount:,.2f}"
@@ -202,11 +202,19 @@ class Content(models.Model):
             models.Index(fields=['status', '-published_date']),
             models.Index(fields=['content_type', 'platform']),
             models.Index(fields=['author_id', '-created_at']),
+            models.Index(fields=['updated_at', 'id']),  # /sync keyset order
         ]
     
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
     
+    # Model fields read by each computed property (see api.utils.projection)
+    PROJECTION_DEPENDENCIES = {
+        'engagement_rate': ['views', 'likes', 'shares', 'comments'],
+        'total_engagement': ['likes', 'shares', 'comments'],
+        'is_published': ['status'],
+    }
+    
     @property
     def engagement_rate(self):
         """Calculate engagement rate based on views"""
@@ -25,6 +25,9 @@ class Document(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Document'
         verbose_name_plural = 'Documents'
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),  # /sync keyset order
+        ]
     
     def __str__(self):
         return f"{self.title}"
@@ -250,11 +250,22 @@ class Event(models.Model):
             models.Index(fields=['status', 'event_date']),
             models.Index(fields=['event_type', '-event_date']),
             models.Index(fields=['organizer_id', '-created_at']),
+            models.Index(fields=['updated_at', 'id']),  # /sync keyset order
         ]
     
     def __str__(self):
         return f"{self.name} - {self.event_date}"
     
+    # Model fields read by each computed property (see api.utils.projection)
+    PROJECTION_DEPENDENCIES = {
+        'registration_percentage': ['max_registrations', 'current_registrations'],
+        'is_full': ['max_registrations', 'current_registrations'],
+        'available_slots': ['max_registrations', 'current_registrations'],
+        'is_upcoming': ['event_date'],
+        'is_past': ['event_date'],
+        'location_display': ['is_online', 'online_platform', 'venue_name', 'city'],
+    }
+    
     @property
     def registration_percentage(self):
         """Calculate registration fill percentage"""
@@ -374,6 +385,14 @@ class EventRegistration(models.Model):
         verbose_name_plural = _("Event Registrations")
         unique_together = ['event', 'attendee_id']
         ordering = ['-registration_date']
+
+    # Target status -> statuses it may be reached from (see api.utils.transitions)
+    STATUS_TRANSITIONS = {
+        'confirmed': ['pending'],
+        'cancelled': ['pending', 'confirmed'],
+        'attended': ['confirmed'],
+        'no_show': ['confirmed'],
+    }
     
     def __str__(self):
         return f"{self.attendee_id} - {self.event.name}"
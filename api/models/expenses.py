@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router
 
 class Expense(models.Model):
     STATUS_CHOICES = [
@@ -39,6 +39,23 @@ class Expense(models.Model):
         ordering = ['-date', '-created_at']
         verbose_name = 'Expense'
         verbose_name_plural = 'Expenses'
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),  # /sync keyset order
+            models.Index(fields=['date']),  # list order; partition key (see api.utils.partitions)
+        ]
     
+    # Target status -> statuses it may be reached from (see api.utils.transitions)
+    STATUS_TRANSITIONS = {
+        'approved': ['pending'],
+        'rejected': ['pending'],
+        'paid': ['approved'],
+    }
+
+    def save(self, *args, **kwargs):
+        from api.utils.partitions import write_with_partitions  # imports this module
+
+        using = kwargs.get('using') or router.db_for_write(Expense, instance=self)
+        write_with_partitions(Expense, lambda: super(Expense, self).save(*args, **kwargs), using)
+
     def __str__(self):
         return f"{self.date} - {self.description} - {self.amount}"
\ No newline at end of file
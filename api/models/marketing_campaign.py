@@ -134,6 +134,14 @@ class MarketingCampaign(models.Model):
     def __str__(self):
         return f"{self.name} - {self.get_status_display()}"
     
+    # Model fields read by each computed property (see api.utils.projection)
+    PROJECTION_DEPENDENCIES = {
+        'budget_remaining': ['budget_allocated', 'budget_spent'],
+        'budget_utilization_percentage': ['budget_allocated', 'budget_spent'],
+        'is_over_budget': ['budget_allocated', 'budget_spent'],
+        'clicks': ['impressions', 'ctr'],
+    }
+    
     @property
     def budget_remaining(self):
         """Calculate remaining budget"""
@@ -50,6 +50,7 @@ class Invoice(models.Model):
         indexes = [
             models.Index(fields=['client_id']),
             models.Index(fields=['status']),
+            models.Index(fields=['updated_at', 'id']),  # /sync keyset order
         ]
 
     def clean(self):
@@ -97,6 +98,21 @@ class Invoice(models.Model):
 
         super().save(*args, **kwargs)
 
+    # Target status -> statuses it may be reached from (see api.utils.transitions);
+    # partially_paid/paid are derived from payments and cannot be set in bulk
+    STATUS_TRANSITIONS = {
+        'sent': ['draft'],
+        'viewed': ['sent'],
+        'overdue': ['sent', 'viewed', 'partially_paid'],
+        'cancelled': ['draft', 'sent', 'viewed', 'overdue'],
+    }
+
+    # Model fields read by each computed property (see api.utils.projection)
+    PROJECTION_DEPENDENCIES = {
+        'balance': ['total_amount', 'amount_paid'],
+        'payment_progress': ['total_amount', 'amount_paid'],
+    }
+
     @property
     def balance(self):
         return self.total_amount - self.amount_paid
@@ -156,6 +172,9 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ['-payment_date']
+        indexes = [
+            models.Index(fields=['payment_date']),  # list order; partition key (see api.utils.partitions)
+        ]
 
     def clean(self):
         """Validate cross-service references before saving."""
@@ -173,7 +192,8 @@ class Payment(models.Model):
             raise ValidationError(errors)
 
     def save(self, *args, **kwargs):
-        from django.db import transaction
+        from django.db import router, transaction
+        from api.utils.partitions import write_with_partitions  # imports this module
 
         # Validate unless explicitly skipped
         if not kwargs.pop('skip_validation', False):
@@ -185,7 +205,8 @@ class Payment(models.Model):
 
         # Use atomic transaction with select_for_update to prevent race conditions
         with transaction.atomic():
-            super().save(*args, **kwargs)
+            using = kwargs.get('using') or router.db_for_write(Payment, instance=self)
+            write_with_partitions(Payment, lambda: super(Payment, self).save(*args, **kwargs), using)
 
             # Lock the invoice row for update to prevent concurrent modifications
             invoice = Invoice.objects.select_for_update().get(pk=self.invoice_id)
@@ -75,6 +75,10 @@ class Property(models.Model):
         verbose_name = "Property"
         verbose_name_plural = "Properties"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['client_id']),
+            models.Index(fields=['updated_at', 'id']),  # /sync keyset order
+        ]
 
     def __str__(self):
         return self.name
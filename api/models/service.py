@@ -246,6 +246,7 @@ class ServiceOrder(models.Model):
             models.Index(fields=['client_id']),
             models.Index(fields=['order_status']),
             models.Index(fields=['payment_status']),
+            models.Index(fields=['updated_at', 'id']),  # /sync keyset order
         ]
 
     def clean(self):
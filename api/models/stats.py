@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class StatCounter(models.Model):
+    """
+    Incrementally maintained row counts for the dashboard statistics.
+
+    Rows are keyed like ``orders.total`` or ``orders.status.pending`` and are
+    kept current by the signal handlers in ``api.signals``; the
+    ``reconcile_stats`` management command recomputes them from scratch.
+    """
+
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['key']
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
@@ -0,0 +1,26 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    A deleted row of a synced resource.
+
+    Written by the ``post_delete`` handlers in ``api.signals`` so that
+    ``/sync/<resource>`` can tell offline clients which IDs to drop; pruned
+    by the ``prune_tombstones`` management command.
+    """
+
+    resource = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['resource', 'id']),
+            models.Index(fields=['resource', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.resource}:{self.object_id} deleted {self.deleted_at}"
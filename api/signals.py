@@ -0,0 +1,90 @@
+"""
+Model signal handlers for the api app.
+
+Connected from ``ApiConfig.ready()``.
+"""
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_save
+
+from api.utils.counters import TRACKED_MODELS, adjust, status_key, total_key
+from api.models.budget import Budget
+from api.models.property import Property
+from api.models.sync import Tombstone
+from api.utils import live, partitions
+from api.utils.db_connections import count_connection
+from api.utils.response_cache import INVALIDATES, invalidate_model
+from api.utils.sync import SYNC_RESOURCES, resource_for
+
+
+def _loaded_status(instance, field):
+    # Read from __dict__ so deferred fields never trigger a query.
+    return instance.__dict__.get(field)
+
+
+def remember_status(sender, instance, **kwargs):
+    _, field = TRACKED_MODELS[sender]
+    instance._counted_status = _loaded_status(instance, field)
+
+
+def count_saved(sender, instance, created, **kwargs):
+    prefix, field = TRACKED_MODELS[sender]
+    status = _loaded_status(instance, field)
+    previous = getattr(instance, '_counted_status', None)
+
+    if created:
+        adjust({total_key(prefix): 1, status_key(prefix, status): 1})
+    elif previous is not None and status is not None and previous != status:
+        adjust({status_key(prefix, previous): -1, status_key(prefix, status): 1})
+
+    instance._counted_status = status
+
+
+def count_deleted(sender, instance, **kwargs):
+    prefix, field = TRACKED_MODELS[sender]
+    deltas = {total_key(prefix): -1}
+    status = getattr(instance, '_counted_status', None) or _loaded_status(instance, field)
+    if status is not None:
+        deltas[status_key(prefix, status)] = -1
+    adjust(deltas)
+
+
+def invalidate_cached(sender, **kwargs):
+    invalidate_model(sender)
+
+
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(resource=resource_for(sender), object_id=instance.pk)
+
+
+def push_live(sender, instance, **kwargs):
+    live.changed(sender, instance)
+
+
+def ensure_partition(sender, instance, raw=False, using=None, **kwargs):
+    partitions.ensure_for(sender, [instance], using)
+
+
+def create_partitions(sender, using=None, **kwargs):
+    if sender.name == 'api':
+        for spec in partitions.PARTITIONED_TABLES.values():
+            partitions.ensure_partitions(spec, using=using)
+
+
+def connect_signals():
+    connection_created.connect(count_connection, dispatch_uid='db-connection-opened')
+    post_migrate.connect(create_partitions, dispatch_uid='partitions-migrate')
+    for spec in partitions.PARTITIONED_TABLES.values():
+        pre_save.connect(ensure_partition, sender=spec.model, dispatch_uid=f'partition-save-{spec.model.__name__}')
+    for model in SYNC_RESOURCES.values():
+        post_delete.connect(record_tombstone, sender=model, dispatch_uid=f'sync-delete-{model.__name__}')
+    for model in INVALIDATES:
+        post_save.connect(invalidate_cached, sender=model, dispatch_uid=f'cache-save-{model.__name__}')
+        post_delete.connect(invalidate_cached, sender=model, dispatch_uid=f'cache-delete-{model.__name__}')
+    for model in TRACKED_MODELS:
+        post_init.connect(remember_status, sender=model, dispatch_uid=f'stats-init-{model.__name__}')
+        post_save.connect(count_saved, sender=model, dispatch_uid=f'stats-save-{model.__name__}')
+        post_delete.connect(count_deleted, sender=model, dispatch_uid=f'stats-delete-{model.__name__}')
+    for model in (*TRACKED_MODELS, Property, Budget):
+        post_save.connect(push_live, sender=model, dispatch_uid=f'live-save-{model.__name__}')
+        post_delete.connect(push_live, sender=model, dispatch_uid=f'live-delete-{model.__name__}')
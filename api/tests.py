@@ -1,3 +1,1871 @@
-from django.test import TestCase
+import asyncio
+import functools
+import itertools
+import json
+import threading
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, OperationalError, connection, connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ninja import Schema
+from ninja.renderers import JSONRenderer
+from ninja.responses import NinjaJSONEncoder
+
+from api.api import api
+from api.api.schema.event_schemas import EventOut
+from api.api.schema.schemas import InvoiceOut
+from api.models.budget import Budget
+from api.models.content import Content
+from api.models.document import Document
+from api.models.event import Event, EventRegistration
+from api.models.expenses import Expense
+from api.models.marketing_campaign import MarketingCampaign
+from api.models.payment import Invoice, InvoiceItem, Payment
+from api.models.property import Property
+from api.models.service import Quote, Service, ServiceCategory, ServiceLead, ServiceOrder
+from api.models.stats import StatCounter
+from api.models.sync import Tombstone
+from api.utils import auth_client as auth_client_module, batch as batch_module, counters, db_connections, live
+from api.utils import overview as overview_module, partitions, replicas as replica_module
+from api.utils.auth_client import AsyncAuthClient, AuthClient
+from api.utils.counters import read_counters
+from api.utils.dashboard import budget_summaries
+from api.utils.projection import SCHEMA_CACHE_SIZE, parse_paths, plan_for, subset_schema
+from api.utils.renderers import ORJSONParser, ORJSONRenderer
+from api.utils.tiered_cache import refresh_early
+
+
+AUTH = {"HTTP_AUTHORIZATION": "Bearer test-token"}
+
+# tests clear the cache freely, so its shared tier is a private in-memory one, never Redis or the cache directory
+TEST_CACHES = {
+    **settings.CACHES,
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "bomach-test-l2"},
+}
+_test_caches = override_settings(CACHES=TEST_CACHES)
+
+
+def setUpModule():
+    _test_caches.enable()
+
+
+def tearDownModule():
+    _test_caches.disable()
+
+
+class AuthenticatedTestCase(TestCase):
+    """Runs requests as an authenticated user without calling the auth service."""
+
+    def setUp(self):
+        for client in (AuthClient, AsyncAuthClient):
+            patcher = mock.patch.object(client, "verify_token", return_value=(True, 1))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        cache.clear()
+
+    def get(self, path, **params):
+        headers = {key: params.pop(key) for key in list(params) if key.startswith("HTTP_")}
+        return self.client.get(f"/api/v1{path}", params, **AUTH, **headers)
+
+
+def selected_columns(sql, table):
+    """Column names read from ``table`` in a SELECT statement."""
+    select_list = sql.split(" FROM ", 1)[0]
+    prefix = f'"{table}".'
+    return {
+        part.split(" AS ", 1)[0].strip().split(prefix, 1)[1].strip('"')
+        for part in select_list.split(",")
+        if prefix in part
+    }
+
+
+def create_invoice(service):
+    """An invoice with an order (from a quote), a lead and one line item."""
+    quote = Quote.objects.create(
+        client_id="C1", client_name="Ada", service=service, description="Quote",
+        amount=Decimal("100.00"), valid_until=date.today() + timedelta(days=30), created_by="1",
+    )
+    order = ServiceOrder.objects.create(
+        client_id="C1", client_name="Ada", service=service, quote=quote, description="Order",
+        amount=Decimal("100.00"), valid_until=date.today() + timedelta(days=30), created_by="1",
+    )
+    lead = ServiceLead.objects.create(
+        client_id="C1", client_name="Ada", service=service,
+        estimated_value=Decimal("100.00"), created_by="1",
+    )
+    invoice = Invoice.objects.create(
+        client_id="C1", client_name="Ada", service=service, order=order, lead=lead,
+        issue_date=date.today(), due_date=date.today(), subtotal=Decimal("100.00"),
+        tax_amount=Decimal("0.00"), total_amount=Decimal("0.00"), created_by="1",
+    )
+    InvoiceItem.objects.create(
+        invoice=invoice, description="Survey", quantity=Decimal("1"), unit_price=Decimal("100.00"),
+    )
+
+    return invoice
+
+
+class ProjectionTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = ServiceCategory.objects.create(name="Construction")
+        self.service = Service.objects.create(
+            name="Survey", category=self.category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+
+    def test_plan_omits_columns_outside_schema(self):
+        sql = str(plan_for(Event, EventOut).apply(Event.objects.all()).query)
+        columns = selected_columns(sql, "api_event")
+
+        self.assertIn("venue_address", columns)
+        self.assertIn("max_registrations", columns)  # read by registration_percentage
+        self.assertNotIn("banner_image", columns)
+        self.assertNotIn("thumbnail", columns)
+
+    def test_plan_omits_large_columns_for_trimmed_schema(self):
+        class ContentCardOut(Schema):
+            id: int
+            title: str
+            engagement_rate: float
+
+        sql = str(plan_for(Content, ContentCardOut).apply(Content.objects.all()).query)
+
+        self.assertEqual(
+            selected_columns(sql, "api_content"),
+            {"id", "title", "views", "likes", "shares", "comments"},
+        )
+
+    def test_nested_schemas_are_joined(self):
+        plan = plan_for(Invoice, InvoiceOut)
+
+        self.assertIn("order__quote__service__category", plan.select_related)
+        self.assertIn("lead__service__category", plan.select_related)
+        self.assertEqual([prefetch.prefetch_to for prefetch in plan.prefetch], ["items"])
+
+    def test_list_events_route_reads_projected_columns(self):
+        Event.objects.create(name="Expo", event_type="exhibition", event_date=date.today())
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("/events")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["items"][0]["name"], "Expo")
+        select = next(q["sql"] for q in queries if q["sql"].startswith('SELECT "api_event"."id"'))
+        self.assertNotIn("banner_image", selected_columns(select, "api_event"))
+
+    def test_list_invoices_route_serializes_full_graph(self):
+        create_invoice(self.service)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(
+                "/invoices", expand="service.category,order.quote.service.category,lead.service.category",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        item = response.json()["items"][0]
+        self.assertEqual(item["order"]["quote"]["service"]["category"]["name"], "Construction")
+        self.assertEqual(item["items"][0]["description"], "Survey")
+        # auth-free: ETag aggregate, count, invoices with joins, prefetched items
+        self.assertEqual(len(queries), 4)
+
+
+class SparseFieldsetTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        self.invoice = create_invoice(service)
+
+    def test_selection_caches_are_bounded(self):
+        names = list(InvoiceOut.model_fields)
+        selections = itertools.islice(itertools.combinations(names, 3), SCHEMA_CACHE_SIZE + 50)
+        for selection in selections:
+            plan_for(Invoice, subset_schema(InvoiceOut, parse_paths(",".join(selection))))
+
+        self.assertLessEqual(subset_schema.cache_info().currsize, SCHEMA_CACHE_SIZE)
+        self.assertLessEqual(plan_for.cache_info().currsize, SCHEMA_CACHE_SIZE)
+
+    def test_fields_trim_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("/invoices", fields="invoice_number,service.name,id")
+
+        self.assertEqual(response.status_code, 200)
+        item = response.json()["items"][0]
+        self.assertEqual(list(item), ["id", "invoice_number", "service"])
+        self.assertEqual(item["service"], {"name": "Survey"})
+        select = next(q["sql"] for q in queries if q["sql"].startswith('SELECT "api_invoice"."id"'))
+        self.assertEqual(selected_columns(select, "api_invoice"), {"id", "invoice_number", "service_id"})
+        self.assertLessEqual(selected_columns(select, "api_service"), {"id", "name"})
+
+    def test_exclude_drops_fields(self):
+        response = self.get(f"/invoices/{self.invoice.id}", exclude="items,order.quote,lead", expand="order")
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertNotIn("items", body)
+        self.assertNotIn("lead", body)
+        self.assertNotIn("quote", body["order"])
+        self.assertIn("service", body["order"])
+
+    def test_equivalent_selections_render_identically(self):
+        first = self.get("/invoices", fields="service.name,id,service")
+        second = self.get("/invoices", fields="id, service")
+
+        self.assertEqual(first.content, second.content)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.get("/invoices", fields="id,colour,service.nope")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Unknown field(s): colour, service.nope"})
+
+    def test_default_response_keeps_declared_fields(self):
+        response = self.get(f"/invoices/{self.invoice.id}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["items"][0]["description"], "Survey")
+
+
+class ExpandTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        self.invoice = create_invoice(service)
+
+    def test_nested_objects_default_to_ids(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("/invoices")
+
+        item = response.json()["items"][0]
+        self.assertEqual(item["service"], self.invoice.service_id)
+        self.assertEqual(item["order"], self.invoice.order_id)
+        self.assertEqual(item["lead"], self.invoice.lead_id)
+        self.assertEqual(item["items"][0]["description"], "Survey")
+        self.assertFalse(any(" JOIN " in query["sql"] for query in queries))
+
+    def test_expand_drives_shape_and_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("/invoices", expand="order.quote")
+
+        item = response.json()["items"][0]
+        self.assertEqual(item["order"]["quote"]["service"], self.invoice.service_id)
+        self.assertEqual(item["order"]["service"], self.invoice.service_id)
+        self.assertEqual(item["lead"], self.invoice.lead_id)
+        select = next(q["sql"] for q in queries if q["sql"].startswith('SELECT "api_invoice"."id"'))
+        self.assertIn('JOIN "api_serviceorder"', select)
+        self.assertIn('JOIN "api_quote"', select)
+        self.assertNotIn('JOIN "api_service"', select)
+        self.assertNotIn('JOIN "api_servicelead"', select)
+
+    def test_order_detail_expands_service(self):
+        response = self.get(f"/orders/{self.invoice.order_id}", expand="service.category")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["service"]["category"]["name"], "Construction")
+        self.assertEqual(response.json()["quote"], self.invoice.order.quote_id)
+
+    def test_invalid_expansions_are_rejected(self):
+        response = self.get("/invoices", expand="order.client_name,items,nope")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Cannot expand: items, nope, order.client_name"})
+
+    def test_openapi_documents_ids_or_objects(self):
+        schema = api.get_openapi_schema()
+        components = schema["components"]["schemas"]
+        ok = schema["paths"]["/api/v1/invoices"]["get"]["responses"][200]["content"]["application/json"]
+
+        self.assertEqual(ok["schema"], {"$ref": "#/components/schemas/PagedInvoiceOutExpandable"})
+        service = components["InvoiceOutExpandable"]["properties"]["service"]
+        self.assertEqual(service["anyOf"], [{"type": "integer"}, {"$ref": "#/components/schemas/ServiceOutExpandable"}])
+        quote = components["ServiceOrderOutExpandable"]["properties"]["quote"]["anyOf"]
+        self.assertEqual(quote[:2], [{"type": "integer"}, {"$ref": "#/components/schemas/QuoteOutExpandable"}])
+
+
+@override_settings(API_RESPONSE_CACHE_TIMEOUT=0)
+class QueryCountTests(AuthenticatedTestCase):
+    """
+    Every GET route must issue the same number of queries for N and 10N rows.
+
+    Routes are discovered from the registered API, so new routes are covered
+    (or fail loudly for a missing path parameter) without editing this test.
+    The response cache is off so the warm-up request cannot hide the queries.
+    """
+
+    N = 2
+    INVOICE_GRAPH = {"expand": "service.category,order.quote.service.category,lead.service.category"}
+    ORDER_GRAPH = {"expand": "service.category,quote.service.category"}
+    # required parameters, and expansions that load the deepest object graphs
+    EXTRA_PARAMS = {
+        "/budgets/summary": {"project_ids": "P1"},
+        "/invoices": INVOICE_GRAPH,
+        "/invoices/{invoice_id}": INVOICE_GRAPH,
+        "/orders": ORDER_GRAPH,
+        "/orders/{order_id}": ORDER_GRAPH,
+    }
+    # long-lived streams never finish a response (see LiveStreamTests)
+    SKIP = {"/stats/stream"}
+
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Anchor")
+        service = Service.objects.create(
+            name="Anchor", category=category, description="Anchor",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        invoice = create_invoice(service)
+        self.anchor = {"invoice": invoice, "order": invoice.order}
+        self.anchor["property"] = Property.objects.create(
+            name="Anchor", property_type="land", category="sale", location="Lagos",
+            price=Decimal("1.00"), size=Decimal("1.00"), client_id="C1",
+        )
+        self.anchor["event"] = Event.objects.create(
+            name="Anchor", event_type="webinar", event_date=date.today() + timedelta(days=7),
+            organizer_id="O1", is_featured=True,
+        )
+        self.rows = 0
+        self.seed(1)  # one row of everything the path parameters point at
+
+        registration = EventRegistration.objects.filter(attendee_id="A1").first()
+        self.path_params = {
+            "budget_id": Budget.objects.first().id,
+            "category_id": category.id,
+            "content_id": Content.objects.first().id,
+            "slug": Content.objects.first().slug,
+            "document_id": Document.objects.first().id,
+            "event_id": self.anchor["event"].id,
+            "registration_id": registration.id,
+            "confirmation_code": registration.confirmation_code,
+            "expense_id": Expense.objects.first().id,
+            "service_id": service.id,
+            "lead_id": invoice.lead_id,
+            "quote_id": invoice.order.quote_id,
+            "order_id": invoice.order_id,
+            "invoice_id": invoice.id,
+            "campaign_id": MarketingCampaign.objects.first().id,
+            "payment_id": Payment.objects.first().id,
+            "property_id": self.anchor["property"].id,
+            "project_id": "P1",
+            "author_id": "U1",
+            "user_id": "U1",
+            "platform": "website",
+            "event_type": "webinar",
+            "organizer_id": "O1",
+            "attendee_id": "A1",
+            "status": "draft",
+            "channel": "email",
+            "client_id": "C1",
+            "resource": "invoices",
+        }
+
+    def seed(self, count):
+        """Add ``count`` rows to every table, hanging children off the anchor objects."""
+        for _ in range(count):
+            self.rows += 1
+            n = self.rows
+            category = ServiceCategory.objects.create(name=f"Category {n}")
+            service = Service.objects.create(
+                name=f"Service {n}", category=category, description="Seeded",
+                base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+            )
+            invoice = create_invoice(service)
+            InvoiceItem.objects.create(
+                invoice=self.anchor["invoice"], description=f"Extra {n}",
+                quantity=Decimal("1"), unit_price=Decimal("1.00"),
+            )
+            Payment.objects.create(
+                invoice=invoice, amount=Decimal("1.00"), payment_method="cash",
+                payment_date=date.today(), created_by="1",
+            )
+            Budget.objects.create(
+                invoice_id=self.anchor["invoice"], project_id="P1", budget_date=date.today(), amount=Decimal("1.00"),
+            )
+            Expense.objects.create(user_id="U1", date=date.today(), description="Seeded", amount=Decimal("1.00"))
+            Property.objects.create(
+                name=f"Property {n}", property_type="land", category="sale", location="Lagos",
+                price=Decimal("1.00"), size=Decimal("1.00"), client_id="C1",
+            )
+            Document.objects.create(
+                user_id="U1", order=self.anchor["order"], property=self.anchor["property"],
+                title=f"Document {n}", file_url="https://example.com/doc.pdf",
+            )
+            event = Event.objects.create(
+                name=f"Event {n}", event_type="webinar", event_date=date.today() + timedelta(days=7),
+                organizer_id="O1", is_featured=True,
+            )
+            Event.objects.create(
+                name=f"Past event {n}", event_type="webinar", event_date=date.today() - timedelta(days=7),
+                organizer_id="O1",
+            )
+            EventRegistration.objects.create(event=event, attendee_id="A1")
+            EventRegistration.objects.create(event=self.anchor["event"], attendee_id=f"Guest {n}")
+            Content.objects.create(
+                title=f"Content {n}", platform="website", slug=f"content-{n}", author_id="U1",
+                status="scheduled", scheduled_date=timezone.now() + timedelta(days=7),
+            )
+            MarketingCampaign.objects.create(
+                name=f"Campaign {n}", channel="email", budget_allocated=10,
+            )
+
+    def get_routes(self):
+        for prefix, router in api._routers:
+            for path, path_view in router.path_operations.items():
+                route = (prefix + path).replace("/api/v1", "", 1)
+                if route not in self.SKIP and any("GET" in operation.methods for operation in path_view.operations):
+                    yield route
+
+    def count_queries(self, route):
+        params = {"limit": 1000, **self.EXTRA_PARAMS.get(route, {})}
+        path = route.format(**self.path_params)
+        self.get(path, **params)  # warm up one-off work such as counter bootstrapping
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(path, **params)
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+        self.assertEqual(response.status_code, 200, f"GET {path}: {content[:500]}")
+        return [query["sql"] for query in queries]
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        routes = sorted(self.get_routes())
+        self.assertGreater(len(routes), 50)
+
+        self.seed(self.N - self.rows)
+        small = {route: self.count_queries(route) for route in routes}
+        self.seed(10 * self.N - self.rows)
+        for route in routes:
+            with self.subTest(route=route):
+                large = self.count_queries(route)
+                self.assertEqual(
+                    len(small[route]), len(large),
+                    f"GET {route} ran {len(small[route])} queries for {self.N} rows "
+                    f"and {len(large)} for {10 * self.N}:\n" + "\n".join(large),
+                )
+
+
+class StatCounterTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = ServiceCategory.objects.create(name="Construction")
+
+    def create_service(self, status="active"):
+        return Service.objects.create(
+            name="Survey", category=self.category, description="Site survey", status=status,
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+
+    def services(self):
+        values = read_counters(include_breakdown=True)
+        return {key[len("services."):]: value for key, value in values.items() if key.startswith("services.")}
+
+    def test_counters_follow_creates_status_changes_and_deletes(self):
+        self.assertEqual(self.services()["total"], 0)
+
+        service = self.create_service()
+        self.assertEqual(self.services(), {"total": 1, "status.active": 1, "status.inactive": 0, "status.draft": 0})
+
+        service.status = "draft"
+        service.save()
+        self.assertEqual(self.services(), {"total": 1, "status.active": 0, "status.inactive": 0, "status.draft": 1})
+
+        service.delete()
+        self.assertEqual(self.services(), {"total": 0, "status.active": 0, "status.inactive": 0, "status.draft": 0})
+
+    def test_missing_counters_are_bootstrapped_by_reconcile(self):
+        self.create_service()
+        self.create_service(status="inactive")
+        StatCounter.objects.all().delete()
+
+        with mock.patch("api.utils.counters.reconcile", wraps=counters.reconcile) as reconcile:
+            self.assertEqual(self.services()["total"], 2)
+            self.assertEqual(self.services()["status.inactive"], 1)
+
+        reconcile.assert_called_once_with()
+
+    def test_reconcile_stats_fixes_drift(self):
+        self.create_service()
+        Service.objects.update(status="inactive")  # bypasses the signals
+        StatCounter.objects.filter(key="services.total").update(value=7)
+
+        call_command("reconcile_stats", stdout=StringIO())
+
+        self.assertEqual(self.services(), {"total": 1, "status.active": 0, "status.inactive": 1, "status.draft": 0})
+
+    def test_breakdown_is_left_out_unless_requested(self):
+        self.create_service()
+
+        stats = self.get("/stats").json()
+        self.assertEqual(stats["total_services"], 1)
+        self.assertNotIn("status_breakdown", stats)
+
+        stats = self.get("/stats", include_breakdown="true").json()
+        self.assertEqual(stats["status_breakdown"]["services"], {"active": 1, "inactive": 0, "draft": 0})
+
+
+class BudgetSummaryTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        invoice = create_invoice(service)
+        for project_id, status, amount in (
+            ("P1", "draft", "10.00"), ("P1", "draft", "5.50"), ("P1", "paid", "20.00"),
+            ("P1", "cancelled", "3.00"), ("P2", "approved", "7.25"),
+        ):
+            Budget.objects.create(
+                invoice_id=invoice, project_id=project_id, budget_date=date.today(),
+                amount=Decimal(amount), status=status,
+            )
+
+    def test_summaries_come_from_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            summaries = budget_summaries(["P1", "P2", "P3"])
+
+        self.assertEqual(len(queries), 1)
+        p1 = summaries[0]
+        self.assertEqual(p1["total_budget"], Decimal("38.50"))
+        self.assertEqual(p1["draft_budget"], Decimal("15.50"))
+        self.assertEqual(p1["paid_budget"], Decimal("20.00"))
+        self.assertEqual(p1["approved_budget"], Decimal("0.00"))
+        self.assertEqual(p1["budget_count"], 4)
+        self.assertEqual(p1["status_breakdown"], {"draft": 2, "approved": 0, "paid": 1, "cancelled": 1})
+
+    def test_summary_keeps_request_order_without_duplicates(self):
+        response = self.get("/budgets/summary", project_ids="P2, P3,P1,P2,")
+
+        self.assertEqual(response.status_code, 200)
+        summaries = response.json()
+        self.assertEqual([summary["project_id"] for summary in summaries], ["P2", "P3", "P1"])
+        self.assertEqual(summaries[0]["approved_budget"], "7.25")
+        self.assertEqual(summaries[0]["budget_count"], 1)
+        self.assertEqual(summaries[2]["total_budget"], "38.50")
+
+    def test_projects_without_budgets_get_zeroed_summaries(self):
+        response = self.get("/budgets/project/P3/summary")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "project_id": "P3", "total_budget": "0.00", "paid_budget": "0.00", "approved_budget": "0.00",
+            "draft_budget": "0.00", "budget_count": 0,
+            "status_breakdown": {"draft": 0, "approved": 0, "paid": 0, "cancelled": 0},
+        })
+        self.assertEqual(self.get("/budgets/project/P1/summary").json()["total_budget"], "38.50")
+
+
+class FastPathTests(AuthenticatedTestCase):
+    """List routes served by the row encoder match the regular (detail route) serialization."""
+
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        self.invoice = create_invoice(service)
+
+    def assertListMatchesDetail(self, model, list_path, detail_path, **params):
+        with mock.patch.object(model, "from_db", side_effect=AssertionError("model instantiated")):
+            items = self.get(list_path, **params).json()["items"]
+        detail = self.get(detail_path, **params).json()
+        self.assertEqual(items, [detail])
+
+    def test_events(self):
+        event = Event.objects.create(
+            name="Expo", event_type="exhibition", event_date=date.today(), is_online=True,
+            online_platform="Zoom", max_registrations=3, current_registrations=1,
+            duration_hours=Decimal("1.50"), team_members=["U1"],
+        )
+        self.assertListMatchesDetail(Event, "/events", f"/events/{event.id}")
+
+    def test_content(self):
+        content = Content.objects.create(
+            title="Launch", platform="website", slug="launch", author_id="U1", views=7, likes=2,
+        )
+        self.assertListMatchesDetail(Content, "/content", f"/content/{content.id}")
+
+    def test_invoices(self):
+        self.assertListMatchesDetail(Invoice, "/invoices", f"/invoices/{self.invoice.id}")
+        self.assertListMatchesDetail(
+            Invoice, "/invoices", f"/invoices/{self.invoice.id}",
+            expand="service.category,order.quote,lead", fields="id,service,order,lead,items,balance",
+        )
+
+
+class RendererTests(SimpleTestCase):
+    DATA = {
+        "amount": Decimal("1075.10"),
+        "created_at": datetime(2025, 3, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        "issue_date": date(2025, 3, 1),
+        "items": [{"total": Decimal("0.30")}],
+    }
+
+    def render(self, renderer, data):
+        return json.loads(renderer.render(None, data, response_status=200))
+
+    def test_matches_stock_renderer(self):
+        self.assertEqual(self.render(ORJSONRenderer(), self.DATA), self.render(JSONRenderer(), self.DATA))
+        self.assertEqual(self.render(ORJSONRenderer(), self.DATA)["amount"], "1075.10")
+
+    def test_datetime_formats(self):
+        self.assertEqual(
+            self.render(ORJSONRenderer("iso"), self.DATA)["created_at"], "2025-03-01T09:30:15.123456+00:00",
+        )
+        self.assertEqual(self.render(ORJSONRenderer("%d/%m/%Y"), self.DATA)["issue_date"], "01/03/2025")
+
+    def test_falls_back_for_values_outside_orjson_range(self):
+        self.assertEqual(self.render(ORJSONRenderer(), {"big": 2 ** 70}), {"big": 2 ** 70})
+
+    def test_accept_header_can_ask_for_indented_output(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT="application/json; indent=2, */*;q=0.1")
+
+        content = ORJSONRenderer().render(request, self.DATA, response_status=200)
+
+        self.assertEqual(content, json.dumps(self.DATA, cls=NinjaJSONEncoder, indent=2))
+        self.assertEqual(json.loads(content)["amount"], "1075.10")
+
+    def test_parser_keeps_decimal_digits(self):
+        request = RequestFactory().post(
+            "/", data=b'{"amount": 1234567890.123456789, "count": 2}', content_type="application/json",
+        )
+        data = ORJSONParser().parse_body(request)
+
+        self.assertEqual(data, {"amount": Decimal("1234567890.123456789"), "count": 2})
+
+    def test_parser_reads_integer_bodies_in_one_pass(self):
+        parse = ORJSONParser().parse_body
+        post = RequestFactory().post
+
+        with mock.patch("api.utils.renderers.json.loads") as slow:
+            data = parse(post("/", data=b'{"email": "a.b@example.com", "count": 2}', content_type="application/json"))
+        self.assertEqual(data, {"email": "a.b@example.com", "count": 2})
+        slow.assert_not_called()
+
+        data = parse(post("/", data=b'{"amount": 1e3, "big": 123456789012345678901}', content_type="application/json"))
+        self.assertEqual(data, {"amount": Decimal("1e3"), "big": 123456789012345678901})
+
+
+class ExportTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        self.invoice = create_invoice(service)
+        Expense.objects.create(user_id="U1", date=date(2025, 3, 1), description="Taxi", amount=Decimal("12.50"))
+        Expense.objects.create(user_id="U2", date=date(2025, 3, 2), description="Hotel", amount=Decimal("80.00"))
+
+    def export(self, path, **params):
+        response = self.get(path, **params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_applies_list_filters(self):
+        response, body = self.export("/expenses/export", user_id="U1")
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment;", response["Content-Disposition"])
+        header, *rows = body.splitlines()
+        self.assertEqual(header, "id,user_id,date,description,amount,category,status,created_at,updated_at")
+        self.assertEqual(len(rows), 1)
+        self.assertIn(",2025-03-01,Taxi,12.50,other,pending,", rows[0])
+
+    def test_ndjson_includes_nested_lists(self):
+        response, body = self.export("/invoices/export", format="ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["service"], self.invoice.service_id)
+        self.assertEqual(lines[0]["items"][0]["description"], "Survey")
+
+    def test_csv_leaves_out_nested_lists(self):
+        _, body = self.export("/invoices/export")
+
+        self.assertNotIn("items", body.splitlines()[0].split(","))
+
+    def test_rejects_unknown_format(self):
+        self.assertEqual(self.get("/payments/export", format="xlsx").status_code, 422)
+
+
+class BulkImportTests(AuthenticatedTestCase):
+    def post(self, path, data):
+        return self.client.post(f"/api/v1{path}", data, content_type="application/json", **AUTH)
+
+    def test_invalid_rows_do_not_abort_the_batch(self):
+        rows = [
+            {"user_id": "U1", "date": "2025-03-01", "description": "Taxi", "amount": "12.50"},
+            {"user_id": "U1", "date": "2025-03-01", "description": "No amount"},
+            {"user_id": "U1", "date": "2025-03-01", "description": "Bad category", "amount": "5", "category": "yachts"},
+            {"user_id": "U2", "date": "2025-03-02", "description": "Hotel", "amount": "80.00", "category": "accommodation"},
+        ]
+
+        response = self.post("/expenses/bulk", {"rows": rows})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["created"], body["failed"]), (2, 2))
+        self.assertEqual([error["row"] for error in body["errors"]], [1, 2])
+        self.assertIn("amount", body["errors"][0]["errors"])
+        self.assertIn("category", body["errors"][1]["errors"])
+        self.assertEqual(
+            sorted(Expense.objects.values_list("description", "amount")),
+            [("Hotel", Decimal("80.00")), ("Taxi", Decimal("12.50"))],
+        )
+
+    def test_import_rows_command_reads_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "listings.csv"
+            path.write_text(
+                "name,property_type,category,location,price,size,bedrooms\n"
+                "Villa,residential,sale,Lekki,250000000.00,450.00,4\n"
+                "Plot,land,lease,Epe,not-a-price,600.00,0\n"
+            )
+            stdout, stderr = StringIO(), StringIO()
+            call_command("import_rows", "properties", str(path), stdout=stdout, stderr=stderr)
+
+        self.assertEqual(list(Property.objects.values_list("name", flat=True)), ["Villa"])
+        self.assertIn("Created 1 properties, 1 rows failed", stdout.getvalue())
+        self.assertIn("row 1:", stderr.getvalue())
+
+
+class BulkStatusTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Construction")
+        self.service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+
+    def post(self, path, data):
+        return self.client.post(f"/api/v1{path}", data, content_type="application/json", **AUTH)
+
+    def test_caches_and_live_stream_are_notified_after_the_update(self):
+        expense = Expense.objects.create(user_id="U1", date=date(2025, 3, 1), description="Taxi", amount=Decimal("10"))
+        seen, depth = [], len(connection.savepoint_ids)
+
+        def record(model, *args):
+            # the rows as of the call, and whether it ran inside bulk_transition's own transaction
+            seen.append((Expense.objects.get(pk=expense.pk).status, len(connection.savepoint_ids) > depth))
+
+        with mock.patch("api.utils.transitions.invalidate_model", side_effect=record), \
+                mock.patch("api.utils.transitions.live.changed", side_effect=record):
+            self.post("/expenses/bulk-status", {"status": "approved", "ids": [expense.id]})
+
+        self.assertEqual(seen, [("approved", True), ("approved", True)])
+
+    def test_only_allowed_sources_move(self):
+        pending = [
+            Expense.objects.create(user_id="U1", date=date(2025, 3, 1), description=f"Taxi {n}", amount=Decimal("10"))
+            for n in range(3)
+        ]
+        paid = Expense.objects.create(
+            user_id="U1", date=date(2025, 3, 1), description="Paid", amount=Decimal("10"), status="paid",
+        )
+        ids = [expense.id for expense in pending] + [paid.id]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post("/expenses/bulk-status", {"status": "approved", "ids": ids})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "approved", "updated": 3})
+        self.assertEqual(sum(query["sql"].startswith("UPDATE") for query in queries), 1)
+        self.assertEqual(Expense.objects.filter(status="approved").count(), 3)
+        paid.refresh_from_db()
+        self.assertEqual(paid.status, "paid")
+
+    def test_filters_select_rows(self):
+        event = Event.objects.create(
+            name="Expo", event_type="webinar", event_date=date.today(), venue_name="Hall", city="Lagos",
+        )
+        for n in range(3):
+            EventRegistration.objects.create(event=event, attendee_id=f"A{n}", status="confirmed")
+        EventRegistration.objects.create(event=event, attendee_id="A9", status="pending")
+
+        response = self.post(
+            "/events/registrations/bulk-status",
+            {"status": "attended", "filters": {"event_id": str(event.id)}},
+        )
+
+        self.assertEqual(response.json()["updated"], 3)
+        self.assertEqual(
+            sorted(EventRegistration.objects.values_list("status", flat=True)),
+            ["attended", "attended", "attended", "pending"],
+        )
+
+    def test_invoice_counters_follow_the_update(self):
+        invoices = [create_invoice(self.service) for _ in range(2)]
+        call_command("reconcile_stats", stdout=StringIO())
+
+        response = self.post("/invoices/bulk-status", {"status": "sent", "filters": {"client_id": "C1"}})
+
+        self.assertEqual(response.json()["updated"], 2)
+        self.assertEqual(StatCounter.objects.get(key="invoices.status.draft").value, 0)
+        self.assertEqual(StatCounter.objects.get(key="invoices.status.sent").value, 2)
+        self.assertEqual(
+            list(Invoice.objects.filter(pk__in=[invoice.pk for invoice in invoices]).values_list("status", flat=True)),
+            ["sent", "sent"],
+        )
+
+    def test_rejects_bad_requests(self):
+        cases = [
+            ("/expenses/bulk-status", {"status": "approved"}, "Provide ids"),
+            ("/invoices/bulk-status", {"status": "paid", "ids": [1]}, "Cannot move"),
+            ("/expenses/bulk-status", {"status": "approved", "filters": {"colour": "red"}}, "Unknown filter(s): colour"),
+            ("/expenses/bulk-status", {"status": "approved", "filters": {"date_from": "notadate"}}, "invalid date"),
+            ("/events/registrations/bulk-status", {"status": "attended", "filters": {"event_id": "abc"}}, "expected a number"),
+        ]
+        for path, payload, message in cases:
+            with self.subTest(payload=payload):
+                response = self.post(path, payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(message, response.json()["detail"])
+
+
+class ConditionalGetTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        self.invoice = create_invoice(service)
+
+    def test_detail_revalidates_with_one_query(self):
+        response = self.get(f"/invoices/{self.invoice.id}")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(f"/invoices/{self.invoice.id}", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(len(queries), 1)
+
+        Invoice.objects.filter(pk=self.invoice.pk).update(updated_at=timezone.now() + timedelta(seconds=1))
+        response = self.get(f"/invoices/{self.invoice.id}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.get(f"/invoices/{self.invoice.id}")["Last-Modified"]
+
+        response = self.get(f"/invoices/{self.invoice.id}", HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_tracks_count_and_changes(self):
+        etag = self.get("/invoices")["ETag"]
+
+        self.assertEqual(self.get("/invoices", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.get("/invoices", status="paid", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        Invoice.objects.filter(pk=self.invoice.pk).update(updated_at=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(self.get("/invoices", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_object_is_still_404(self):
+        self.assertEqual(self.get("/properties/999999", HTTP_IF_NONE_MATCH='W/"1-1"').status_code, 404)
+
+
+class ResponseCacheTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        Event.objects.create(
+            name="Expo", event_type="webinar", event_date=date.today(), venue_name="Hall", city="Lagos",
+            is_featured=True,
+        )
+
+    def test_hits_near_expiry_may_render_again(self):
+        self.get("/events/featured/all")
+
+        with mock.patch("api.utils.response_cache.refresh_early", return_value=True), \
+                CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get("/events/featured/all").json()["count"], 1)
+
+        self.assertGreater(len(queries), 0)
+
+    def test_hit_skips_the_database(self):
+        first = self.get("/events/featured/all")
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get("/events/featured/all")
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(second.content, first.content)
+        routes = {row["route"]: row for row in self.get("/stats/cache").json()["routes"]}
+        self.assertEqual(routes["events.get_featured_events"]["hits"], 1)
+        self.assertEqual(routes["events.get_featured_events"]["misses"], 1)
+        self.assertEqual(routes["events.get_featured_events"]["hit_rate"], 0.5)
+
+    def test_misses_read_from_the_primary(self):
+        allowed = []
+        db_for_read = replica_module.ReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            allowed.append(replica_module._replica_reads.get())
+            return db_for_read(router, model, **hints)
+
+        with mock.patch.object(replica_module, "replicas", return_value=["replica_1"]), \
+                mock.patch.object(replica_module.ReplicaRouter, "db_for_read", spy):
+            response = self.get("/events/featured/all")
+
+        self.assertEqual(response.json()["count"], 1)
+        self.assertTrue(allowed)
+        self.assertNotIn(True, allowed)
+
+    def test_key_normalizes_query_params(self):
+        self.get("/events/featured/all", limit=5, offset=0)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/v1/events/featured/all?offset=0&limit=5", **AUTH)
+
+        self.assertEqual(len(queries), 0)
+
+    def test_save_invalidates_tagged_routes(self):
+        self.assertEqual(self.get("/events/featured/all").json()["count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(
+                name="Summit", event_type="webinar", event_date=date.today(), venue_name="Hall", city="Abuja",
+                is_featured=True,
+            )
+
+        self.assertEqual(self.get("/events/featured/all").json()["count"], 2)
+
+    def test_cached_response_answers_conditional_requests(self):
+        Content.objects.create(title="Launch", slug="launch", platform="website", body="Hello")
+        etag = self.get("/content/slug/launch")["ETag"]
+
+        response = self.get("/content/slug/launch", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_tests_never_clear_a_real_shared_cache(self):
+        self.assertIsInstance(caches["shared"], LocMemCache)
+
+    def test_shared_hit_fills_local_tier(self):
+        cache.set("misc:key", "value")
+        caches["local"].delete("misc:key")
+
+        self.assertEqual(cache.get("misc:key"), "value")
+        self.assertEqual(caches["local"].get("misc:key"), "value")
+        self.assertEqual(cache.get("misc:key"), "value")
+        self.assertGreaterEqual(cache.stats["local_hits"], 1)
+
+    def test_namespace_can_skip_local_tier(self):
+        cache.set("api-tag:events", 7)
+        self.assertIsNone(caches["local"].get("api-tag:events"))
+
+        cache.incr("api-tag:events")
+        self.assertEqual(cache.get("api-tag:events"), 8)
+
+    def test_refresh_early_grows_towards_expiry(self):
+        with mock.patch("api.utils.tiered_cache.random.random", return_value=0.0):
+            self.assertFalse(refresh_early(delta=2.0, expires_at=110.0, now=100.0))
+        with mock.patch("api.utils.tiered_cache.random.random", return_value=1 - 1e-5):
+            self.assertTrue(refresh_early(delta=2.0, expires_at=110.0, now=100.0))
+        self.assertFalse(refresh_early(delta=2.0, expires_at=None))
+
+
+class CatalogTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category = ServiceCategory.objects.create(name="Construction")
+            self.services = [
+                Service.objects.create(
+                    name=name, category=self.category, description="Service",
+                    base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+                )
+                for name in ("Survey", "Design")
+            ]
+
+    def test_snapshot_is_served_from_memory(self):
+        first = self.get("/services/catalog")
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get("/services/catalog")
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(second.content, first.content)
+        body = first.json()
+        self.assertTrue(body["full"])
+        self.assertEqual([service["name"] for service in body["services"]], ["Survey", "Design"])
+        self.assertEqual(body["categories"][0]["name"], "Construction")
+        self.assertFalse(first["ETag"].startswith("W/"))
+        self.assertEqual(self.get("/services/catalog", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+    def test_delta_since_version(self):
+        version = self.get("/services/catalog").json()["version"]
+        survey, design = self.services
+        design_id = design.id
+
+        with self.captureOnCommitCallbacks(execute=True):
+            survey.name = "Site survey"
+            survey.save()
+            design.delete()
+
+        body = self.get("/services/catalog", since_version=version).json()
+
+        self.assertFalse(body["full"])
+        self.assertEqual(body["since_version"], version)
+        self.assertGreater(body["version"], version)
+        self.assertEqual([service["name"] for service in body["services"]], ["Site survey"])
+        self.assertEqual(body["categories"], [])
+        self.assertEqual(body["deleted_services"], [design_id])
+
+    def test_unknown_version_falls_back_to_full_catalog(self):
+        body = self.get("/services/catalog", since_version=1).json()
+
+        self.assertTrue(body["full"])
+        self.assertEqual(len(body["services"]), 2)
+
+
+@override_settings(API_SYNC_SETTLE_SECONDS=0)
+class SyncTests(AuthenticatedTestCase):
+    def create_expense(self, description):
+        return Expense.objects.create(user_id="U1", date=date(2025, 3, 1), description=description, amount=Decimal("10"))
+
+    def sync(self, resource="expenses", **params):
+        response = self.get(f"/sync/{resource}", **params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_pages_in_updated_at_order_and_resumes(self):
+        expenses = [self.create_expense(f"Taxi {n}") for n in range(3)]
+
+        first = self.sync(limit=2)
+        second = self.sync(cursor=first["cursor"], limit=2)
+
+        self.assertTrue(first["has_more"])
+        self.assertFalse(second["has_more"])
+        self.assertEqual(
+            [item["id"] for item in first["items"] + second["items"]], [expense.id for expense in expenses],
+        )
+
+        expenses[0].description = "Hotel"
+        expenses[0].save()
+        later = self.sync(cursor=second["cursor"])
+        self.assertEqual([item["description"] for item in later["items"]], ["Hotel"])
+        self.assertEqual(self.sync(cursor=later["cursor"])["items"], [])
+
+    def test_deletions_come_through_the_tombstone_feed(self):
+        Tombstone.objects.create(resource="expenses", object_id=999)  # deleted before the client's first sync
+        expense = self.create_expense("Taxi")
+        cursor = self.sync()["cursor"]
+
+        expense_id = expense.id
+        expense.delete()
+        page = self.sync(cursor=cursor)
+
+        self.assertEqual(page["items"], [])
+        self.assertEqual(page["deleted"], [expense_id])
+
+    @override_settings(API_SYNC_SETTLE_SECONDS=30)
+    def test_late_commits_are_not_skipped(self):
+        now = timezone.now()
+        early = self.create_expense("Early")
+        Expense.objects.filter(pk=early.pk).update(updated_at=now - timedelta(seconds=60))
+        cursor = self.sync()["cursor"]
+
+        # written 10 s ago by a transaction that only commits now, and deleted
+        # rows whose tombstone IDs are out of order with their commits
+        late = self.create_expense("Late")
+        Expense.objects.filter(pk=late.pk).update(updated_at=now - timedelta(seconds=10))
+        pending = Tombstone.objects.create(resource="expenses", object_id=1001, deleted_at=now - timedelta(seconds=10))
+        Tombstone.objects.create(resource="expenses", object_id=1002, deleted_at=now - timedelta(seconds=60))
+
+        page = self.sync(cursor=cursor)
+        self.assertEqual((page["items"], page["deleted"]), ([], []))
+
+        with mock.patch("api.utils.sync.timezone.now", return_value=now + timedelta(seconds=30)):
+            page = self.sync(cursor=page["cursor"])
+        self.assertEqual([item["id"] for item in page["items"]], [late.id])
+        self.assertEqual(page["deleted"], [pending.object_id, 1002])
+
+    def test_relations_are_ids(self):
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        invoice = create_invoice(service)
+
+        item = self.sync("invoices")["items"][0]
+
+        self.assertEqual(item["id"], invoice.id)
+        self.assertEqual(item["service"], service.id)
+
+    def test_rejects_bad_cursors(self):
+        self.assertEqual(self.get("/sync/expenses", cursor="not-a-cursor").status_code, 400)
+        with override_settings(API_SYNC_TOMBSTONE_DAYS=0):
+            cursor = self.sync()["cursor"]
+            self.assertIn("expired", self.get("/sync/expenses", cursor=cursor).json()["detail"])
+        self.assertEqual(self.get("/sync/unknown").status_code, 422)
+
+
+class AsyncRouteTests(AuthenticatedTestCase):
+    def test_async_routes_authenticate_with_the_async_client(self):
+        with mock.patch.object(AsyncAuthClient, "verify_token", return_value=(False, None)):
+            self.assertEqual(self.get("/stats").status_code, 401)
+            self.assertEqual(self.get("/properties/stats").status_code, 401)
+            self.assertEqual(self.get("/budgets").status_code, 200)
+
+    async def test_middleware_runs_on_the_event_loop(self):
+        headers = {"Authorization": AUTH["HTTP_AUTHORIZATION"]}
+        response = await self.async_client.get("/api/v1/properties/stats", headers=headers)
+        self.assertEqual(response.json()["total_properties"], 0)
+
+        # validation errors are still reshaped by ResponseFormaterMiddleware
+        response = await self.async_client.get("/api/v1/budgets/summary", headers=headers)
+        self.assertEqual(response.status_code, 422)
+        self.assertIsInstance(response.json()["detail"], str)
+
+
+class BatchGetTests(AuthenticatedTestCase):
+    def batch_get(self, resource, ids, **params):
+        query = "&".join(f"{name}={value}" for name, value in params.items())
+        return self.client.post(
+            f"/api/v1/{resource}/batch-get?{query}", {"ids": ids}, content_type="application/json", **AUTH,
+        )
+
+    def test_every_resource_router_has_batch_get(self):
+        detail_routers = {
+            prefix for prefix, router in api._routers
+            if any("{" in path and path.count("/") == 1 for path in router.path_operations)
+        }
+        batch_routers = {
+            prefix for prefix, router in api._routers if "/batch-get" in router.path_operations
+        }
+        self.assertEqual(detail_routers - batch_routers - {"/sync"}, set())
+
+    def test_returns_requested_order_and_missing_ids(self):
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        invoices = [create_invoice(service) for _ in range(3)]
+        ids = [invoices[2].id, 999, invoices[0].id, invoices[2].id]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.batch_get("invoices", ids)
+
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual([item["id"] for item in body["items"]], [invoices[2].id, invoices[0].id])
+        self.assertEqual(body["missing"], [999])
+        self.assertEqual(body["items"][0]["order"], invoices[2].order_id)
+        self.assertEqual(len(queries), 2)  # the invoices, then their line items
+
+        expanded = self.batch_get("invoices", [invoices[1].id], expand="order", fields="id,order.order_number").json()
+        self.assertEqual(expanded["items"], [{"id": invoices[1].id, "order": {"order_number": invoices[1].order.order_number}}])
+
+    def test_rejects_oversized_batches(self):
+        response = self.batch_get("expenses", list(range(1, 502)))
+
+        self.assertEqual(response.status_code, 400)
+
+
+class BatchTests(AuthenticatedTestCase):
+    def batch(self, requests, **flags):
+        return self.client.post(
+            "/api/v1/batch", {"requests": requests, **flags}, content_type="application/json", **AUTH,
+        )
+
+    def expense(self, description, amount="10.00"):
+        return {"user_id": "1", "date": "2024-01-01", "description": description, "amount": amount}
+
+    def test_runs_calls_in_order_with_one_auth_check(self):
+        response = self.batch([
+            {"id": "create", "method": "POST", "path": "/expenses", "body": self.expense("Fuel")},
+            {"id": "list", "path": "/expenses?fields=description"},
+            {"id": "stats", "path": "/properties/stats"},
+            {"id": "invalid", "method": "POST", "path": "/expenses", "body": {"description": "No amount"}},
+            {"id": "missing", "path": "/expenses/999"},
+            {"id": "unknown", "path": "/nothing-here"},
+        ])
+
+        self.assertEqual(response.status_code, 200, response.content)
+        responses = {item["id"]: item for item in response.json()["responses"]}
+        self.assertEqual(list(responses), ["create", "list", "stats", "invalid", "missing", "unknown"])
+        self.assertEqual(responses["create"]["status"], 201)
+        self.assertEqual(responses["list"]["body"]["items"], [{"description": "Fuel"}])
+        self.assertEqual(responses["stats"]["body"]["total_properties"], 0)
+        self.assertEqual(responses["invalid"]["status"], 422)
+        self.assertIsInstance(responses["invalid"]["body"]["detail"], str)
+        self.assertEqual(responses["missing"]["status"], 404)
+        self.assertEqual(responses["unknown"]["status"], 404)
+        self.assertEqual(AuthClient.verify_token.call_count, 1)
+        self.assertEqual(AsyncAuthClient.verify_token.call_count, 0)
+
+    def test_forwards_decimal_numbers_in_bodies(self):
+        body = {"user_id": "1", "date": "2024-01-01", "description": "Fuel", "amount": 12.50}
+        response = self.batch([{"method": "POST", "path": "/expenses", "body": body}])
+
+        self.assertEqual(response.status_code, 200, response.content)
+        [result] = response.json()["responses"]
+        self.assertEqual(result["status"], 201, result)
+        self.assertEqual(Expense.objects.get().amount, Decimal("12.50"))
+
+    def test_atomic_batch_rolls_back_on_the_first_error(self):
+        response = self.batch([
+            {"method": "POST", "path": "/expenses", "body": self.expense("Fuel")},
+            {"method": "POST", "path": "/expenses", "body": self.expense("Bad", amount="oops")},
+            {"method": "POST", "path": "/expenses", "body": self.expense("Tolls")},
+        ], atomic=True)
+
+        body = response.json()
+        self.assertTrue(body["rolled_back"])
+        self.assertEqual([item["status"] for item in body["responses"]], [201, 422, 424])
+        self.assertFalse(Expense.objects.exists())
+
+        response = self.batch([{"method": "POST", "path": "/expenses", "body": self.expense("Fuel")}], atomic=True)
+        self.assertFalse(response.json()["rolled_back"])
+        self.assertEqual(Expense.objects.count(), 1)
+
+    def test_rejects_streams_nested_batches_and_oversized_batches(self):
+        responses = self.batch([
+            {"path": "/stats/stream"},
+            {"method": "POST", "path": "/batch", "body": {"requests": []}},
+        ]).json()["responses"]
+        self.assertEqual([item["status"] for item in responses], [400, 400])
+
+        self.assertEqual(self.batch([{"path": "/stats"}] * 21).status_code, 400)
+
+    def test_rejects_unauthenticated_batches(self):
+        with mock.patch.object(AuthClient, "verify_token", return_value=(False, None)):
+            self.assertEqual(self.batch([{"path": "/expenses"}]).status_code, 401)
+
+
+class ParallelBatchTests(TransactionTestCase):
+    """Parallel reads use their own connections, so the data must be committed."""
+
+    def setUp(self):
+        patcher = mock.patch.object(AuthClient, "verify_token", return_value=(True, 1))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+
+    def test_reads_between_writes_run_concurrently_in_order(self):
+        expense = {"user_id": "1", "date": "2024-01-01", "amount": "10.00"}
+        threads = set()
+        dispatch = batch_module._dispatch
+
+        def record_thread(*args):
+            threads.add(threading.get_ident())
+            return dispatch(*args)
+
+        requests = [
+            {"method": "POST", "path": "/expenses", "body": {**expense, "description": "Fuel"}},
+            *({"id": str(i), "path": "/expenses?fields=description"} for i in range(6)),
+            {"method": "POST", "path": "/expenses", "body": {**expense, "description": "Tolls"}},
+            {"id": "after", "path": "/expenses?fields=description"},
+        ]
+        with mock.patch.object(batch_module, "_dispatch", record_thread):
+            response = self.client.post(
+                "/api/v1/batch", {"requests": requests, "parallel": True}, content_type="application/json", **AUTH,
+            )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        responses = response.json()["responses"]
+        self.assertEqual([item["id"] for item in responses[1:7]], [str(i) for i in range(6)])
+        self.assertTrue(all(item["body"]["items"] == [{"description": "Fuel"}] for item in responses[1:7]))
+        self.assertEqual(responses[-1]["body"]["count"], 2)
+        self.assertGreater(len(threads), 1)
+        self.assertEqual(AuthClient.verify_token.call_count, 1)
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        for name, value in (("replicas", ["replica_1"]), ("replica_lag", 0.0)):
+            patcher = mock.patch.object(replica_module, name, **{"return_value": value})
+            self.addCleanup(patcher.stop)
+            setattr(self, name, patcher.start())
+        replica_module._health.clear()
+        self.addCleanup(replica_module._health.clear)
+        self.router = replica_module.ReplicaRouter()
+        cache.clear()
+
+    def test_reads_use_a_replica_only_when_allowed(self):
+        self.assertEqual(self.router.db_for_read(Expense), "default")
+        with replica_module.replica_reads():
+            self.assertEqual(self.router.db_for_read(Expense), "replica_1")
+            self.assertEqual(self.router.db_for_write(Expense), "default")
+            with mock.patch.object(connections["default"], "in_atomic_block", True):
+                self.assertEqual(self.router.db_for_read(Expense), "default")
+        self.assertEqual(self.replica_lag.call_count, 1)  # the probe result is reused
+
+    def test_lagging_or_unreachable_replicas_fall_back_to_the_primary(self):
+        self.replica_lag.return_value = 60.0
+        with replica_module.replica_reads():
+            self.assertEqual(self.router.db_for_read(Expense), "default")
+
+        replica_module._health.clear()
+        self.replica_lag.side_effect = OperationalError
+        with replica_module.replica_reads():
+            self.assertEqual(self.router.db_for_read(Expense), "default")
+
+    def test_clients_read_their_writes_from_the_primary(self):
+        def view(request):
+            return HttpResponse(self.router.db_for_read(Expense), status=201 if request.method == "POST" else 200)
+
+        middleware = replica_module.ReplicaMiddleware(view)
+        factory = RequestFactory()
+        other = {"HTTP_AUTHORIZATION": "Bearer other-token"}
+
+        self.assertEqual(middleware(factory.get("/api/v1/expenses", **AUTH)).content, b"replica_1")
+        self.assertEqual(middleware(factory.post("/api/v1/expenses", **AUTH)).content, b"default")
+        self.assertEqual(middleware(factory.get("/api/v1/expenses", **AUTH)).content, b"default")
+        self.assertEqual(middleware(factory.get("/api/v1/expenses", **other)).content, b"replica_1")
+
+    @override_settings(API_REPLICA_PIN_SECONDS=1, API_REPLICA_MAX_LAG_SECONDS=10)
+    def test_pin_outlasts_the_allowed_lag(self):
+        self.assertEqual(replica_module.pin_seconds(), 10 + replica_module.LAG_CHECK_SECONDS)
+        with override_settings(API_REPLICA_PIN_SECONDS=60):
+            self.assertEqual(replica_module.pin_seconds(), 60)
+
+
+class DatabaseStatsTests(AuthenticatedTestCase):
+    def test_reports_connection_reuse_per_database(self):
+        opened = db_connections.created["default"]
+        connection_created.send(sender=type(connection), connection=connection)
+
+        response = self.get("/stats/database")
+
+        self.assertEqual(response.status_code, 200)
+        [stats] = response.json()
+        self.assertEqual(stats["alias"], "default")
+        self.assertEqual(stats["vendor"], connection.vendor)
+        self.assertEqual(stats["opened"], opened + 1)
+        self.assertIsNone(stats["checkouts"])
+        self.assertIsNone(stats["pool"])
+
+    def test_pooled_databases_report_the_pools_connections(self):
+        checkouts = db_connections.created["default"]
+        for _ in range(3):
+            connection_created.send(sender=type(connection), connection=connection)
+
+        pool = {"pool_size": 2, "pool_available": 1, "connections_num": 2}
+        with mock.patch.object(db_connections, "is_pooled", return_value=True), \
+                mock.patch.object(db_connections, "pool_stats", return_value=pool):
+            [stats] = self.get("/stats/database").json()
+            self.assertEqual(db_connections.opened("default"), 2)
+
+        self.assertEqual(stats["opened"], 2)
+        self.assertEqual(stats["checkouts"], checkouts + 3)
+        self.assertEqual(stats["pool"], pool)
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    def test_new_connections_apply_the_performance_pragmas(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = {**connections["default"].settings_dict, "NAME": str(Path(directory) / "db.sqlite3")}
+            tuned = type(connections["default"])(settings_dict, alias="tuned")
+            try:
+                with tuned.cursor() as cursor:
+                    pragmas = {}
+                    for pragma in ("journal_mode", "synchronous", "busy_timeout", "mmap_size"):
+                        cursor.execute(f"PRAGMA {pragma}")
+                        pragmas[pragma] = cursor.fetchone()[0]
+            finally:
+                tuned.close()
+
+        self.assertEqual(pragmas["journal_mode"], "wal")
+        self.assertEqual(pragmas["synchronous"], 1)  # NORMAL
+        self.assertEqual(pragmas["busy_timeout"], 20000)
+        self.assertGreater(pragmas["mmap_size"], 0)
+        self.assertEqual(tuned.transaction_mode, "IMMEDIATE")
+
+
+class PartitionTests(AuthenticatedTestCase):
+    def test_month_arithmetic_and_partition_ddl(self):
+        spec = partitions.PARTITIONED_TABLES["payments"]
+        self.assertEqual(
+            partitions.months_between(date(2025, 11, 20), date(2026, 2, 1)),
+            [date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)],
+        )
+        self.assertEqual(spec.partition_name(date(2025, 12, 1)), "api_payment_p2025_12")
+        self.assertEqual(
+            partitions.create_partition_sql(spec, date(2025, 12, 1)),
+            'CREATE TABLE IF NOT EXISTS "api_payment_p2025_12" PARTITION OF "api_payment"'
+            " FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')",
+        )
+
+    def test_commands_need_postgresql(self):
+        if connection.vendor == "postgresql":
+            self.skipTest("SQLite and other databases only")
+        out = StringIO()
+        call_command("partitions", "list", stdout=out)
+        self.assertIn("api_expense: not partitioned", out.getvalue())
+        with self.assertRaisesMessage(CommandError, "needs PostgreSQL"):
+            call_command("partitions", "convert", "payments", stdout=out)
+
+    def test_list_routes_filter_on_the_partition_key(self):
+        for day in (date(2025, 1, 31), date(2025, 2, 1), date(2025, 3, 15)):
+            Expense.objects.create(user_id="1", date=day, description=str(day), amount=Decimal("1.00"))
+
+        response = self.get("/expenses", date_from="2025-02-01", date_to="2025-03-31", fields="description")
+
+        self.assertEqual(response.json()["items"], [{"description": "2025-03-15"}, {"description": "2025-02-01"}])
+
+
+class PostgresPartitionTests(TransactionTestCase):
+    """
+    Converts the real tables, so it runs on PostgreSQL only; they stay
+    partitioned for the rest of the run, which every other test supports.
+    """
+
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("PostgreSQL only")
+        patcher = mock.patch.object(AuthClient, "verify_token", return_value=(True, 1))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.this_month = partitions.month_start(timezone.localdate())
+        self.last_month = partitions.add_months(self.this_month, -1)
+
+    def convert(self, *resources):
+        for resource in resources:
+            if not partitions.is_partitioned(partitions.PARTITIONED_TABLES[resource]):
+                call_command("partitions", "convert", resource, stdout=StringIO())
+
+    def months(self, resource):
+        return set(partitions.partitions(partitions.PARTITIONED_TABLES[resource]))
+
+    def test_convert_keeps_rows_sequence_and_indexes(self):
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        invoice = create_invoice(service)
+        before = [
+            Payment.objects.create(
+                invoice=invoice, amount=Decimal("10.00"), payment_method="cash", payment_date=day, created_by="1",
+            )
+            for day in (self.last_month, self.this_month)
+        ]
+
+        self.convert("payments")
+
+        self.assertTrue(partitions.is_partitioned(partitions.PARTITIONED_TABLES["payments"]))
+        self.assertLessEqual({self.last_month, self.this_month}, self.months("payments"))
+        self.assertEqual(
+            sorted(Payment.objects.values_list("id", "payment_reference", "amount")),
+            sorted((payment.id, payment.payment_reference, payment.amount) for payment in before),
+        )
+        after = Payment.objects.create(
+            invoice=invoice, amount=Decimal("5.00"), payment_method="cash", payment_date=self.this_month, created_by="1",
+        )
+        self.assertGreater(after.id, max(payment.id for payment in before))
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexdef FROM pg_indexes WHERE tablename = 'api_payment'")
+            indexes = [indexdef for indexdef, in cursor.fetchall()]
+        self.assertTrue(any("payment_reference varchar_pattern_ops" in indexdef for indexdef in indexes))
+
+    def test_saves_and_imports_create_missing_months(self):
+        self.convert("expenses")
+        saved, imported = date(2019, 5, 10), date(2018, 1, 20)
+
+        Expense.objects.create(user_id="U1", date=saved, description="Back-dated", amount=Decimal("1.00"))
+        response = self.client.post(
+            "/api/v1/expenses/bulk",
+            {"rows": [{"user_id": "U1", "date": imported.isoformat(), "description": "Imported", "amount": "2.00"}]},
+            content_type="application/json", **AUTH,
+        )
+
+        self.assertEqual(response.json()["created"], 1)
+        self.assertLessEqual({date(2019, 5, 1), date(2018, 1, 1)}, self.months("expenses"))
+        self.assertEqual(Expense.objects.filter(date__in=(saved, imported)).count(), 2)
+
+    def test_detach_leaves_old_months_as_tables(self):
+        self.convert("expenses")
+        spec = partitions.PARTITIONED_TABLES["expenses"]
+        old_month = date(2017, 3, 1)
+        Expense.objects.create(user_id="U1", date=old_month, description="Archived", amount=Decimal("1.00"))
+        Expense.objects.create(user_id="U1", date=self.this_month, description="Current", amount=Decimal("1.00"))
+        archived = spec.partition_name(old_month)
+
+        detached = partitions.detach(spec, before=self.this_month)
+        for name in detached:
+            self.addCleanup(self.drop, name)
+
+        self.assertIn(archived, detached)
+        self.assertTrue(all(month >= self.this_month for month in self.months("expenses")))
+        self.assertEqual(list(Expense.objects.values_list("description", flat=True)), ["Current"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT description FROM {connection.ops.quote_name(archived)}")
+            self.assertEqual(cursor.fetchall(), [("Archived",)])
+
+    def test_payment_references_are_unique_across_months(self):
+        self.convert("payments")
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        invoice = create_invoice(service)
+        payment = dict(invoice=invoice, amount=Decimal("1.00"), payment_method="cash", created_by="1")
+        Payment(payment_reference="PAY-1", payment_date=self.last_month, **payment).save(skip_validation=True)
+
+        with self.assertRaises(IntegrityError):
+            Payment(payment_reference="PAY-1", payment_date=self.this_month, **payment).save(skip_validation=True)
+        Payment.objects.filter(payment_reference="PAY-1").delete()
+        Payment(payment_reference="PAY-1", payment_date=self.this_month, **payment).save(skip_validation=True)
+
+    def test_saves_recreate_a_month_dropped_by_another_process(self):
+        self.convert("expenses")
+        spec = partitions.PARTITIONED_TABLES["expenses"]
+        day = date(2016, 7, 4)
+        Expense.objects.create(user_id="U1", date=day, description="First", amount=Decimal("1.00"))
+        # another process archives the month; this one still believes it exists
+        self.drop(spec.partition_name(day))
+
+        Expense.objects.create(user_id="U1", date=day, description="Second", amount=Decimal("1.00"))
+
+        self.assertIn(partitions.month_start(day), self.months("expenses"))
+        self.assertEqual(list(Expense.objects.filter(date=day).values_list("description", flat=True)), ["Second"])
+
+    def drop(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {connection.ops.quote_name(table)}")
+
+
+class PartitionCacheTests(TestCase):
+    def setUp(self):
+        self.key = ("default", Expense._meta.db_table)
+        partitions._known[self.key] = {date(2020, 1, 1)}
+        self.addCleanup(partitions._known.pop, self.key, None)
+
+    def test_a_write_into_a_missing_partition_forgets_the_months_and_runs_again(self):
+        calls = []
+
+        def write():
+            calls.append(self.key in partitions._known)
+            if len(calls) == 1:
+                raise IntegrityError('no partition of relation "api_expense" found for row')
+            return "written"
+
+        self.assertEqual(partitions.write_with_partitions(Expense, write), "written")
+        self.assertEqual(calls, [True, False])
+
+    def test_other_errors_are_raised(self):
+        write = mock.Mock(side_effect=IntegrityError("duplicate key value"))
+
+        with self.assertRaises(IntegrityError):
+            partitions.write_with_partitions(Expense, write)
+        self.assertEqual(write.call_count, 1)
+        self.assertIn(self.key, partitions._known)
+
+class ClientOverviewTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        category = ServiceCategory.objects.create(name="Construction")
+        self.service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+
+    def seed(self):
+        invoice = create_invoice(self.service)
+        plot = Property.objects.create(
+            name="Plot", property_type="land", category="sale", location="Lagos",
+            price=Decimal("1.00"), size=Decimal("1.00"), client_id="C1",
+        )
+        Document.objects.create(user_id="U1", order=invoice.order, title="Contract", file_url="https://example.com/c.pdf")
+        Document.objects.create(user_id="U1", property=plot, title="Deed", file_url="https://example.com/d.pdf")
+        return invoice
+
+    def test_recent_records_and_totals(self):
+        invoices = [self.seed() for _ in range(3)]
+        Invoice.objects.filter(id=invoices[0].id).update(total_amount=Decimal("107.50"), status="sent")
+        Invoice.objects.filter(id=invoices[1].id).update(
+            total_amount=Decimal("50.00"), amount_paid=Decimal("20.00"), status="overdue",
+        )
+        ServiceOrder.objects.filter(id=invoices[2].order_id).update(order_status="completed")
+        Property.objects.create(
+            name="Elsewhere", property_type="land", category="sale", location="Abuja",
+            price=Decimal("1.00"), size=Decimal("1.00"), client_id="C2",
+        )
+
+        response = self.get("/clients/C1/overview", recent=2)
+
+        self.assertEqual(response.status_code, 200)
+        overview = response.json()
+        self.assertEqual(overview["totals"], {
+            "leads": 3, "quotes": 3, "orders": 3, "open_orders": 2, "invoices": 3, "overdue_invoices": 1,
+            "invoiced": "157.50", "paid": "20.00", "outstanding_balance": "137.50",
+            "properties": 3, "documents": 6,
+        })
+        self.assertEqual([item["id"] for item in overview["invoices"]], [invoices[2].id, invoices[1].id])
+        self.assertEqual(overview["invoices"][0]["order"], invoices[2].order_id)
+        self.assertEqual(len(overview["documents"]), 2)
+
+    def test_unknown_client_is_empty(self):
+        overview = self.get("/clients/nobody/overview").json()
+
+        self.assertEqual(overview["leads"], [])
+        self.assertEqual(overview["totals"]["invoices"], 0)
+        self.assertEqual(overview["totals"]["outstanding_balance"], "0.00")
+
+    def test_one_query_per_section(self):
+        self.seed()
+        with CaptureQueriesContext(connection) as queries:
+            self.get("/clients/C1/overview")
+        # six sections, plus the line-item prefetch for the invoices
+        self.assertEqual(len(queries), 7, "\n".join(query["sql"] for query in queries))
+
+
+class ConcurrentClientOverviewTests(TransactionTestCase):
+    """Outside a transaction the sections use their own threads and connections."""
+
+    def setUp(self):
+        patcher = mock.patch.object(AsyncAuthClient, "verify_token", return_value=(True, 1))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+
+    def test_sections_run_in_worker_threads(self):
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        create_invoice(service)
+        threads = set()
+        section = overview_module._section
+
+        def record_thread(*args):
+            threads.add(threading.get_ident())
+            return section(*args)
+
+        with mock.patch.object(overview_module, "_section", record_thread):
+            response = self.client.get("/api/v1/clients/C1/overview", **AUTH)
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["totals"]["invoices"], 1)
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertGreater(len(threads), 1)
+
+class AsyncAuthClientTests(SimpleTestCase):
+    def test_falls_back_to_the_blocking_client_in_a_worker_thread(self):
+        threads = []
+
+        def verify_token(client, token):
+            threads.append(threading.current_thread())
+            return True, 7
+
+        with mock.patch("api.utils.auth_client.httpx", None), \
+                mock.patch.object(AuthClient, "verify_token", verify_token):
+            result = asyncio.run(AsyncAuthClient(base_url="http://auth.test").verify_token("token"))
+
+        self.assertEqual(result, (True, 7))
+        self.assertNotEqual(threads, [threading.main_thread()])
+
+    def test_keeps_one_httpx_client_per_event_loop(self):
+        if auth_client_module.httpx is None:
+            self.skipTest("httpx is not installed")
+        httpx = auth_client_module.httpx
+        tokens = []
+
+        def handler(request):
+            tokens.append(request.headers["Authorization"])
+            if request.url.path != "/api/v1/auth/verify-token":
+                return httpx.Response(404)
+            return httpx.Response(200 if tokens[-1] == "Bearer good" else 401, json={"user_id": 7})
+
+        client = AsyncAuthClient(base_url="http://auth.test")
+
+        async def verify(*tokens):
+            results = [await client.verify_token(token) for token in tokens]
+            return results, await client._client()
+
+        transport = httpx.MockTransport(handler)
+        with mock.patch.object(httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=transport)):
+            first, first_client = asyncio.run(verify("good", "bad"))
+            # a new loop, as for an async view served over WSGI
+            second, second_client = async_to_sync(verify)("good")
+
+        self.assertEqual(first, [(True, 7), (False, None)])
+        self.assertEqual(second, [(True, 7)])
+        self.assertEqual(tokens, ["Bearer good", "Bearer bad", "Bearer good"])
+        self.assertIsNot(first_client, second_client)
+
+    def test_closes_each_loops_client_when_the_loop_ends(self):
+        if auth_client_module.httpx is None:
+            self.skipTest("httpx is not installed")
+        httpx = auth_client_module.httpx
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"user_id": 7}))
+        client = AsyncAuthClient(base_url="http://auth.test")
+        opened, async_client = [], httpx.AsyncClient
+
+        def open_client(**kwargs):
+            opened.append(async_client(transport=transport, **kwargs))
+            return opened[-1]
+
+        with mock.patch.object(httpx, "AsyncClient", open_client):
+            for _ in range(20):
+                self.assertEqual(asyncio.run(client.verify_token("token")), (True, 7))
+
+        self.assertEqual(len(opened), 20)
+        self.assertEqual(client._clients, {})
+        self.assertTrue(all(http_client.is_closed for http_client in opened))
+
+
+class BroadcasterTests(SimpleTestCase):
+    SUBSCRIBERS = 1000
+
+    def setUp(self):
+        self.source = {"stats": {"orders.total": 1, "orders.status.pending": 1}, "budgets:P1": {"total_budget": "5.00"}}
+        self.computed = []
+
+    def compute(self, topics):
+        self.computed.append(set(topics))
+        return {topic: dict(self.source[topic]) for topic in topics}
+
+    async def settle(self, broadcaster):
+        await asyncio.sleep(0)  # let thread-safe notifications land
+        while broadcaster.dirty or broadcaster._flush_task is not None:
+            await asyncio.sleep(0.005)
+
+    def test_one_compute_fans_out_to_every_subscriber(self):
+        async def scenario():
+            broadcaster = live.Broadcaster(self.compute, debounce=0.01)
+            subscribers = [
+                broadcaster.subscribe(["stats", "budgets:P1"] if n % 2 else ["stats"])
+                for n in range(self.SUBSCRIBERS)
+            ]
+            await self.settle(broadcaster)
+            first = [await subscriber.next(timeout=0) for subscriber in subscribers]
+
+            self.source["stats"] = {"orders.total": 2, "orders.status.pending": 1}
+            # writes are signalled from worker threads
+            threads = [threading.Thread(target=broadcaster.notify, args=("stats",)) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            await self.settle(broadcaster)
+            second = [await subscriber.next(timeout=0) for subscriber in subscribers]
+            for subscriber in subscribers:
+                broadcaster.unsubscribe(subscriber)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        self.assertEqual(self.computed, [{"stats", "budgets:P1"}, {"stats"}])
+        self.assertEqual(first[0], {"stats": {"orders.total": 1, "orders.status.pending": 1}})
+        self.assertEqual(first[1]["budgets:P1"], {"total_budget": "5.00"})
+        self.assertEqual(second, [{"stats": {"orders.total": 2}}] * self.SUBSCRIBERS)
+
+    def test_slow_subscribers_get_merged_deltas(self):
+        async def scenario():
+            broadcaster = live.Broadcaster(self.compute, debounce=0.001)
+            fast, slow = broadcaster.subscribe(["stats"]), broadcaster.subscribe(["stats"])
+            await self.settle(broadcaster)
+            await fast.next(timeout=0)
+            await slow.next(timeout=0)
+
+            received = []
+            for total in range(2, 52):
+                self.source["stats"] = {"orders.total": total, "orders.status.pending": total % 2}
+                broadcaster.notify("stats")
+                await self.settle(broadcaster)
+                received.append(await fast.next(timeout=0))
+                self.assertLessEqual(len(slow.pending), 1)
+            return received, await slow.next(timeout=0), slow.coalesced
+
+        received, merged, coalesced = asyncio.run(scenario())
+
+        self.assertEqual(len(received), 50)
+        self.assertEqual(received[-1], {"stats": {"orders.total": 51, "orders.status.pending": 1}})
+        self.assertEqual(merged, {"stats": {"orders.total": 51, "orders.status.pending": 1}})
+        self.assertEqual(coalesced, 49)
+
+
+class LiveStreamTests(AuthenticatedTestCase):
+    def create_budget(self):
+        category = ServiceCategory.objects.create(name="Construction")
+        service = Service.objects.create(
+            name="Survey", category=category, description="Site survey",
+            base_price=Decimal("100.00"), delivery_time="1 week", created_by="1",
+        )
+        Budget.objects.create(
+            invoice_id=create_invoice(service), project_id="P1", budget_date=date.today(), amount=Decimal("7.50"),
+        )
+
+    def create_property(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Property.objects.create(
+                name="Plot", property_type="land", category="sale", location="Lagos",
+                price=Decimal("1.00"), size=Decimal("1.00"), client_id="C1",
+            )
+
+    async def test_streams_full_state_then_deltas(self):
+        await sync_to_async(self.create_budget)()
+        response = await self.async_client.get(
+            "/api/v1/stats/stream", {"projects": "P1"}, headers={"Authorization": AUTH["HTTP_AUTHORIZATION"]},
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(events), b"retry: 5000\n\n")
+            initial = {}
+            for _ in range(3):
+                name, data = (await anext(events)).decode().strip().split("\n")
+                initial[name.removeprefix("event: ")] = json.loads(data.removeprefix("data: "))
+            self.assertEqual(initial["properties"]["total_properties"], 0)
+            self.assertEqual(initial["budgets:P1"]["total_budget"], "7.50")
+            self.assertEqual(initial["budgets:P1"]["status_breakdown.draft"], 1)
+            self.assertIn("orders.total", initial["stats"])
+
+            await sync_to_async(self.create_property)()
+            update = (await anext(events)).decode()
+            self.assertTrue(update.startswith("event: properties\n"))
+            self.assertEqual(
+                json.loads(update.split("data: ", 1)[1]),
+                {"total_properties": 1, "available": 1, "for_sale": 1},
+            )
+        finally:
+            await events.aclose()
@@ -9,7 +9,7 @@ from typing import Optional
 from ninja.security import HttpBearer
 from django.http import HttpRequest
 
-from .auth_client import get_auth_client
+from .auth_client import get_async_auth_client, get_auth_client
 
 
 class AuthBearer(HttpBearer):
@@ -19,6 +19,11 @@ class AuthBearer(HttpBearer):
     """
 
     def authenticate(self, request: HttpRequest, token: str) -> Optional[int]:
+        if getattr(request, 'batch_auth', None):
+            # a sub-request of POST /batch, whose token was already verified
+            request.user_id = request.batch_auth
+            return request.batch_auth
+
         client = get_auth_client()
         is_valid, user_id = client.verify_token(token)
 
@@ -28,6 +33,26 @@ class AuthBearer(HttpBearer):
         return None
 
 
+class AsyncAuthBearer(HttpBearer):
+    """
+    :class:`AuthBearer` for async routes: the token check awaits the auth
+    service instead of holding a thread.
+    """
+
+    async def authenticate(self, request: HttpRequest, token: str) -> Optional[int]:
+        if getattr(request, 'batch_auth', None):
+            request.user_id = request.batch_auth
+            return request.batch_auth
+
+        client = get_async_auth_client()
+        is_valid, user_id = await client.verify_token(token)
+
+        if is_valid and user_id:
+            request.user_id = user_id
+            return user_id
+        return None
+
+
 class AuthBearerWithUser(HttpBearer):
     """Authentication class that also fetches full user data."""
 
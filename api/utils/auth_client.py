@@ -15,12 +15,23 @@ Usage:
 
     # In an endpoint
     is_valid, user_id, error = verify_request_token(request)
+
+    # In an async endpoint
+    is_valid, user_id = await get_async_auth_client().verify_token(token)
 """
 
+import asyncio
+
 import requests
 from typing import Tuple, Optional, Dict, Any
+from asgiref.sync import sync_to_async
 from django.conf import settings
 
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx makes the async client non-blocking
+    httpx = None
+
 
 class AuthClientError(Exception):
     """Exception raised when auth client operations fail."""
@@ -148,8 +159,95 @@ class AuthClient:
         return self.get_client_info(client_id, token) is not None
 
 
+class AsyncAuthClient:
+    """
+    Non-blocking counterpart of :class:`AuthClient` for async routes.
+
+    Requests go through a pooled ``httpx.AsyncClient``, so an ASGI worker
+    keeps serving other requests while the auth service answers. Without
+    httpx each call runs the blocking client in a worker thread instead.
+
+    An ``AsyncClient``'s connections belong to the event loop that opened
+    them, so there is one client per running loop: the ASGI server's loop
+    keeps its pool, and async views run from WSGI (one short-lived loop per
+    request, through ``asyncio.run``) get their own client, closed when the
+    loop shuts down.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: int = 10
+    ):
+        self.base_url = base_url or getattr(
+            settings, 'AUTH_SERVICE_URL',
+            'http://localhost:9000'
+        )
+        self.timeout = timeout
+        # loop -> (client, the async generator that closes it)
+        self._clients = {}
+        self._blocking = AuthClient(self.base_url, timeout)
+
+    async def _client(self) -> "httpx.AsyncClient":
+        """The client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            # loops closed without shutting down their async generators cannot close their clients
+            for closed in [other for other in self._clients if other.is_closed()]:
+                del self._clients[closed]
+            client = httpx.AsyncClient(timeout=self.timeout)
+            lifetime = self._lifetime(loop, client)
+            self._clients[loop] = (client, lifetime)
+            await lifetime.__anext__()
+        return self._clients[loop][0]
+
+    async def _lifetime(self, loop, client):
+        """
+        Keep ``client`` until ``loop`` shuts down: the loop finalizes its
+        pending async generators on the way out (``asyncio.run`` and
+        ``async_to_sync`` both do), which closes the client and its sockets.
+        """
+        try:
+            yield
+        finally:
+            self._clients.pop(loop, None)
+            await client.aclose()
+
+    async def aclose(self):
+        """Close the running loop's client; other loops close theirs as they shut down."""
+        entry = self._clients.get(asyncio.get_running_loop())
+        if entry is not None:
+            await entry[1].aclose()
+        self._blocking.close()
+
+    async def verify_token(self, token: str) -> Tuple[bool, Optional[int]]:
+        """
+        Verify a JWT token with the auth service.
+
+        Returns:
+            Tuple of (is_valid, user_id)
+        """
+        if httpx is None:
+            return await sync_to_async(self._blocking.verify_token, thread_sensitive=False)(token)
+        try:
+            client = await self._client()
+            response = await client.get(
+                f"{self.base_url}/api/v1/auth/verify-token",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                return True, data.get('user_id')
+            return False, None
+
+        except httpx.HTTPError:
+            return False, None
+
+
 # Singleton instance
 _default_client: Optional[AuthClient] = None
+_default_async_client: Optional[AsyncAuthClient] = None
 
 
 def get_auth_client() -> AuthClient:
@@ -160,6 +258,14 @@ def get_auth_client() -> AuthClient:
     return _default_client
 
 
+def get_async_auth_client() -> AsyncAuthClient:
+    """Get the default async auth client instance."""
+    global _default_async_client
+    if _default_async_client is None:
+        _default_async_client = AsyncAuthClient()
+    return _default_async_client
+
+
 def verify_request_token(request) -> Tuple[bool, Optional[int], str]:
     """
     Verify the token from a Django/Ninja request.
@@ -0,0 +1,171 @@
+"""
+Several API calls in one round trip.
+
+``POST /batch`` takes the calls a screen would otherwise make one by one and
+runs each through the API's own URL routing and operations, so a sub-request
+gets exactly what the route would return on its own (validation, ``fields=``
+and ``expand=``, errors)::
+
+    {"requests": [
+        {"id": "invoice", "method": "GET", "path": "/invoices/3?fields=id,status"},
+        {"id": "note", "method": "POST", "path": "/expenses", "body": {...}}
+    ]}
+
+    {"responses": [
+        {"id": "invoice", "status": 200, "body": {"id": 3, "status": "sent"}},
+        {"id": "note", "status": 201, "body": {...}}
+    ], "rolled_back": false}
+
+Paths are relative to the API root. The bearer token is verified once, for
+the batch itself; sub-requests reuse that result instead of calling the auth
+service again (see ``AuthBearer``).
+
+Sub-requests run in order. With ``parallel``, each run of consecutive
+``GET`` requests is spread over :data:`MAX_WORKERS` threads, each with its
+own database connection, while writes still act as barriers, so a read
+listed after a write sees it. With ``atomic``, the whole batch runs in one
+transaction and the first response with an error status rolls it back; the
+requests after it are not run and answer ``424``. An atomic batch never runs
+in parallel, since other connections cannot see its uncommitted writes.
+
+Streaming routes (exports, ``/stats/stream``) and nested batches cannot be
+batched.
+"""
+
+import json
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+from api.utils.middleware import ResponseFormaterMiddleware
+
+
+MAX_BATCH_REQUESTS = 20
+# threads serving the reads of one parallel batch
+MAX_WORKERS = 4
+
+READ_METHODS = ('GET',)
+
+# formats sub-responses the way every top-level response is formatted
+_formatter = ResponseFormaterMiddleware(get_response=None)
+
+
+def _sub_request(request, root: str, call) -> HttpRequest:
+    """A request for ``call`` carrying the batch's headers and verified identity."""
+    url = urlsplit(call.path)
+    sub = HttpRequest()
+    sub.method = call.method
+    sub.path = sub.path_info = root + url.path.lstrip('/')
+    sub.META = {key: value for key, value in request.META.items() if key.startswith('HTTP_')}
+    sub.META.update({
+        'REQUEST_METHOD': call.method,
+        'PATH_INFO': sub.path,
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': request.META.get('SERVER_NAME', ''),
+        'SERVER_PORT': request.META.get('SERVER_PORT', ''),
+        'REMOTE_ADDR': request.META.get('REMOTE_ADDR', ''),
+    })
+    sub.GET = QueryDict(url.query)
+    # the batch body was parsed with Decimal amounts; send them on as exact strings, as the renderer does
+    body = b'' if call.body is None else json.dumps(call.body, cls=DjangoJSONEncoder).encode()
+    sub._body = body
+    sub.META['CONTENT_TYPE'] = 'application/json'
+    sub.META['CONTENT_LENGTH'] = str(len(body))
+    sub.content_type = 'application/json'
+    sub.batch_auth = request.auth
+    return sub
+
+
+def _response(call, status: int, body) -> dict:
+    return {'id': call.id, 'status': status, 'body': body}
+
+
+def _error(call, status: int, detail: str) -> dict:
+    return _response(call, status, {'detail': detail})
+
+
+def _dispatch(request, root: str, call) -> dict:
+    """Run one sub-request through the URL resolver and its operation."""
+    try:
+        sub = _sub_request(request, root, call)
+        match = resolve(sub.path)
+        if match.func is getattr(request.resolver_match, 'func', None):
+            return _error(call, 400, "Batches cannot be nested")
+        view = async_to_sync(match.func) if iscoroutinefunction(match.func) else match.func
+        response = view(sub, *match.args, **match.kwargs)
+    except Resolver404:
+        return _error(call, 404, "Not Found")
+    except Exception as e:
+        response = _formatter.format_exception(e)
+        return _response(call, 500, json.loads(response.content))
+
+    if response.streaming:
+        response.close()
+        return _error(call, 400, "Streaming routes cannot be batched")
+    response = _formatter.format(response)
+    if not response.content:
+        return _response(call, response.status_code, None)
+    if response.get('Content-Type', '').startswith('application/json'):
+        return _response(call, response.status_code, json.loads(response.content))
+    return _response(call, response.status_code, response.content.decode(response.charset))
+
+
+def _dispatch_read(request, root: str, call) -> dict:
+    # runs in a worker thread, whose connections are not closed by Django
+    try:
+        return _dispatch(request, root, call)
+    finally:
+        connections.close_all()
+
+
+def _groups(calls, parallel: bool):
+    """Consecutive reads together (when ``parallel``), every other call on its own."""
+    group = []
+    for call in calls:
+        if parallel and call.method in READ_METHODS:
+            group.append(call)
+            continue
+        if group:
+            yield group
+            group = []
+        yield [call]
+    if group:
+        yield group
+
+
+def run_batch(request, root: str, calls: List, parallel: bool = False, atomic: bool = False):
+    """The responses of ``calls`` in order, and whether an atomic batch was rolled back; a 400 for oversized batches."""
+    if len(calls) > MAX_BATCH_REQUESTS:
+        return 400, {'detail': f"At most {MAX_BATCH_REQUESTS} requests per batch"}
+    if atomic:
+        return _run_atomic(request, root, calls)
+
+    responses = []
+    with ThreadPoolExecutor(MAX_WORKERS) if parallel else nullcontext() as pool:
+        for group in _groups(calls, parallel):
+            if len(group) == 1:
+                responses.append(_dispatch(request, root, group[0]))
+            else:
+                responses.extend(pool.map(lambda call: _dispatch_read(request, root, call), group))
+    return {'responses': responses, 'rolled_back': False}
+
+
+def _run_atomic(request, root: str, calls: List) -> dict:
+    responses, rolled_back = [], False
+    with transaction.atomic():
+        for call in calls:
+            if rolled_back:
+                responses.append(_error(call, 424, "Not run: an earlier request in the batch failed"))
+                continue
+            responses.append(_dispatch(request, root, call))
+            if responses[-1]['status'] >= 400:
+                transaction.set_rollback(True)
+                rolled_back = True
+    return {'responses': responses, 'rolled_back': rolled_back}
@@ -0,0 +1,31 @@
+"""
+Fetch several records of a resource by ID in one request.
+
+Every resource router exposes ``POST /<resource>/batch-get`` with a body of
+``{"ids": [3, 1, 2]}``. The rows come from a single ``pk IN (...)`` query
+planned by ``@projected`` (the same ``select_related``/``prefetch_related``
+paths, ``fields=``/``exclude=``/``expand=`` handling and item shape as the
+detail route), are returned in the requested order, and IDs that do not
+exist are listed under ``missing`` instead of failing the request::
+
+    {"items": [{"id": 3, ...}, {"id": 1, ...}], "missing": [2]}
+"""
+
+from typing import Iterable
+
+from api.utils.projection import project
+
+
+MAX_BATCH_IDS = 500
+
+
+def batch_get(request, queryset, ids: Iterable[int]):
+    """The rows of ``queryset`` with ``ids``, in order, plus the missing IDs; a 400 for oversized batches."""
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BATCH_IDS:
+        return 400, {'detail': f"At most {MAX_BATCH_IDS} ids per request"}
+    found = {obj.pk: obj for obj in project(request, queryset.filter(pk__in=ids))}
+    return {
+        'items': [found[pk] for pk in ids if pk in found],
+        'missing': [pk for pk in ids if pk not in found],
+    }
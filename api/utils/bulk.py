@@ -0,0 +1,190 @@
+"""
+Batched row import for models without save() side effects.
+
+:func:`bulk_import` validates and inserts rows in batches instead of one
+request (and one ``INSERT``) per row:
+
+1. The batch is validated against the ``*In`` schema with a single pydantic
+   ``TypeAdapter`` call; rows it rejects are recorded and the rest are
+   re-validated together.
+2. Model field rules (null/blank, choices, max_length, decimal digits, min
+   values) are checked column by column with checks compiled once per field.
+3. Valid rows are written with one PostgreSQL ``COPY`` per batch when the
+   connection supports it (psycopg 3), otherwise with ``bulk_create``.
+
+Invalid rows never abort the batch; they come back as
+``{"row": <index>, "errors": {<field>: <message>}}``. A batch that still
+fails in the database (e.g. a unique constraint) is retried row by row so
+only the offending rows are reported.
+"""
+
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, List
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection, transaction
+from pydantic import TypeAdapter, create_model
+from pydantic import ValidationError as SchemaValidationError
+
+from api.utils import live, partitions
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+# rows accepted by the HTTP bulk endpoints; larger files go through the import_rows command
+MAX_REQUEST_ROWS = 10000
+
+
+class BulkResult:
+    """Outcome of an import: rows created and per-row errors."""
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, row: int, errors: Dict[str, str]) -> None:
+        self.errors.append({'row': row, 'errors': errors})
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def as_dict(self) -> dict:
+        return {'created': self.created, 'failed': self.failed, 'errors': self.errors}
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema) -> TypeAdapter:
+    # a plain pydantic copy of the schema: Ninja's Schema wraps every input in a
+    # DjangoGetter, which is only needed for model instances, not dict rows
+    row_model = create_model(
+        f'{schema.__name__}Row',
+        **{name: (field_info.annotation, field_info) for name, field_info in schema.model_fields.items()},
+    )
+    return TypeAdapter(List[row_model])
+
+
+def _validate_schema(schema, batch, start, result) -> List[tuple]:
+    """Validate ``batch`` against ``schema``; return ``(row_number, data)`` for valid rows."""
+    adapter = _list_adapter(schema)
+    indexed = list(enumerate(batch, start))
+    while indexed:
+        try:
+            validated = adapter.validate_python([row for _, row in indexed])
+        except SchemaValidationError as exc:
+            rejected = {}
+            for error in exc.errors():
+                position, *field = error['loc']
+                rejected.setdefault(position, {})['.'.join(map(str, field)) or '__all__'] = error['msg']
+            for position, errors in rejected.items():
+                result.add_error(indexed[position][0], errors)
+            indexed = [item for position, item in enumerate(indexed) if position not in rejected]
+            continue
+        return [(number, item.model_dump()) for (number, _), item in zip(indexed, validated)]
+    return []
+
+
+@lru_cache(maxsize=None)
+def _field_check(model, name):
+    """
+    A ``check(value)`` equivalent to ``Field.clean`` for already-typed values.
+
+    Choices, null/blank rules and validators are resolved once per field
+    instead of once per cell.
+    """
+    field = model._meta.get_field(name)
+    allowed = {value for value, _ in field.flatchoices} if field.choices else None
+    validators = tuple(field.validators)
+    messages = field.error_messages
+
+    def check(value):
+        if value is None and not field.null:
+            raise ValidationError(messages['null'])
+        if value in field.empty_values:
+            if not field.blank:
+                raise ValidationError(messages['blank'])
+            return
+        if allowed is not None and value not in allowed:
+            raise ValidationError(messages['invalid_choice'] % {'value': value})
+        for validator in validators:
+            validator(value)
+
+    return check
+
+
+def _validate_fields(model, rows, result) -> List[tuple]:
+    """Check each model field's rules over its column; return the rows that pass."""
+    if not rows:
+        return rows
+    errors = {}
+    for name in rows[0][1]:
+        check = _field_check(model, name)
+        for number, data in rows:
+            try:
+                check(data[name])
+            except ValidationError as exc:
+                errors.setdefault(number, {})[name] = exc.messages[0]
+    for number, row_errors in errors.items():
+        result.add_error(number, row_errors)
+    return [(number, data) for number, data in rows if number not in errors]
+
+
+def _copy_insert(model, objects) -> bool:
+    """Insert ``objects`` with PostgreSQL COPY; return False if COPY is unavailable."""
+    if connection.vendor != 'postgresql':
+        return False
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    quote = connection.ops.quote_name
+    statement = 'COPY {} ({}) FROM STDIN'.format(
+        quote(model._meta.db_table), ', '.join(quote(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor:
+        raw_cursor = cursor.cursor
+        if not hasattr(raw_cursor, 'copy'):  # psycopg2
+            return False
+        with raw_cursor.copy(statement) as copy:
+            for obj in objects:
+                copy.write_row([field.get_db_prep_save(field.pre_save(obj, True), connection) for field in fields])
+    return True
+
+
+def _insert_batch(model, objects) -> None:
+    partitions.ensure_for(model, objects)
+    if not _copy_insert(model, objects):
+        model.objects.bulk_create(objects)
+
+
+def _insert(model, rows, result) -> None:
+    objects = [model(**data) for _, data in rows]
+    try:
+        with transaction.atomic():
+            partitions.write_with_partitions(model, lambda: _insert_batch(model, objects))
+        result.created += len(objects)
+    except DatabaseError:
+        # isolate the rows the database rejects
+        for (number, _), obj in zip(rows, objects):
+            try:
+                with transaction.atomic():
+                    obj.pk = None
+                    obj.save()
+                result.created += 1
+            except DatabaseError as exc:
+                result.add_error(number, {'__all__': str(exc)})
+
+
+def bulk_import(model, schema, rows: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> BulkResult:
+    """Validate and insert ``rows`` (dicts shaped like ``schema``) in batches of ``batch_size``."""
+    result = BulkResult()
+    iterator = iter(rows)
+    start = 0
+    while batch := list(islice(iterator, batch_size)):
+        valid = _validate_schema(schema, batch, start, result)
+        valid = _validate_fields(model, valid, result)
+        if valid:
+            _insert(model, valid, result)
+        start += len(batch)
+    result.errors.sort(key=lambda error: error['row'])
+    if result.created:
+        live.changed(model)
+    return result
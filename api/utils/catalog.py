@@ -0,0 +1,149 @@
+"""
+Versioned, precomputed service catalog (services + categories).
+
+The catalog version is the ``catalog`` invalidation tag of
+:mod:`api.utils.response_cache`: saving or deleting a ``Service`` or
+``ServiceCategory`` bumps it once the transaction commits. The first
+request that sees a new version serializes the catalog (two queries) and
+stores the result in the shared cache under that version, so every process
+serves byte-identical snapshots. Each process then keeps the rendered body
+of the last few versions in memory; serving the current one costs a single
+cache read of the version number.
+
+``since_version=N`` returns only what changed between snapshot ``N`` and
+the current one: new or modified services/categories plus the IDs that
+were deleted. When ``N`` is no longer available the full catalog is sent
+with ``"full": true``.
+
+Bodies carry strong ETags (a digest of the exact bytes), so
+``If-None-Match`` answers 304 without re-sending anything.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from api.api.schema.schemas import ServiceCategoryOut, ServiceOut
+from api.models.service import Service, ServiceCategory
+from api.utils.response_cache import tag_versions
+
+
+CATALOG_TAG = 'catalog'
+SNAPSHOT_PREFIX = 'api-catalog'
+
+# rendered snapshots kept per process; older versions are reloaded from the cache for deltas
+KEEP_IN_MEMORY = 8
+
+_snapshots: 'OrderedDict[int, Snapshot]' = OrderedDict()
+_lock = threading.Lock()
+
+
+def _render(data) -> bytes:
+    from api.api import api  # the API imports the routers that use this module
+
+    body = api.renderer.render(None, data, response_status=200)
+    return body.encode() if isinstance(body, str) else body
+
+
+class Snapshot:
+    """One catalog version: items by ID and the rendered full body."""
+
+    def __init__(self, version: int, services: Dict[int, dict], categories: Dict[int, dict]):
+        self.version = version
+        self.services = services
+        self.categories = categories
+        self._body = None
+        self._deltas = {}
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = _render({
+                'version': self.version, 'since_version': None, 'full': True,
+                'services': list(self.services.values()), 'categories': list(self.categories.values()),
+                'deleted_services': [], 'deleted_categories': [],
+            })
+        return self._body
+
+    def delta_body(self, previous: 'Snapshot') -> bytes:
+        """The changes from ``previous`` to this snapshot, rendered."""
+        body = self._deltas.get(previous.version)
+        if body is None:
+            body = self._deltas[previous.version] = _render({
+                'version': self.version, 'since_version': previous.version, 'full': False,
+                'services': _changed(previous.services, self.services),
+                'categories': _changed(previous.categories, self.categories),
+                'deleted_services': sorted(previous.services.keys() - self.services.keys()),
+                'deleted_categories': sorted(previous.categories.keys() - self.categories.keys()),
+            })
+        return body
+
+
+def _changed(before: Dict[int, dict], after: Dict[int, dict]) -> list:
+    return [item for item_id, item in after.items() if before.get(item_id) != item]
+
+
+def _build() -> tuple:
+    services = Service.objects.select_related('category').order_by('id')
+    categories = ServiceCategory.objects.order_by('id')
+    return (
+        {service.id: ServiceOut.model_validate(service).model_dump() for service in services},
+        {category.id: ServiceCategoryOut.model_validate(category).model_dump() for category in categories},
+    )
+
+
+def _snapshot_key(version: int) -> str:
+    return f'{SNAPSHOT_PREFIX}:{version}'
+
+
+def _load(version: int, build: bool) -> Optional[Snapshot]:
+    """Snapshot ``version`` from memory or the shared cache, building it if ``build``."""
+    snapshot = _snapshots.get(version)
+    if snapshot is not None:
+        return snapshot
+    cache = caches['default']
+    state = cache.get(_snapshot_key(version))
+    if state is None:
+        if not build:
+            return None
+        # first writer wins, so every process serves the same bytes for a version
+        cache.add(_snapshot_key(version), _build())
+        state = cache.get(_snapshot_key(version)) or _build()
+    snapshot = Snapshot(version, *state)
+    _snapshots[version] = snapshot
+    while len(_snapshots) > KEEP_IN_MEMORY:
+        _snapshots.popitem(last=False)
+    return snapshot
+
+
+def current_snapshot() -> Snapshot:
+    version = tag_versions([CATALOG_TAG])[0]
+    snapshot = _snapshots.get(version)
+    if snapshot is None:
+        with _lock:
+            snapshot = _load(version, build=True)
+    return snapshot
+
+
+def catalog_response(request, since_version: int = None) -> HttpResponse:
+    """The full catalog, or the changes since ``since_version``, with a strong ETag."""
+    snapshot = current_snapshot()
+    body = snapshot.body
+    if since_version is not None:
+        with _lock:
+            previous = _load(since_version, build=False)
+        if previous is not None:
+            body = snapshot.delta_body(previous)
+
+    etag = quote_etag(hashlib.sha1(body).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response.headers['ETag'] = etag
+    return response
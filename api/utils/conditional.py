@@ -0,0 +1,116 @@
+"""
+Conditional GETs (``ETag`` / ``Last-Modified``) driven by ``updated_at``.
+
+``@conditional`` answers ``If-None-Match`` / ``If-Modified-Since`` with a
+``304 Not Modified`` before the response body is built, and adds both
+validators to every ``200`` response of the route.
+
+Detail routes name the lookup to run against the path parameters; the
+pre-check reads only ``(pk, updated_at)``, so a ``304`` never loads the
+object graph::
+
+    @router.get("/{invoice_id}", response=InvoiceOut)
+    @projected(expandable=True)
+    @conditional(Invoice, id='invoice_id')
+    def get_invoice(request, invoice_id: int):
+        ...
+
+List routes pass no lookup; the validators come from one ``COUNT`` /
+``MAX(updated_at)`` aggregate over the filtered queryset the view returns,
+taken before pagination and serialization.
+
+ETags are weak: the same row renders differently with ``fields=`` or
+``expand=``, and those only live in the query string, which URL-keyed
+caches already vary on. Changes to related rows that do not touch the
+parent's ``updated_at`` are not seen by the validators.
+"""
+
+from functools import wraps
+
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from ninja.utils import contribute_operation_callback
+
+
+class NotModified(Exception):
+    """Raised below ``@paginate`` to short-circuit a list route with a 304/412 response."""
+
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+class Validators:
+    """The ``ETag`` / ``Last-Modified`` pair for one response."""
+
+    def __init__(self, tag: str, updated_at=None):
+        if updated_at is not None:
+            tag = f"{tag}-{int(updated_at.timestamp() * 1_000_000)}"
+        self.etag = 'W/' + quote_etag(tag)
+        self.last_modified = int(updated_at.timestamp()) if updated_at is not None else None
+
+    def apply(self, response):
+        response.headers['ETag'] = self.etag
+        if self.last_modified is not None:
+            response.headers['Last-Modified'] = http_date(self.last_modified)
+        return response
+
+    def precondition(self, request):
+        """A 304 (or 412) response if the request's preconditions say so, else None."""
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        return self.apply(response) if response is not None else None
+
+
+def conditional(model, field: str = 'updated_at', **lookups):
+    """
+    Serve the route conditionally, validated by ``model.<field>``.
+
+    ``lookups`` map model fields to the view's path parameters (e.g.
+    ``id='invoice_id'``) for detail routes; without them the view must return
+    a QuerySet, as list routes do. Apply directly on the view function.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            result = view_func(request, *args, **kwargs)
+            if not lookups and isinstance(result, QuerySet):
+                state = result.aggregate(count=Count('pk'), last=Max(field))
+                request.validators = Validators(str(state['count']), state['last'])
+                response = request.validators.precondition(request)
+                if response is not None:
+                    raise NotModified(response)
+            return result
+
+        def bind_operation(operation):
+            run_view, run = operation.view_func, operation.run
+
+            @wraps(run_view)
+            def precheck(request, *args, **kwargs):
+                if lookups:
+                    filters = {name: kwargs[param] for name, param in lookups.items()}
+                    row = model.objects.filter(**filters).values_list('pk', field).first()
+                    if row is not None:
+                        request.validators = Validators(str(row[0]), row[1])
+                        response = request.validators.precondition(request)
+                        if response is not None:
+                            return response
+                try:
+                    return run_view(request, *args, **kwargs)
+                except NotModified as exc:
+                    return exc.response
+
+            def run_with_validators(request, **kw):
+                response = run(request, **kw)
+                validators = getattr(request, 'validators', None)
+                if validators is not None and response.status_code == 200:
+                    validators.apply(response)
+                return response
+
+            operation.view_func = precheck
+            operation.run = run_with_validators
+
+        contribute_operation_callback(wrapper, bind_operation)
+        return wrapper
+
+    return decorator
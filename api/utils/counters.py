@@ -0,0 +1,102 @@
+"""
+Incrementally maintained counters backing the /stats endpoint.
+
+Each tracked model keeps a ``<prefix>.total`` counter plus one
+``<prefix>.status.<value>`` counter per status choice. Signal handlers in
+``api.signals`` call :func:`adjust` on every save/delete, so reading the
+statistics is a single primary-key lookup on ``StatCounter``. Writes that
+bypass signals (``QuerySet.update()``, ``bulk_create()``) are corrected by
+:func:`reconcile`, which the ``reconcile_stats`` command runs periodically.
+"""
+
+from typing import Dict, Iterable, List
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, F
+
+from api.models.payment import Invoice
+from api.models.service import Quote, Service, ServiceOrder
+from api.models.stats import StatCounter
+
+
+# model -> (counter prefix, status field)
+TRACKED_MODELS = {
+    Service: ('services', 'status'),
+    ServiceOrder: ('orders', 'order_status'),
+    Quote: ('quotes', 'status'),
+    Invoice: ('invoices', 'status'),
+}
+
+
+def total_key(prefix: str) -> str:
+    return f"{prefix}.total"
+
+
+def status_key(prefix: str, status: str) -> str:
+    return f"{prefix}.status.{status}"
+
+
+def counter_keys(include_breakdown: bool = False) -> List[str]:
+    """All counter keys the stats endpoint reads."""
+    keys = []
+    for model, (prefix, field) in TRACKED_MODELS.items():
+        keys.append(total_key(prefix))
+        if include_breakdown:
+            choices = model._meta.get_field(field).choices
+            keys.extend(status_key(prefix, value) for value, _ in choices)
+    return keys
+
+
+def adjust(deltas: Dict[str, int]) -> None:
+    """
+    Apply counter deltas with atomic ``value = value + delta`` updates.
+
+    Missing counters are left alone; they are created by :func:`reconcile`.
+    """
+    for key, delta in deltas.items():
+        if delta:
+            StatCounter.objects.filter(key=key).update(value=F('value') + delta)
+
+
+def reconcile(models: Iterable = None) -> Dict[str, int]:
+    """Recompute counters from the tables with one grouped query per model."""
+    values = {}
+    for model in models or TRACKED_MODELS:
+        prefix, field = TRACKED_MODELS[model]
+        values[total_key(prefix)] = 0
+        for value, _ in model._meta.get_field(field).choices:
+            values[status_key(prefix, value)] = 0
+
+        rows = model.objects.values(field).annotate(count=Count('pk')).order_by()
+        for row in rows:
+            values[status_key(prefix, row[field])] = row['count']
+            values[total_key(prefix)] += row['count']
+
+    StatCounter.objects.bulk_create(
+        [StatCounter(key=key, value=value) for key, value in values.items()],
+        update_conflicts=True,
+        unique_fields=['key'],
+        update_fields=['value', 'updated_at'],
+    )
+    return values
+
+
+def read_counters(include_breakdown: bool = False) -> Dict[str, int]:
+    """Read the stats counters, bootstrapping them on first use."""
+    keys = counter_keys(include_breakdown)
+    counters = dict(StatCounter.objects.filter(key__in=keys).values_list('key', 'value'))
+    if len(counters) < len(keys):
+        reconcile()
+        counters = dict(StatCounter.objects.filter(key__in=keys).values_list('key', 'value'))
+    return counters
+
+
+async def aread_counters(include_breakdown: bool = False) -> Dict[str, int]:
+    """Async :func:`read_counters` for routes served on the event loop."""
+    keys = counter_keys(include_breakdown)
+    rows = StatCounter.objects.filter(key__in=keys).values_list('key', 'value')
+    counters = {key: value async for key, value in rows}
+    if len(counters) < len(keys):
+        await sync_to_async(reconcile)()
+        counters = {key: value async for key, value in rows.all()}
+    return counters
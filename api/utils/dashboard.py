@@ -0,0 +1,86 @@
+"""
+Dashboard aggregates shared by the stats routes and the live stream.
+
+Each function answers with one query, so ``/properties/stats``, the budget
+summary routes and :mod:`api.utils.live` compute the same numbers the same
+way. The ``a``-prefixed variants run the same queries through the async ORM
+for routes served on the event loop.
+"""
+
+from decimal import Decimal
+from typing import Dict, List
+
+from django.db.models import Count, Q, Sum
+
+from api.models.budget import Budget
+from api.models.property import Property
+
+
+def _property_counts() -> dict:
+    return {
+        'total_properties': Count('id'),
+        'available': Count('id', filter=Q(status='available')),
+        'reserved': Count('id', filter=Q(status='reserved')),
+        'sold_rented': Count('id', filter=Q(status__in=('sold', 'rented'))),
+        'for_sale': Count('id', filter=Q(category='sale')),
+        'for_rent': Count('id', filter=Q(category='rent')),
+        'for_lease': Count('id', filter=Q(category='lease')),
+    }
+
+
+def property_stats() -> dict:
+    """Property counts by status and category from one aggregate."""
+    return Property.objects.aggregate(**_property_counts())
+
+
+async def aproperty_stats() -> dict:
+    return await Property.objects.aaggregate(**_property_counts())
+
+
+def _empty_summaries(project_ids: List[str]) -> Dict[str, dict]:
+    return {
+        project_id: {
+            "project_id": project_id,
+            "total_budget": Decimal("0.00"),
+            "paid_budget": Decimal("0.00"),
+            "approved_budget": Decimal("0.00"),
+            "draft_budget": Decimal("0.00"),
+            "budget_count": 0,
+            "status_breakdown": {status: 0 for status in Budget.Status.values},
+        }
+        for project_id in project_ids
+    }
+
+
+def _summary_rows(project_ids: List[str]):
+    return (
+        Budget.objects.filter(project_id__in=project_ids)
+        .values("project_id", "status")
+        .annotate(amount=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+
+
+def _add_row(summaries: Dict[str, dict], row: dict) -> None:
+    summary = summaries[row["project_id"]]
+    amount = row["amount"] or Decimal("0.00")
+    summary["total_budget"] += amount
+    summary["budget_count"] += row["count"]
+    summary["status_breakdown"][row["status"]] = row["count"]
+    if row["status"] in (Budget.Status.PAID, Budget.Status.APPROVED, Budget.Status.DRAFT):
+        summary[f"{row['status']}_budget"] = amount
+
+
+def budget_summaries(project_ids: List[str]) -> List[dict]:
+    """Build budget summaries for the given projects from one grouped aggregate."""
+    summaries = _empty_summaries(project_ids)
+    for row in _summary_rows(project_ids):
+        _add_row(summaries, row)
+    return [summaries[project_id] for project_id in project_ids]
+
+
+async def abudget_summaries(project_ids: List[str]) -> List[dict]:
+    summaries = _empty_summaries(project_ids)
+    async for row in _summary_rows(project_ids):
+        _add_row(summaries, row)
+    return [summaries[project_id] for project_id in project_ids]
@@ -0,0 +1,71 @@
+"""
+Database connection reuse and its metrics.
+
+Opening a Postgres connection (TCP, TLS, authentication, backend start)
+costs more than most of the queries a request runs, so ``config.settings``
+keeps connections open across requests in one of two ways:
+
+* **persistent connections** -- each thread keeps its connection for
+  ``CONN_MAX_AGE`` seconds, and with ``CONN_HEALTH_CHECKS`` Django checks it
+  before reusing it, so one dropped by the server is replaced instead of
+  failing a request;
+* **a driver-level pool** (``DATABASES_POOL``, psycopg 3 with
+  ``psycopg_pool``) -- threads borrow connections from a per-process pool
+  for the length of a request. The pool is sized from the server's
+  connection budget split across ``WEB_CONCURRENCY`` worker processes.
+
+:func:`database_stats` reports, per alias and for this process, how the
+alias is configured, how many connections were opened and, when pooled, the
+pool's own counters; ``GET /stats/database`` serves it. Django signals
+``connection_created`` each time it gets a connection, which with a pool is
+a checkout rather than a new server connection, so pooled aliases report
+the pool's own count of connections opened and their checkouts separately.
+"""
+
+from collections import Counter
+from typing import List
+
+from django.db import connections
+
+
+# connections Django set up in this process, per alias: new connections, or checkouts when pooled
+created = Counter()
+
+
+def count_connection(sender, connection, **kwargs):
+    """``connection_created`` receiver."""
+    created[connection.alias] += 1
+
+
+def is_pooled(alias: str) -> bool:
+    return bool(connections[alias].settings_dict.get('OPTIONS', {}).get('pool'))
+
+
+def pool_stats(alias: str) -> dict:
+    """``psycopg_pool`` counters of a pooled alias (its size, idle and waiting connections, ...)."""
+    # get_stats() leaves the cumulative counters alone; pop_stats() would reset them
+    return connections[alias].pool.get_stats()
+
+
+def opened(alias: str) -> int:
+    """Server connections this process has opened for ``alias``."""
+    if is_pooled(alias):
+        return pool_stats(alias).get('connections_num', 0)
+    return created[alias]
+
+
+def database_stats() -> List[dict]:
+    stats = []
+    for alias in connections:
+        settings_dict = connections[alias].settings_dict
+        pool = pool_stats(alias) if is_pooled(alias) else None
+        stats.append({
+            'alias': alias,
+            'vendor': connections[alias].vendor,
+            'conn_max_age': settings_dict['CONN_MAX_AGE'],
+            'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+            'opened': created[alias] if pool is None else pool.get('connections_num', 0),
+            'checkouts': None if pool is None else created[alias],
+            'pool': pool,
+        })
+    return stats
@@ -0,0 +1,280 @@
+"""
+Live dashboard updates over Server-Sent Events.
+
+``GET /stats/stream`` keeps a connection open and pushes what changed on the
+dashboard instead of having every client poll ``/stats``,
+``/properties/stats`` and the budget summaries. A connection subscribes to
+*topics*:
+
+* ``stats`` -- the ``/stats`` counters with their status breakdown, keyed
+  like ``StatCounter`` (``orders.total``, ``orders.status.pending``, ...);
+* ``properties`` -- the ``/properties/stats`` numbers;
+* ``budgets:<project_id>`` -- one project's budget summary, flattened
+  (``total_budget``, ``status_breakdown.paid``, ...), amounts as strings.
+
+The first event of each topic carries its full state; later events carry
+only the keys whose values changed::
+
+    event: properties
+    data: {"available": 11, "reserved": 4}
+
+Saving or deleting a relevant model marks its topics dirty once the
+transaction commits (see ``api.signals``). The process's
+:class:`Broadcaster` waits :data:`DEBOUNCE_SECONDS` so a burst of writes is
+handled together, computes each dirty topic **once** (one query per topic
+kind, budgets for every subscribed project at once) and hands the delta to
+every subscriber of that topic.
+
+Publishing never waits for a subscriber. Each subscriber holds at most one
+pending delta per topic; when a slow connection has not sent the previous
+one yet, the new delta is merged into it (newer values win), so memory per
+connection is bounded by its topics and the slowest client only ever
+receives fewer, larger events.
+
+Writes made by other processes are not signalled here; every subscribed
+topic is recomputed each ``settings.API_LIVE_REFRESH_SECONDS`` to pick them
+up. Comment lines are sent every ``settings.API_LIVE_HEARTBEAT_SECONDS`` so
+proxies keep idle connections open. Streaming needs the ASGI application
+(``config.asgi``); under WSGI each connection would hold a worker.
+"""
+
+import asyncio
+import json
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from api.models.budget import Budget
+from api.models.property import Property
+from api.utils.counters import TRACKED_MODELS, read_counters
+from api.utils.dashboard import budget_summaries, property_stats
+
+
+STATS_TOPIC = 'stats'
+PROPERTIES_TOPIC = 'properties'
+BUDGETS_PREFIX = 'budgets:'
+
+# seconds a burst of writes is collected before recomputing
+DEBOUNCE_SECONDS = 0.05
+
+# client reconnect delay sent with the first line of every stream
+RETRY_MILLISECONDS = 5000
+
+
+def budgets_topic(project_id: str) -> str:
+    return f'{BUDGETS_PREFIX}{project_id}'
+
+
+def _flatten(data: dict, prefix: str = '') -> dict:
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{prefix}{key}.'))
+        else:
+            flat[f'{prefix}{key}'] = value if isinstance(value, (int, str)) else str(value)
+    return flat
+
+
+def compute_topics(topics: Iterable[str]) -> Dict[str, dict]:
+    """Current flattened state of each topic, one query per topic kind."""
+    topics = set(topics)
+    states = {}
+    if STATS_TOPIC in topics:
+        states[STATS_TOPIC] = read_counters(include_breakdown=True)
+    if PROPERTIES_TOPIC in topics:
+        states[PROPERTIES_TOPIC] = property_stats()
+    project_ids = sorted(topic[len(BUDGETS_PREFIX):] for topic in topics if topic.startswith(BUDGETS_PREFIX))
+    if project_ids:
+        for summary in budget_summaries(project_ids):
+            project_id = summary.pop('project_id')
+            states[budgets_topic(project_id)] = _flatten(summary)
+    return states
+
+
+def topics_for(model, instance=None) -> List[str]:
+    """Topics a write to ``model`` (``instance``, if known) may change."""
+    if model in TRACKED_MODELS:
+        return [STATS_TOPIC]
+    if model is Property:
+        return [PROPERTIES_TOPIC]
+    if model is Budget:
+        if instance is not None:
+            return [budgets_topic(instance.project_id)]
+        return [BUDGETS_PREFIX]
+    return []
+
+
+def format_event(topic: str, data: dict) -> str:
+    return f'event: {topic}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+class Subscriber:
+    """One connection: its topics and at most one pending (merged) delta per topic."""
+
+    def __init__(self, topics: Iterable[str]):
+        self.topics = frozenset(topics)
+        self.pending: Dict[str, dict] = {}
+        self.coalesced = 0
+        self._ready = asyncio.Event()
+
+    def offer(self, topic: str, delta: dict) -> None:
+        """Queue ``delta`` without waiting, merging it into one still unsent."""
+        if topic in self.pending:
+            self.pending[topic].update(delta)
+            self.coalesced += 1
+        else:
+            self.pending[topic] = dict(delta)
+        self._ready.set()
+
+    async def next(self, timeout: float = None) -> Dict[str, dict]:
+        """Everything pending, waiting up to ``timeout`` seconds; empty on timeout."""
+        if not self.pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return {}
+        pending, self.pending = self.pending, {}
+        self._ready.clear()
+        return pending
+
+
+class Broadcaster:
+    """
+    Fans computed topic deltas out to every subscriber in this event loop.
+
+    ``compute(topics)`` returns ``{topic: state}`` and runs in a worker
+    thread; it is called once per flush for all dirty topics together.
+    """
+
+    def __init__(self, compute: Callable[[Set[str]], Dict[str, dict]], debounce: float = DEBOUNCE_SECONDS,
+                 refresh: float = None):
+        self.compute = compute
+        self.debounce = debounce
+        self.refresh = refresh
+        self.subscribers: Set[Subscriber] = set()
+        self.state: Dict[str, dict] = {}
+        self.dirty: Set[str] = set()
+        self.stats = Counter()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_task = None
+        self._refresh_task = None
+
+    def topics(self) -> Set[str]:
+        return set().union(*(subscriber.topics for subscriber in self.subscribers))
+
+    def subscribe(self, topics: Iterable[str]) -> Subscriber:
+        """Register a subscriber in the running loop; known topics are sent in full right away."""
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # a new loop (e.g. a restarted server or test) starts from nothing
+            self.loop, self.subscribers, self.state, self.dirty = loop, set(), {}, set()
+            self._flush_task = self._refresh_task = None
+        subscriber = Subscriber(topics)
+        self.subscribers.add(subscriber)
+        for topic in subscriber.topics:
+            if topic in self.state:
+                subscriber.offer(topic, self.state[topic])
+        self._mark(subscriber.topics - self.state.keys())
+        if self.refresh and self._refresh_task is None:
+            self._refresh_task = loop.create_task(self._refresh_loop())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+        self.stats['coalesced'] += subscriber.coalesced
+        if not self.subscribers:
+            # nobody is listening, so the last published states go stale
+            self.state.clear()
+            self.dirty.clear()
+            for task in (self._flush_task, self._refresh_task):
+                if task is not None:
+                    task.cancel()
+
+    def notify(self, *topics: str) -> None:
+        """Mark ``topics`` dirty; safe to call from any thread. A bare prefix marks every topic it starts."""
+        loop = self.loop
+        if loop is None or loop.is_closed() or not topics:
+            return
+        try:
+            loop.call_soon_threadsafe(self._mark, topics)
+        except RuntimeError:  # the loop closed in between
+            pass
+
+    def _mark(self, topics: Iterable[str]) -> None:
+        subscribed = self.topics()
+        for topic in topics:
+            self.dirty.update(name for name in subscribed if name == topic or
+                              (topic.endswith(':') and name.startswith(topic)))
+        if self.dirty and self._flush_task is None:
+            self._flush_task = self.loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.debounce)
+            await self.flush()
+        finally:
+            self._flush_task = None
+        if self.dirty:
+            self._mark(())
+
+    async def flush(self) -> None:
+        """Compute every dirty topic once and publish what changed."""
+        topics, self.dirty = self.dirty, set()
+        if not topics:
+            return
+        self.stats['computes'] += 1
+        states = await sync_to_async(self.compute, thread_sensitive=True)(topics)
+        for topic, state in states.items():
+            previous = self.state.get(topic, {})
+            delta = {key: value for key, value in state.items() if previous.get(key) != value}
+            self.state[topic] = state
+            if delta:
+                self.publish(topic, delta)
+
+    def publish(self, topic: str, delta: dict) -> None:
+        self.stats['published'] += 1
+        for subscriber in self.subscribers:
+            if topic in subscriber.topics:
+                subscriber.offer(topic, delta)
+                self.stats['delivered'] += 1
+
+    async def _refresh_loop(self) -> None:
+        try:
+            while self.subscribers:
+                await asyncio.sleep(self.refresh)
+                self._mark(self.topics())
+        finally:
+            self._refresh_task = None
+
+
+broadcaster = Broadcaster(
+    compute_topics,
+    refresh=getattr(settings, 'API_LIVE_REFRESH_SECONDS', 30),
+)
+
+
+def changed(model, instance=None) -> None:
+    """Tell the live stream ``model`` changed once the current transaction commits."""
+    topics = topics_for(model, instance)
+    if topics and broadcaster.loop is not None:
+        transaction.on_commit(lambda: broadcaster.notify(*topics))
+
+
+async def event_stream(topics: Iterable[str], heartbeat: float = None):
+    """The SSE body for one connection subscribed to ``topics``."""
+    if heartbeat is None:
+        heartbeat = getattr(settings, 'API_LIVE_HEARTBEAT_SECONDS', 15)
+    subscriber = broadcaster.subscribe(topics)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        while True:
+            pending = await subscriber.next(timeout=heartbeat)
+            if not pending:
+                yield ': keep-alive\n\n'
+            for topic, delta in pending.items():
+                yield format_event(topic, delta)
+    finally:
+        broadcaster.unsubscribe(subscriber)
@@ -1,35 +1,85 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.core.files.uploadhandler import StopUpload
 from django.http import JsonResponse
 from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
 import json
 
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that stays on the event loop under ASGI.
+
+    The stock middleware is sync-only, so under ASGI Django would run every
+    request's whole middleware chain through one thread. Static files are
+    still served by WhiteNoise in a thread; everything else passes straight
+    through.
+    """
+
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
+
+
 class ResponseFormaterMiddleware:
+    async_capable = True
+    sync_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         try:
-            # Proceed with the request processing
-            response = self.get_response(request)
-
-            # Handle specific status code checks
-            if response.status_code == 422:
-                json_val = json.loads(response.content)
-                print(f'422 - {json_val}')
-                item_error = json_val["detail"][0]
-                msg = item_error['msg']
-    
-                return JsonResponse({"detail": msg or "Invalid data passed"}, status=422)
-                
-            if response.status_code == 500:
-                return JsonResponse({"detail": "Internal server error"}, status=500)
-            return response
-
-        except StopUpload as e:
+            return self.format(self.get_response(request))
+        except Exception as e:
+            return self.format_exception(e)
+
+    async def __acall__(self, request):
+        try:
+            return self.format(await self.get_response(request))
+        except Exception as e:
+            return self.format_exception(e)
+
+    def format(self, response):
+        # Handle specific status code checks
+        if response.status_code == 422:
+            json_val = json.loads(response.content)
+            print(f'422 - {json_val}')
+            item_error = json_val["detail"][0]
+            msg = item_error['msg']
+
+            return JsonResponse({"detail": msg or "Invalid data passed"}, status=422)
+
+        if response.status_code == 500:
+            return JsonResponse({"detail": "Internal server error"}, status=500)
+        return response
+
+    def format_exception(self, e):
+        if isinstance(e, StopUpload):
             # Catch StopUpload exception and return a custom response
             return JsonResponse({"detail": "Image size is too big"}, status=400)
-        
-        except Exception as e:
-            if settings.DEBUG == True:
-                return JsonResponse({"detail": str(e)})
-            return JsonResponse({"detail": "Internal server error"})
+
+        if settings.DEBUG == True:
+            return JsonResponse({"detail": str(e)})
+        return JsonResponse({"detail": "Internal server error"})
@@ -0,0 +1,119 @@
+"""
+Everything a client page shows, in one request.
+
+:func:`client_overview` replaces the front-end's six list calls (leads,
+quotes, orders, invoices, properties, documents) for one client. Each
+section is a single query on an indexed column: the most recent rows,
+shaped like the list route's items with relations as IDs, plus the
+section's totals computed as window aggregates over *all* of the client's
+rows in the same statement, so no separate ``COUNT`` is needed. The
+outstanding balance and open-order count ride along on the invoice and
+order queries the same way.
+
+The sections run concurrently, each in a worker thread on its own
+connection. Inside a transaction (``ATOMIC_REQUESTS``, tests) other
+connections cannot see its uncommitted rows, so there they run one after
+another on the request's connection instead.
+"""
+
+import asyncio
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.db import connection, connections
+from django.db.models import Count, F, Q, Sum, Window
+
+from api.api.schema.document_schemas import DocumentOut
+from api.api.schema.property_schemas import PropertyOut
+from api.api.schema.schemas import InvoiceOut, QuoteOut, ServiceLeadOut, ServiceOrderOut
+from api.models.document import Document
+from api.models.payment import Invoice
+from api.models.property import Property
+from api.models.service import Quote, ServiceLead, ServiceOrder
+from api.utils.projection import plan_for, subset_schema
+
+
+DEFAULT_RECENT = 5
+MAX_RECENT = 50
+
+CENT = Decimal('0.01')
+
+OPEN_ORDER_STATUSES = ('pending', 'accepted', 'in_progress')
+# invoices the client still owes on; drafts are not issued yet
+UNPAID_INVOICE_STATUSES = ('sent', 'viewed', 'partially_paid', 'overdue')
+
+
+def _documents(client_id: str):
+    # two indexed subqueries instead of an OR across joined tables
+    return Document.objects.filter(
+        Q(order__in=ServiceOrder.objects.filter(client_id=client_id).values('id'))
+        | Q(property__in=Property.objects.filter(client_id=client_id).values('id'))
+    )
+
+
+def _sections(client_id: str):
+    """``(name, queryset, list schema, {total name: window aggregate})`` per section."""
+    return (
+        ('leads', ServiceLead.objects.filter(client_id=client_id), ServiceLeadOut, {'leads': Count('pk')}),
+        ('quotes', Quote.objects.filter(client_id=client_id), QuoteOut, {'quotes': Count('pk')}),
+        ('orders', ServiceOrder.objects.filter(client_id=client_id), ServiceOrderOut, {
+            'orders': Count('pk'),
+            'open_orders': Count('pk', filter=Q(order_status__in=OPEN_ORDER_STATUSES)),
+        }),
+        ('invoices', Invoice.objects.filter(client_id=client_id), InvoiceOut, {
+            'invoices': Count('pk'),
+            'overdue_invoices': Count('pk', filter=Q(status='overdue')),
+            'invoiced': Sum('total_amount', filter=~Q(status__in=('draft', 'cancelled'))),
+            'paid': Sum('amount_paid'),
+            'outstanding_balance': Sum(
+                F('total_amount') - F('amount_paid'), filter=Q(status__in=UNPAID_INVOICE_STATUSES),
+            ),
+        }),
+        ('properties', Property.objects.filter(client_id=client_id), PropertyOut, {'properties': Count('pk')}),
+        ('documents', _documents(client_id), DocumentOut, {'documents': Count('pk')}),
+    )
+
+
+def _section(queryset, schema, totals: dict, limit: int):
+    """The ``limit`` most recent rows and ``totals`` over every row, from one query."""
+    schema = subset_schema(schema, expand=())
+    queryset = plan_for(queryset.model, schema).apply(queryset)
+    queryset = queryset.annotate(**{f'window_{name}': Window(aggregate) for name, aggregate in totals.items()})
+    rows = list(queryset[:limit])
+    values = {}
+    for name, aggregate in totals.items():
+        # every row carries the same window values; SUM over no rows is NULL
+        value = (getattr(rows[0], f'window_{name}') if rows else None) or 0
+        values[name] = Decimal(value).quantize(CENT) if isinstance(aggregate, Sum) else value
+    return [schema.model_validate(obj).model_dump() for obj in rows], values
+
+
+def _threaded_section(*args):
+    # runs in a worker thread, whose connections are not closed by Django
+    try:
+        return _section(*args)
+    finally:
+        connections.close_all()
+
+
+def _in_transaction() -> bool:
+    return connection.in_atomic_block
+
+
+async def client_overview(client_id: str, limit: int = DEFAULT_RECENT) -> dict:
+    """Recent records and rolled-up totals for ``client_id``."""
+    limit = max(1, min(limit, MAX_RECENT))
+    sections = _sections(client_id)
+    args = [(queryset, schema, totals, limit) for _, queryset, schema, totals in sections]
+    if await sync_to_async(_in_transaction)():
+        results = await sync_to_async(lambda: [_section(*section) for section in args])()
+    else:
+        results = await asyncio.gather(*(
+            sync_to_async(_threaded_section, thread_sensitive=False)(*section) for section in args
+        ))
+
+    overview = {'client_id': client_id, 'totals': {}}
+    for (name, *_), (items, totals) in zip(sections, results):
+        overview[name] = items
+        overview['totals'].update(totals)
+    return overview
@@ -0,0 +1,329 @@
+"""
+Monthly range partitioning of the payment and expense tables (PostgreSQL).
+
+``Payment`` rows are partitioned on ``payment_date`` and ``Expense`` rows on
+``date``, one partition per calendar month named ``<table>_pYYYY_MM``.
+Partitioning is optional: the tables start as ordinary tables and are
+converted once with ``manage.py partitions convert <resource>``, which
+rebuilds the table in one transaction (it holds an exclusive lock while the
+rows are copied, so run it in a maintenance window). Elsewhere, and on
+other databases, every function here is a no-op.
+
+PostgreSQL requires the partition key in every unique constraint, so a
+converted table's primary key is ``(id, <date>)``. Ids stay unique through
+the table's identity sequence, and Django still addresses rows by ``id``.
+Other unique columns (``Payment.payment_reference``) keep a per-date unique
+constraint as their index, and are kept globally unique by a small
+unpartitioned ``<table>_<column>_keys`` table that a trigger maintains: a
+duplicate fails on its primary key. References of detached partitions stay
+reserved there. The model's other indexes are rebuilt as Django creates
+them, including the ``varchar_pattern_ops`` ("``_like``") index of
+``payment_reference`` that serves ``startswith`` lookups.
+
+Partitions are created ahead of time by ``manage.py partitions create``
+(run it daily, e.g. from cron) for ``settings.API_PARTITION_MONTHS_AHEAD``
+months, and after migrations. A row dated outside the existing partitions
+(back-dated, or far in the future) gets its partition on demand when it is
+saved or bulk imported (see :func:`ensure_for`). Each process caches the
+months it has seen; a write that fails because another process detached or
+dropped one of them forgets the cache and runs again (see
+:func:`write_with_partitions`). There is deliberately no default partition:
+PostgreSQL cannot detach a partition ``CONCURRENTLY`` from a table that has
+one.
+
+Old months are archived with ``manage.py partitions detach --before
+YYYY-MM``: each partition is detached ``CONCURRENTLY``, so writes to the
+current months are never blocked, and is left behind as a plain table to
+dump and drop.
+
+Queries are pruned to the relevant partitions when they filter on the
+partition key; the list and export routes take ``date_from``/``date_to``
+for that.
+"""
+
+import re
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+from django.utils import timezone
+
+from api.models.expenses import Expense
+from api.models.payment import Payment
+
+
+PARTITION_SUFFIX = re.compile(r'_p(\d{4})_(\d{2})$')
+
+# PostgreSQL's error for a row whose month has no partition
+MISSING_PARTITION = 'no partition of relation'
+
+
+class PartitionError(Exception):
+    pass
+
+
+class PartitionedTable:
+    """A model whose table is (or may be) partitioned by month on ``field``."""
+
+    def __init__(self, model, field: str):
+        self.model = model
+        self.field = field
+
+    @property
+    def table(self) -> str:
+        return self.model._meta.db_table
+
+    @property
+    def column(self) -> str:
+        return self.model._meta.get_field(self.field).column
+
+    def partition_name(self, month: date) -> str:
+        return f'{self.table}_p{month:%Y_%m}'
+
+
+PARTITIONED_TABLES = {
+    'payments': PartitionedTable(Payment, 'payment_date'),
+    'expenses': PartitionedTable(Expense, 'date'),
+}
+
+_BY_MODEL = {spec.model: spec for spec in PARTITIONED_TABLES.values()}
+
+# (alias, table) -> months with a partition, or None when the table is not partitioned
+_known: Dict[Tuple[str, str], Optional[Set[date]]] = {}
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    years, index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def months_between(first: date, last: date) -> List[date]:
+    """First days of the months from ``first`` to ``last``, inclusive."""
+    months, month = [], month_start(first)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def is_partitioned(spec: PartitionedTable, using: str = DEFAULT_DB_ALIAS) -> bool:
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid"
+            " WHERE c.relname = %s AND pg_table_is_visible(c.oid))",
+            [spec.table],
+        )
+        return cursor.fetchone()[0]
+
+
+def partitions(spec: PartitionedTable, using: str = DEFAULT_DB_ALIAS) -> Dict[date, str]:
+    """Attached monthly partitions, by month."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i"
+            " JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent"
+            " WHERE p.relname = %s AND pg_table_is_visible(p.oid)",
+            [spec.table],
+        )
+        names = [name for name, in cursor.fetchall()]
+    found = {}
+    for name in names:
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            found[date(int(match[1]), int(match[2]), 1)] = name
+    return dict(sorted(found.items()))
+
+
+def create_partition_sql(spec: PartitionedTable, month: date, quote=lambda name: f'"{name}"') -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {quote(spec.partition_name(month))} PARTITION OF {quote(spec.table)}"
+        f" FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def _create(spec: PartitionedTable, months: Iterable[date], using: str) -> List[str]:
+    connection = connections[using]
+    created = []
+    with connection.cursor() as cursor:
+        for month in months:
+            cursor.execute(create_partition_sql(spec, month, connection.ops.quote_name))
+            created.append(spec.partition_name(month))
+    return created
+
+
+def ensure_partitions(spec: PartitionedTable, months_ahead: int = None, today: date = None,
+                      using: str = DEFAULT_DB_ALIAS) -> List[str]:
+    """Create the missing partitions from this month to ``months_ahead`` months ahead."""
+    if not is_partitioned(spec, using):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.API_PARTITION_MONTHS_AHEAD
+    current = month_start(today or timezone.localdate())
+    existing = partitions(spec, using)
+    missing = [month for month in months_between(current, add_months(current, months_ahead)) if month not in existing]
+    _known.pop((using, spec.table), None)
+    return _create(spec, missing, using)
+
+
+def ensure_for(model, objects: Iterable, using: str = DEFAULT_DB_ALIAS) -> None:
+    """Make sure the unsaved ``objects`` of ``model`` have partitions to go to."""
+    spec = _BY_MODEL.get(model)
+    if spec is None or connections[using].vendor != 'postgresql':
+        return
+    key = (using, spec.table)
+    if key not in _known:
+        _known[key] = set(partitions(spec, using)) if is_partitioned(spec, using) else None
+    known = _known[key]
+    if known is None:
+        return
+    days = (getattr(obj, spec.field) for obj in objects)
+    missing = {month_start(day) for day in days if isinstance(day, date)} - known
+    if missing:
+        _create(spec, sorted(missing), using)
+        # a rolled-back save takes its new partitions with it
+        transaction.on_commit(lambda: known.update(missing), using=using)
+
+
+def write_with_partitions(model, write: Callable, using: str = DEFAULT_DB_ALIAS):
+    """
+    Call ``write``, which inserts or updates rows of ``model`` and makes sure
+    their partitions exist, once more if it failed because a partition this
+    process knew of has since been detached or dropped.
+    """
+    spec = _BY_MODEL.get(model)
+    key = (using, spec.table) if spec else None
+    if _known.get(key) is None:
+        # not partitioned, or not cached yet and so read fresh by ``write``
+        return write()
+    try:
+        with transaction.atomic(using):
+            return write()
+    except IntegrityError as exc:
+        if MISSING_PARTITION not in str(exc):
+            raise
+    _known.pop(key, None)
+    return write()
+
+
+def _unique_keys_sql(spec: PartitionedTable, field, connection) -> List[str]:
+    """A table of ``field``'s values across all partitions, kept by a trigger."""
+    quote = connection.ops.quote_name
+    table, column = quote(spec.table), quote(field.column)
+    keys = quote(f'{spec.table}_{field.column}_keys')
+    sync = quote(f'{spec.table}_{field.column}_keys_sync')
+    return [
+        f"CREATE TABLE {keys} ({column} {field.db_type(connection)} PRIMARY KEY)",
+        f"INSERT INTO {keys} SELECT {column} FROM {table} WHERE {column} IS NOT NULL",
+        f"""CREATE FUNCTION {sync}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                IF OLD.{column} IS NOT DISTINCT FROM NEW.{column} THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM {keys} WHERE {column} = OLD.{column};
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                IF NEW.{column} IS NOT NULL THEN
+                    INSERT INTO {keys} VALUES (NEW.{column});
+                END IF;
+            END IF;
+            RETURN NULL;
+        END $$""",
+        f"CREATE TRIGGER {sync} AFTER INSERT OR UPDATE OR DELETE ON {table}"
+        f" FOR EACH ROW EXECUTE FUNCTION {sync}()",
+    ]
+
+
+def convert(spec: PartitionedTable, months_ahead: int = None, using: str = DEFAULT_DB_ALIAS) -> List[str]:
+    """
+    Rebuild ``spec``'s table as a partitioned table holding the same rows,
+    with a partition per month from its oldest row to ``months_ahead``
+    months ahead. Returns the partitions created.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        raise PartitionError("Partitioning needs PostgreSQL")
+    if is_partitioned(spec, using):
+        raise PartitionError(f"{spec.table} is already partitioned")
+    if months_ahead is None:
+        months_ahead = settings.API_PARTITION_MONTHS_AHEAD
+
+    model, quote = spec.model, connection.ops.quote_name
+    table, column, pk = quote(spec.table), quote(spec.column), quote(model._meta.pk.column)
+    old = quote(f'{spec.table}_unpartitioned')
+
+    with transaction.atomic(using), connection.schema_editor(atomic=False) as editor:
+        editor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT MIN({column}), MAX({column}) FROM {table}")
+            oldest, newest = cursor.fetchone()
+        current = month_start(timezone.localdate())
+        last = max(add_months(current, months_ahead), month_start(newest or current))
+        months = months_between(min(oldest or current, current), last)
+
+        editor.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        # NOT NULL, CHECK, defaults and a fresh identity sequence; keys and indexes are rebuilt below
+        editor.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING IDENTITY)"
+            f" PARTITION BY RANGE ({column})"
+        )
+        for month in months:
+            editor.execute(create_partition_sql(spec, month, quote))
+        editor.execute(f"INSERT INTO {table} OVERRIDING SYSTEM VALUE SELECT * FROM {old}")
+        editor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({pk}), 1), MAX({pk}) IS NOT NULL)"
+            f" FROM {table}",
+            [spec.table, model._meta.pk.column],
+        )
+        editor.execute(f"DROP TABLE {old}")
+
+        editor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({pk}, {column})")
+        for field in model._meta.local_concrete_fields:
+            if field.unique and not field.primary_key:
+                name = quote(f'{spec.table}_{field.column}_{spec.column}_uniq')
+                editor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({quote(field.column)}, {column})")
+                for statement in _unique_keys_sql(spec, field, connection):
+                    editor.execute(statement)
+        # field and Meta indexes, plus the "_like" pattern-ops index PostgreSQL adds for indexed
+        # and unique varchar columns (the unique constraint above does not provide one)
+        for statement in editor._model_indexes_sql(model):
+            editor.execute(statement)
+        for field in model._meta.local_concrete_fields:
+            if field.remote_field and field.db_constraint:
+                editor.execute(editor._create_fk_sql(model, field, '_fk_%(to_table)s_%(to_column)s'))
+
+    _known.pop((using, spec.table), None)
+    return [spec.partition_name(month) for month in months]
+
+
+def detach(spec: PartitionedTable, before: date, using: str = DEFAULT_DB_ALIAS) -> List[str]:
+    """
+    Detach the partitions of months before ``before`` without blocking
+    writes; they remain as ordinary tables for archiving. Returns their names.
+    """
+    connection = connections[using]
+    if not is_partitioned(spec, using):
+        raise PartitionError(f"{spec.table} is not partitioned")
+    if connection.in_atomic_block:
+        raise PartitionError("Partitions are detached concurrently, which cannot run inside a transaction")
+
+    quote, detached = connection.ops.quote_name, []
+    for month, name in partitions(spec, using).items():
+        if month >= month_start(before):
+            break
+        with connection.cursor() as cursor:
+            # an interrupted detach leaves the partition pending; finish it with DETACH ... FINALIZE
+            cursor.execute(f"ALTER TABLE {quote(spec.table)} DETACH PARTITION {quote(name)} CONCURRENTLY")
+        detached.append(name)
+    _known.pop((using, spec.table), None)
+    return detached
@@ -0,0 +1,514 @@
+"""
+Schema-driven column projection for read routes.
+
+The ``*Out`` schema attached to a route already decides which attributes
+reach the client, so the queryset behind it only needs those columns.
+``@projected`` reads the route's response schema and turns it into an
+``only()`` field list plus the ``select_related``/``prefetch_related``
+paths needed for nested schemas, so unused columns (and lazy relation
+lookups) never leave the database.
+
+Usage:
+    @router.get("", response=List[EventOut])
+    @paginate(LimitOffsetPagination, page_size=10)
+    @projected
+    def list_events(request):
+        return Event.objects.all()          # projected automatically
+
+    @router.get("/{event_id}", response=EventOut)
+    @projected
+    def get_event(request, event_id: int):
+        return get_object_or_404(project(request, Event.objects.all()), id=event_id)
+
+Computed properties used by a schema are resolved through the model's
+``PROJECTION_DEPENDENCIES`` mapping. Attributes the projection cannot
+account for (unknown properties, schema resolvers) make it fall back to
+loading every column of that model, so a projection is never lossy.
+
+Sparse fieldsets: every ``@projected`` route also accepts ``fields=`` and
+``exclude=`` query parameters (comma separated, dotted paths reach into
+nested schemas, e.g. ``fields=id,invoice_number,service.name``). The
+selection is validated against the response schema (unknown paths are a
+400), narrows the schema used for both the SQL projection and the payload,
+and is normalized so equivalent selections produce identical responses.
+The selection only lives in the query string, so URL-keyed caches vary on
+it without extra headers; server-side caches should key on
+:attr:`Projection.cache_key`.
+
+Routes declared with ``@projected(expandable=True)`` return nested objects
+as IDs (``"order": 12``) unless the client asks for them with ``expand=``,
+so the default payload and query stay flat and each expanded path adds
+exactly the join or prefetch it needs. Their OpenAPI response schema says
+so: each such field is documented as an integer or the nested object (see
+:func:`expandable_schema`).
+"""
+
+import types
+from functools import lru_cache, partial, wraps
+from typing import List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from django.http import HttpResponseBase
+from ninja import Query, Schema
+from ninja.utils import contribute_operation_args, contribute_operation_callback
+from pydantic import BaseModel, Field
+
+
+# derived schemas and query plans kept per process; selections come from clients, so the caches are bounded
+SCHEMA_CACHE_SIZE = 256
+
+
+def nested_schema(annotation) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Return ``(schema, many)`` for annotations like ``X``, ``Optional[X]`` or ``List[X]``."""
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return nested_schema(args[0])
+        return None, False
+    if origin in (list, List, tuple, set):
+        args = get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return args[0], True
+        return None, False
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def _source_name(name, field_info) -> str:
+    for alias in (field_info.validation_alias, field_info.alias):
+        if isinstance(alias, str):
+            return alias
+    return name
+
+
+class QueryPlan:
+    """Columns and relation paths a schema needs from one model."""
+
+    def __init__(self):
+        self.only = set()
+        self.select_related = set()
+        self.prefetch = []
+
+    def apply(self, queryset: QuerySet, also=()) -> QuerySet:
+        if queryset._fields is not None:
+            # .values()/.values_list() querysets are already projected
+            return queryset
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch)
+        return queryset.only(*sorted(self.only.union(also)))
+
+
+def _collect(model, schema, prefix: str, plan: QueryPlan) -> None:
+    opts = model._meta
+    by_name = {field.name: field for field in opts.concrete_fields}
+    by_attname = {field.attname: field for field in opts.concrete_fields}
+    dependencies = getattr(model, 'PROJECTION_DEPENDENCIES', {})
+    resolvers = getattr(schema, '_ninja_resolvers', {})
+    load_everything = False
+
+    for name, field_info in schema.model_fields.items():
+        if name in resolvers:
+            load_everything = True
+            continue
+
+        source = _source_name(name, field_info)
+        nested, many = nested_schema(field_info.annotation)
+        field = by_name.get(source) or by_attname.get(source)
+
+        if field is not None:
+            plan.only.add(prefix + field.name)
+            if field.is_relation and nested is not None and source == field.name:
+                path = prefix + field.name
+                plan.select_related.add(path)
+                _collect(field.related_model, nested, path + '__', plan)
+            continue
+
+        try:
+            relation = opts.get_field(source)
+        except FieldDoesNotExist:
+            relation = None
+
+        if relation is not None and relation.is_relation and nested is not None and many:
+            child = plan_for(relation.related_model, nested)
+            # a reverse foreign key must be loaded to attach rows to their parents
+            also = [relation.field.name] if relation.one_to_many else []
+            related_queryset = child.apply(relation.related_model._default_manager.all(), also)
+            plan.prefetch.append(Prefetch(prefix + source, queryset=related_queryset))
+        elif source in dependencies:
+            plan.only.update(prefix + dependency for dependency in dependencies[source])
+        else:
+            load_everything = True
+
+    if load_everything:
+        plan.only.update(prefix + field.name for field in opts.concrete_fields)
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def plan_for(model, schema) -> QueryPlan:
+    """Build (and cache) the query plan for serializing ``model`` with ``schema``."""
+    plan = QueryPlan()
+    _collect(model, schema, '', plan)
+    return plan
+
+
+def _swap_schema(annotation, old, new):
+    """Return ``annotation`` with the nested schema ``old`` replaced by ``new``."""
+    if annotation is old:
+        return new
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return Union[tuple(_swap_schema(arg, old, new) for arg in get_args(annotation))]
+    if origin in (list, List):
+        return List[_swap_schema(get_args(annotation)[0], old, new)]
+    return annotation
+
+
+def parse_paths(value: Optional[str]):
+    """
+    Parse ``"a,b.c,b.d"`` into a frozen selection tree.
+
+    The tree is a sorted tuple of ``(name, subtree)`` pairs where ``subtree``
+    is ``None`` for a whole field, so equal selections compare (and hash)
+    equal regardless of how the client ordered them.
+    """
+    tree = {}
+    for raw in (value or '').split(','):
+        parts = [part.strip() for part in raw.split('.')]
+        if not all(parts):
+            continue
+        node = tree
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is None:  # the whole field is already selected
+                break
+            node = child
+        else:
+            node[parts[-1]] = None
+
+    def freeze(node):
+        if node is None:
+            return None
+        return tuple(sorted((name, freeze(child)) for name, child in node.items()))
+
+    return freeze(tree) or None
+
+
+def unknown_paths(schema, tree, prefix: str = '') -> List[str]:
+    """Paths in ``tree`` that do not name a (nested) field of ``schema``."""
+    unknown = []
+    for name, subtree in tree or ():
+        field_info = schema.model_fields.get(name)
+        if field_info is None:
+            unknown.append(prefix + name)
+            continue
+        if subtree is not None:
+            nested, _ = nested_schema(field_info.annotation)
+            if nested is None:
+                unknown.extend(prefix + name + '.' + child for child, _ in subtree)
+            else:
+                unknown.extend(unknown_paths(nested, subtree, prefix + name + '.'))
+    return unknown
+
+
+def invalid_expansions(schema, tree, prefix: str = '') -> List[str]:
+    """Paths in ``tree`` that do not name a nested single-object field of ``schema``."""
+    invalid = []
+    for name, subtree in tree or ():
+        field_info = schema.model_fields.get(name)
+        nested, many = nested_schema(field_info.annotation) if field_info else (None, False)
+        if nested is None or many:
+            invalid.append(prefix + name)
+        else:
+            invalid.extend(invalid_expansions(nested, subtree, prefix + name + '.'))
+    return invalid
+
+
+def _collapsed_field(name, field_info):
+    """An ``<relation>_id`` field standing in for a nested object that was not expanded."""
+    annotation = Optional[int] if type(None) in get_args(field_info.annotation) else int
+    default = ... if field_info.is_required() else field_info.default
+    return annotation, Field(default, validation_alias=f'{_source_name(name, field_info)}_id')
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def expandable_schema(schema):
+    """
+    Derive (and cache) the documented response schema of an expandable
+    route: every nested single-object field of ``schema`` is either the
+    related object's ID or, when expanded, the nested object. Only used for
+    OpenAPI; payloads are validated with :func:`subset_schema`.
+    """
+    annotations = {}
+    namespace = {'__module__': schema.__module__, '__annotations__': annotations}
+    for name, field_info in schema.model_fields.items():
+        nested, many = nested_schema(field_info.annotation)
+        if nested is None or many:
+            annotations[name], namespace[name] = field_info.annotation, field_info
+            continue
+        documented = Union[int, expandable_schema(nested)]
+        if type(None) in get_args(field_info.annotation):
+            documented = Optional[documented]
+        annotations[name] = documented
+        default = ... if field_info.is_required() else field_info.default
+        namespace[name] = Field(default, description="ID, or the object when its path is listed in expand=")
+    return type(f'{schema.__name__}Expandable', (Schema,), namespace)
+
+
+def _document_expansions(operation, schema) -> None:
+    """Declare the ID-or-object fields of :func:`expandable_schema` as the route's success response."""
+    documented = expandable_schema(schema)
+    for status, model in list(operation.response_models.items()):
+        if not isinstance(status, int) or not 200 <= status < 300 or model is None:
+            continue
+        annotation = getattr(model, '__annotations__', {}).get('response')
+        wrapper, _ = nested_schema(annotation)
+        if wrapper is not None and wrapper is not schema and 'items' in wrapper.model_fields:
+            # already wrapped by @paginate, or a batch-get result
+            items = _swap_schema(wrapper.model_fields['items'].annotation, schema, documented)
+            name = wrapper.__name__.replace(schema.__name__, documented.__name__)
+            annotation = type(name, (wrapper,), {'__annotations__': {'items': items}})
+        else:
+            annotation = _swap_schema(annotation, schema, documented)
+        operation.response_models[status] = operation._create_response_model(annotation)
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def subset_schema(schema, include=None, exclude=None, expand=None):
+    """
+    Derive (and cache) a copy of ``schema`` restricted to a selection.
+
+    ``include``/``exclude``/``expand`` are trees from :func:`parse_paths`;
+    ``include`` of ``None`` keeps every field. ``expand`` of ``None`` keeps
+    nested objects as declared; any other value collapses nested
+    single-object fields to their ID unless the path is expanded (or
+    selected into by ``include``). Aliases, defaults and resolvers of the
+    kept fields carry over, so the derived schema reads the same
+    attributes as the original.
+    """
+    included = dict(include) if include is not None else None
+    excluded = dict(exclude or ())
+    expanded = dict(expand) if expand is not None else None
+    if included is None and not excluded and expanded is None:
+        return schema
+
+    annotations = {}
+    namespace = {'__module__': schema.__module__, '__annotations__': annotations}
+    for name, field_info in schema.model_fields.items():
+        if included is not None and name not in included:
+            continue
+        if name in excluded and excluded[name] is None:
+            continue
+        annotation = field_info.annotation
+        nested, many = nested_schema(annotation)
+        sub_include = included.get(name) if included is not None else None
+        sub_exclude = excluded.get(name)
+        if expanded is not None and nested is not None and not many:
+            if name not in expanded and sub_include is None:
+                annotations[name], namespace[name] = _collapsed_field(name, field_info)
+                continue
+            sub_expand = expanded.get(name) or ()
+        else:
+            sub_expand = None if expanded is None else ()
+        if nested is not None and (sub_include is not None or sub_exclude is not None or sub_expand is not None):
+            annotation = _swap_schema(
+                annotation, nested, subset_schema(nested, sub_include, sub_exclude, sub_expand)
+            )
+        annotations[name] = annotation
+        namespace[name] = field_info
+        resolver = getattr(schema, '_ninja_resolvers', {}).get(name)
+        if resolver is not None:
+            namespace[f'resolve_{name}'] = staticmethod(resolver._func) if resolver._static else resolver._func
+
+    return type(f'{schema.__name__}Subset', (Schema,), namespace)
+
+
+class Projection:
+    """The projection attached to a request by ``@projected``."""
+
+    def __init__(self, schema, include=None, exclude=None, expand=None, fast_path=False):
+        self.route_schema = schema
+        self.include = include
+        self.exclude = exclude
+        self.expand = expand
+        self.schema = subset_schema(schema, include, exclude, expand)
+        self.fast_path = fast_path
+        self.encoder = None
+
+    def values(self, queryset: QuerySet) -> Optional[QuerySet]:
+        """
+        ``queryset`` as projected ``values_list()`` rows for the row encoder.
+
+        Returns ``None`` when the route has no fast path or the schema cannot
+        be encoded; the caller then uses :meth:`apply`.
+        """
+        if not self.fast_path or queryset._fields is not None:
+            return None
+        from api.utils.row_encoder import encoder_for  # imports this module
+
+        self.encoder = encoder_for(queryset.model, self.schema)
+        return self.encoder.queryset(queryset) if self.encoder is not None else None
+
+    @property
+    def reshaped(self) -> bool:
+        """Whether the payload differs from the route's declared schema."""
+        return self.schema is not self.route_schema
+
+    @property
+    def cache_key(self) -> str:
+        """Normalized ``fields``/``exclude``/``expand`` selection, for server-side cache keys."""
+
+        def render(tree, prefix=''):
+            for name, subtree in tree or ():
+                if subtree is None:
+                    yield prefix + name
+                else:
+                    yield from render(subtree, prefix + name + '.')
+
+        return 'fields=%s;exclude=%s;expand=%s' % (
+            ','.join(render(self.include)), ','.join(render(self.exclude)), ','.join(render(self.expand)),
+        )
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        return plan_for(queryset.model, self.schema).apply(queryset)
+
+    def render(self, request, operation, result):
+        """Serialize ``result`` (an object, a page or encoder rows) with the narrowed schema."""
+        context = {'request': request, 'response_status': 200}
+        dump_kwargs = {
+            'by_alias': operation.by_alias,
+            'exclude_unset': operation.exclude_unset,
+            'exclude_defaults': operation.exclude_defaults,
+            'exclude_none': operation.exclude_none,
+            'context': context,
+        }
+
+        def dump(obj):
+            return self.schema.model_validate(obj, context=context).model_dump(**dump_kwargs)
+
+        if self.encoder is not None and isinstance(result, dict) and 'items' in result:
+            data = {**result, 'items': self.encoder.encode(result['items'])}
+        elif self.encoder is not None and isinstance(result, QuerySet):
+            data = self.encoder.encode(result)
+        elif isinstance(result, dict) and 'items' in result:
+            data = {**result, 'items': [dump(obj) for obj in result['items']]}
+        else:
+            data = dump(result)
+        return operation.api.create_response(request, data, status=200)
+
+
+def response_schema(operation) -> Optional[Type[BaseModel]]:
+    """The (item) schema of an operation's success response."""
+    statuses = sorted(code for code in operation.response_models if isinstance(code, int))
+    for status in statuses:
+        model = operation.response_models[status]
+        if not 200 <= status < 300 or model is None:
+            continue
+        annotation = getattr(model, '__annotations__', {}).get('response')
+        schema, _ = nested_schema(annotation)
+        if schema is not None and 'items' in schema.model_fields and (
+            {'count', 'missing'} & set(schema.model_fields)
+        ):
+            # already wrapped by @paginate, or a batch-get result
+            schema, _ = nested_schema(schema.model_fields['items'].annotation)
+        return schema
+    return None
+
+
+def project(request, queryset: QuerySet) -> QuerySet:
+    """Apply the current route's projection to ``queryset`` (no-op outside ``@projected``)."""
+    projection = getattr(request, 'projection', None)
+    if projection is None:
+        return queryset
+    return projection.apply(queryset)
+
+
+def projected(view_func=None, *, expandable: bool = False, fast_path: bool = False):
+    """
+    Project the view's queryset onto the route's response schema.
+
+    Apply directly on the view function (below ``@paginate``). Any QuerySet
+    the view returns is projected; views that resolve a single object should
+    pass their queryset through :func:`project`. The route gains the
+    ``fields``/``exclude`` query parameters described in the module docs.
+
+    ``@projected(expandable=True)`` additionally returns nested objects as
+    their IDs unless requested with ``expand=`` (e.g.
+    ``expand=order.quote,lead.service``), which also limits the joins and
+    prefetches to the expanded paths. The route's OpenAPI response documents
+    those fields as an ID or the object.
+
+    ``@projected(fast_path=True)`` opts a read-only list route into
+    :mod:`api.utils.row_encoder`: the returned QuerySet is fetched as
+    ``values_list()`` rows and encoded without model instances or pydantic
+    validation, whenever the (narrowed) schema can be encoded exactly.
+    """
+    if view_func is None:
+        return partial(projected, expandable=expandable, fast_path=fast_path)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        result = view_func(request, *args, **kwargs)
+        if isinstance(result, QuerySet):
+            projection = getattr(request, 'projection', None)
+            rows = projection.values(result) if projection is not None else None
+            result = rows if rows is not None else project(request, result)
+        return result
+
+    def bind_operation(operation):
+        schema = response_schema(operation)
+        if schema is None:
+            return
+        run_view = operation.view_func
+        # the row encoder emits plain attribute names with every value present
+        plain_dump = not (
+            operation.by_alias or operation.exclude_unset or operation.exclude_defaults or operation.exclude_none
+        )
+
+        @wraps(run_view)
+        def select_fields(request, *args, fields=None, exclude=None, expand=None, **kwargs):
+            include, omit = parse_paths(fields), parse_paths(exclude)
+            unknown = unknown_paths(schema, include) + unknown_paths(schema, omit)
+            if unknown:
+                return operation.api.create_response(
+                    request, {'detail': f"Unknown field(s): {', '.join(unknown)}"}, status=400
+                )
+            expansions = None
+            if expandable:
+                expansions = parse_paths(expand) or ()
+                invalid = invalid_expansions(schema, expansions)
+                if invalid:
+                    return operation.api.create_response(
+                        request, {'detail': f"Cannot expand: {', '.join(invalid)}"}, status=400
+                    )
+            request.projection = Projection(schema, include, omit, expansions, fast_path and plain_dump)
+            result = run_view(request, *args, **kwargs)
+            if isinstance(result, (HttpResponseBase, tuple)):
+                return result
+            if not request.projection.reshaped and request.projection.encoder is None:
+                return result
+            return request.projection.render(request, operation, result)
+
+        operation.view_func = select_fields
+        if expandable:
+            _document_expansions(operation, schema)
+
+    contribute_operation_args(
+        wrapper, 'fields', Optional[str],
+        Query(None, description="Comma-separated fields to return (dotted paths select nested fields)"),
+    )
+    contribute_operation_args(
+        wrapper, 'exclude', Optional[str],
+        Query(None, description="Comma-separated fields to leave out"),
+    )
+    if expandable:
+        contribute_operation_args(
+            wrapper, 'expand', Optional[str],
+            Query(None, description="Comma-separated nested objects to embed instead of their IDs"),
+        )
+    contribute_operation_callback(wrapper, bind_operation)
+    return wrapper
@@ -0,0 +1,113 @@
+"""
+orjson-backed JSON renderer and parser for the NinjaAPI.
+
+The stock renderer runs every response through ``json.dumps`` with
+``NinjaJSONEncoder``, which is slow on Decimal- and datetime-heavy payloads
+(invoices, payments, budgets, events). :class:`ORJSONRenderer` encodes with
+orjson while keeping the output values identical to the stock renderer:
+
+* ``Decimal`` is always rendered as its exact string (``"1075.00"``), never
+  through a float.
+* Datetimes follow ``settings.API_JSON_DATETIME_FORMAT``: ``"django"`` (the
+  default) matches ``DjangoJSONEncoder`` (millisecond precision, ``Z`` for
+  UTC), ``"iso"`` uses orjson's native RFC 3339 output (microseconds,
+  fastest), and any other value is used as a ``strftime`` pattern.
+* Anything orjson cannot encode (e.g. integers beyond 64 bits) falls back to
+  the stock renderer, as does everything when orjson is not installed.
+* The fallback is also content-negotiated: a client whose ``Accept`` header
+  asks for ``application/json; indent=<n>`` gets the stock renderer's
+  output indented by ``n`` spaces, which orjson cannot produce.
+
+:class:`ORJSONParser` parses request bodies with orjson; bodies found to
+contain non-integer numbers are parsed again with ``parse_float=Decimal``, so
+amounts keep exactly the digits the client sent.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.conf import settings
+from ninja.parser import Parser
+from ninja.renderers import JSONRenderer
+from ninja.responses import NinjaJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+def _django_datetime(value: datetime) -> str:
+    """``DjangoJSONEncoder``'s datetime format: millisecond precision, ``Z`` for UTC."""
+    text = value.isoformat()
+    if value.microsecond:
+        text = text[:23] + text[26:]
+    if text.endswith('+00:00'):
+        text = text[:-6] + 'Z'
+    return text
+
+
+def _contains_float(data) -> bool:
+    if isinstance(data, float):
+        return True
+    if isinstance(data, dict):
+        return any(_contains_float(value) for value in data.values())
+    if isinstance(data, list):
+        return any(_contains_float(value) for value in data)
+    return False
+
+
+def _requested_indent(request):
+    """The ``indent`` parameter of an ``application/json`` entry in the ``Accept`` header, if any."""
+    if request is None:
+        return None
+    for media_type in request.accepted_types:
+        if (media_type.main_type, media_type.sub_type) == ('application', 'json'):
+            indent = media_type.params.get('indent', '')
+            return int(indent) if indent.isdigit() else None
+    return None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer using orjson, with the stock renderer as fallback."""
+
+    def __init__(self, datetime_format: str = None):
+        self.datetime_format = datetime_format or getattr(settings, 'API_JSON_DATETIME_FORMAT', 'django')
+        self._encoder = NinjaJSONEncoder()
+        # orjson encodes datetimes natively unless they are passed through to default()
+        self._options = 0 if self.datetime_format == 'iso' else orjson and orjson.OPT_PASSTHROUGH_DATETIME
+
+    def _default(self, value):
+        # exact types first: these are the bulk of every invoice/event payload
+        if type(value) is Decimal:
+            return str(value)
+        if type(value) is datetime and self.datetime_format == 'django':
+            return _django_datetime(value)
+        if isinstance(value, (datetime, date, time)) and self.datetime_format not in ('django', 'iso'):
+            return value.strftime(self.datetime_format)
+        return self._encoder.default(value)
+
+    def render(self, request, data, *, response_status):
+        indent = _requested_indent(request)
+        if indent is not None:
+            return json.dumps(data, cls=self.encoder_class, indent=indent, **self.json_dumps_params)
+        if orjson is None:
+            return super().render(request, data, response_status=response_status)
+        try:
+            return orjson.dumps(data, default=self._default, option=self._options)
+        except orjson.JSONEncodeError:
+            return super().render(request, data, response_status=response_status)
+
+
+class ORJSONParser(Parser):
+    """JSON body parser using orjson that never turns amounts into floats."""
+
+    def parse_body(self, request):
+        if orjson is None:
+            return json.loads(request.body, parse_float=Decimal)
+        data = orjson.loads(request.body)
+        # non-integer numbers, and integers beyond 64 bits, which orjson reads as floats
+        if _contains_float(data):
+            return json.loads(request.body, parse_float=Decimal)
+        return data
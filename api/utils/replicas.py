@@ -0,0 +1,186 @@
+"""
+Read-replica routing.
+
+Every database alias other than ``default`` is a read replica of it (see
+``DATABASES_REPLICA_HOSTS`` in ``config.settings``). :class:`ReplicaRouter`
+sends reads to a replica only inside :func:`replica_reads`, which
+:class:`ReplicaMiddleware` enters for ``GET`` and ``HEAD`` requests; every
+other read and every write goes to ``default``, and so does any read made
+inside a transaction on ``default``, so a view never reads its own writes
+from a replica.
+
+*Read-your-writes*: once a client's write request succeeds, its reads stay
+on ``default`` for ``settings.API_REPLICA_PIN_SECONDS``, and never for less
+than a replica in use can lag behind (the allowed lag plus the time between
+probes, see :func:`pin_seconds`). Clients are told apart by a digest of their
+``Authorization`` header (their address without one), and the pin is kept in
+the shared cache so it holds across processes.
+
+*Lag*: each replica's replay lag is probed at most every
+:data:`LAG_CHECK_SECONDS` per process. A replica more than
+``settings.API_REPLICA_MAX_LAG_SECONDS`` behind, or one that cannot be
+reached, is skipped until the next probe; with no usable replica, reads fall
+back to ``default``.
+
+Responses stored in the shared response cache are served to every client, so
+:func:`primary_reads` keeps the reads that build them on ``default``.
+"""
+
+import hashlib
+import math
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+PIN_PREFIX = 'api-pin'
+
+# seconds a replica's measured lag is trusted
+LAG_CHECK_SECONDS = 5
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+
+# alias -> (checked at, usable)
+_health: Dict[str, Tuple[float, bool]] = {}
+
+PG_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def replicas() -> List[str]:
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+@contextmanager
+def replica_reads():
+    """Let reads outside a transaction go to a replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Send every read to ``default``, even inside :func:`replica_reads`."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def pin_seconds() -> int:
+    """Seconds a writer stays on ``default``: at least as long as a usable replica can lag."""
+    # a replica within the allowed lag at one probe may fall further behind until the next
+    return max(settings.API_REPLICA_PIN_SECONDS, math.ceil(settings.API_REPLICA_MAX_LAG_SECONDS + LAG_CHECK_SECONDS))
+
+
+def replica_lag(alias: str) -> float:
+    """Seconds ``alias`` is behind ``default``; replicas of other vendors are trusted."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(PG_LAG_SQL)
+        lag = cursor.fetchone()[0]
+    return float(lag or 0)
+
+
+def is_usable(alias: str) -> bool:
+    """Whether ``alias`` answered its last lag probe within the allowed lag."""
+    now = time.monotonic()
+    checked_at, usable = _health.get(alias, (None, False))
+    if checked_at is None or now - checked_at >= LAG_CHECK_SECONDS:
+        try:
+            usable = replica_lag(alias) <= settings.API_REPLICA_MAX_LAG_SECONDS
+        except DatabaseError:
+            usable = False
+        _health[alias] = (now, usable)
+    return usable
+
+
+class ReplicaRouter:
+    """Routes reads to a usable replica where :func:`replica_reads` allows it."""
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        if not _replica_reads.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        usable = [alias for alias in replicas() if is_usable(alias)]
+        return random.choice(usable) if usable else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> Optional[bool]:
+        # replicas receive the schema through replication
+        return db == DEFAULT_DB_ALIAS
+
+
+def _pin_key(request) -> str:
+    client = request.headers.get('Authorization') or request.META.get('REMOTE_ADDR', '')
+    return f'{PIN_PREFIX}:{hashlib.sha256(client.encode()).hexdigest()}'
+
+
+class ReplicaMiddleware:
+    """
+    Serves safe requests from replicas, except for clients that wrote in the
+    last :func:`pin_seconds`. Does nothing without replicas.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replicas():
+            return self.get_response(request)
+        if request.method in SAFE_METHODS:
+            if cache.get(_pin_key(request)):
+                return self.get_response(request)
+            with replica_reads():
+                return self.get_response(request)
+        response = self.get_response(request)
+        self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        if not replicas():
+            return await self.get_response(request)
+        if request.method in SAFE_METHODS:
+            if await cache.aget(_pin_key(request)):
+                return await self.get_response(request)
+            with replica_reads():
+                return await self.get_response(request)
+        response = await self.get_response(request)
+        await sync_to_async(self.pin)(request, response)
+        return response
+
+    def pin(self, request, response) -> None:
+        """Keep the client on ``default`` after a successful write."""
+        if response.status_code < 400:
+            cache.set(_pin_key(request), True, pin_seconds())
@@ -0,0 +1,223 @@
+"""
+Per-route response cache with tag-based invalidation.
+
+``@cached(tags=...)`` stores a route's rendered ``200`` responses in the
+Django cache, keyed on the route, the request path, the normalized query
+string (parameters and their values sorted) and the authenticated user::
+
+    @router.get("/featured/all", response=List[EventOut])
+    @cached(tags=['events'])
+    @paginate(LimitOffsetPagination, page_size=10)
+    @projected
+    def get_featured_events(request):
+        ...
+
+Every tag has a version number stored in the cache and included in the
+keys of the responses that depend on it. Saving or deleting a model listed
+in :data:`INVALIDATES` bumps its tags' versions once the transaction
+commits (see ``api.signals``), so every cached response for, say,
+``events`` is orphaned at once and simply expires. Writes that bypass
+signals call :func:`invalidate_model` themselves.
+
+The lookup runs after authentication. Cached responses keep their
+``ETag`` / ``Last-Modified`` headers and still answer conditional requests
+with a 304. A hit close to expiry may be treated as a miss (probabilistic
+early refresh, see :func:`api.utils.tiered_cache.refresh_early`) so one
+request re-renders a hot route before it expires for everyone. Hits and
+misses are counted per route for ``/stats/cache`` with ``incr``, which is
+atomic on Redis but not on the file-based cache: there, processes counting
+at the same moment can overwrite each other and the counts run low.
+
+A cached response is shared by every later request, including ones from
+clients that just wrote, so cached routes always read from the primary
+database, never from a possibly lagging replica (see
+:func:`api.utils.replicas.primary_reads`). Hits make no queries at all.
+
+``settings.API_RESPONSE_CACHE_TIMEOUT`` sets the lifetime in seconds;
+``0`` disables the cache. ``settings.API_RESPONSE_CACHE_ALIAS`` selects the
+cache backend (``"default"``).
+"""
+
+import hashlib
+import time
+from contextlib import nullcontext
+from functools import wraps
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from ninja.utils import contribute_operation_callback
+
+from api.models.content import Content
+from api.models.event import Event
+from api.models.service import Service, ServiceCategory
+from api.utils.replicas import primary_reads
+from api.utils.tiered_cache import refresh_early
+
+
+# model -> cache tags its writes invalidate
+INVALIDATES = {
+    Event: ('events',),
+    Content: ('content',),
+    ServiceCategory: ('categories', 'catalog'),
+    Service: ('services', 'catalog'),
+}
+
+# route name -> tags, filled in as cached routes are registered
+CACHED_ROUTES: Dict[str, tuple] = {}
+
+KEY_PREFIX = 'api-response'
+TAG_PREFIX = 'api-tag'
+STATS_PREFIX = 'api-stats'
+
+
+def _cache():
+    return caches[getattr(settings, 'API_RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _timeout() -> int:
+    return getattr(settings, 'API_RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _tag_key(tag: str) -> str:
+    return f'{TAG_PREFIX}:{tag}'
+
+
+def _stat_key(route: str, outcome: str) -> str:
+    return f'{STATS_PREFIX}:{route}:{outcome}'
+
+
+def _increment(cache, key: str, initial: int = 1) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, initial, timeout=None):
+            cache.incr(key)
+
+
+def tag_versions(tags: Iterable[str]) -> List[int]:
+    """Current version of each tag, creating missing ones."""
+    cache = _cache()
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*tags: str) -> None:
+    """Orphan every cached response that depends on any of ``tags``."""
+    cache = _cache()
+    for tag in tags:
+        # an evicted version restarts from the clock, never from a value used before
+        _increment(cache, _tag_key(tag), initial=time.time_ns())
+
+
+def invalidate_model(model) -> None:
+    """Invalidate ``model``'s tags once the current transaction commits."""
+    tags = INVALIDATES.get(model)
+    if tags:
+        transaction.on_commit(lambda: invalidate(*tags))
+
+
+def response_key(route: str, tags, request) -> str:
+    query = sorted((name, sorted(values)) for name, values in request.GET.lists())
+    scope = getattr(request, 'auth', None)
+    digest = hashlib.sha1(repr((request.path, query, scope)).encode()).hexdigest()
+    versions = '.'.join(map(str, tag_versions(tags)))
+    return f'{KEY_PREFIX}:{route}:{versions}:{digest}'
+
+
+def _revalidate(request, response):
+    """A 304 for the cached response when the client already has it."""
+    etag = response.headers.get('ETag')
+    last_modified = parse_http_date_safe(response.headers.get('Last-Modified', ''))
+    if etag is None and last_modified is None:
+        return response
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is None:
+        return response
+    for header in ('ETag', 'Last-Modified'):
+        if header in response.headers:
+            not_modified.headers[header] = response.headers[header]
+    return not_modified
+
+
+def backend_stats() -> Dict[str, int]:
+    """This process's per-tier counters when the cache is a ``TieredCache``, else empty."""
+    return dict(getattr(_cache(), 'stats', {}))
+
+
+def cache_stats() -> List[dict]:
+    """
+    Hits, misses and hit rate of every cached route since its counters were
+    created; approximate when several processes share a file-based cache.
+    """
+    keys = [_stat_key(route, outcome) for route in CACHED_ROUTES for outcome in ('hits', 'misses')]
+    counts = _cache().get_many(keys)
+    stats = []
+    for route in CACHED_ROUTES:
+        hits = counts.get(_stat_key(route, 'hits'), 0)
+        misses = counts.get(_stat_key(route, 'misses'), 0)
+        total = hits + misses
+        stats.append({
+            'route': route, 'hits': hits, 'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+        })
+    return stats
+
+
+def cached(tags: Iterable[str]):
+    """Cache the route's ``200`` responses until one of ``tags`` is invalidated."""
+    tags = tuple(tags)
+
+    def decorator(view_func):
+        def bind_operation(operation):
+            run_view, run = operation.view_func, operation.run
+            route = f"{view_func.__module__.rsplit('.', 1)[-1]}.{view_func.__name__}"
+            CACHED_ROUTES[route] = tags
+
+            @wraps(run_view)
+            def lookup(request, *args, **kwargs):
+                if not _timeout():
+                    return run_view(request, *args, **kwargs)
+                cache = _cache()
+                key = response_key(route, tags, request)
+                entry = cache.get(key)
+                if entry is not None and not refresh_early(*entry[3:]):
+                    _increment(cache, _stat_key(route, 'hits'))
+                    status, content, headers = entry[:3]
+                    return _revalidate(request, HttpResponse(content, status=status, headers=headers))
+                _increment(cache, _stat_key(route, 'misses'))
+                request.response_cache_key = key
+                request.response_cache_started = time.monotonic()
+                return run_view(request, *args, **kwargs)
+
+            def store(request, **kw):
+                with primary_reads() if _timeout() else nullcontext():
+                    response = run(request, **kw)
+                key = getattr(request, 'response_cache_key', None)
+                if key is not None and response.status_code == 200 and not response.streaming:
+                    timeout = _timeout()
+                    # (status, body, headers, seconds it took to render, expiry) for refresh_early
+                    entry = (
+                        response.status_code, response.content, dict(response.items()),
+                        time.monotonic() - request.response_cache_started, time.time() + timeout,
+                    )
+                    _cache().set(key, entry, timeout)
+                return response
+
+            operation.view_func = lookup
+            operation.run = store
+
+        contribute_operation_callback(view_func, bind_operation)
+        return view_func
+
+    return decorator
+
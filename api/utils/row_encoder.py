@@ -0,0 +1,197 @@
+"""
+Model-free serialization for read-only list routes.
+
+Routes opted in with ``@projected(fast_path=True)`` fetch their page with
+``values_list()`` over exactly the columns the response schema needs and
+turn each tuple into the response dict with a :class:`RowEncoder` compiled
+once per (model, schema): no model instances and no per-row pydantic
+validation. Nested objects are read through joined column paths, nested
+lists with one extra ``values_list()`` query per relation, and computed
+properties run against a lightweight row object carrying only the columns
+listed in the model's ``PROJECTION_DEPENDENCIES``.
+
+Schemas the encoder cannot reproduce exactly (resolvers, undeclared
+properties, many-to-many fields, file fields) compile to ``None`` and the
+route keeps the regular pydantic path.
+"""
+
+import types
+from collections import defaultdict
+from functools import lru_cache
+from typing import Union, get_args, get_origin
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import FileField
+
+from api.utils.projection import SCHEMA_CACHE_SIZE, _source_name, nested_schema
+
+
+class Unsupported(Exception):
+    """Raised while compiling a schema the fast path cannot serialize exactly."""
+
+
+def _coercer(annotation):
+    """The conversion pydantic would apply to a scalar value, or ``None`` for none."""
+    optional = False
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        optional = len(args) < len(get_args(annotation))
+        annotation = args[0] if len(args) == 1 else None
+    if annotation not in (int, float, str, bool):
+        return None
+
+    def coerce(value):
+        if value is None and optional:
+            return None
+        return value if type(value) is annotation else annotation(value)
+
+    return coerce
+
+
+@lru_cache(maxsize=None)
+def _row_class(model):
+    """A plain class sharing ``model``'s properties and methods, to evaluate properties on."""
+    namespace = {
+        name: value for name, value in vars(model).items()
+        if not name.startswith('__') and isinstance(value, (property, types.FunctionType))
+    }
+    return type(f'{model.__name__}Row', (), namespace)
+
+
+class _Columns:
+    """The ``values_list()`` paths of an encoder, deduplicated."""
+
+    def __init__(self):
+        self.paths = []
+        self._index = {}
+
+    def add(self, path: str) -> int:
+        if path not in self._index:
+            self._index[path] = len(self.paths)
+            self.paths.append(path)
+        return self._index[path]
+
+
+def _compile(model, schema, prefix: str, columns: _Columns, many: list):
+    """Compile ``schema`` for ``model`` into a ``build(row) -> dict`` function."""
+    opts = model._meta
+    by_name = {field.name: field for field in opts.concrete_fields}
+    by_attname = {field.attname: field for field in opts.concrete_fields}
+    dependencies = getattr(model, 'PROJECTION_DEPENDENCIES', {})
+    if getattr(schema, '_ninja_resolvers', {}):
+        raise Unsupported(f"{schema.__name__} uses resolvers")
+
+    steps = []
+    row_attrs = {}  # attribute name -> column index, for computed properties
+    properties = []
+
+    for name, field_info in schema.model_fields.items():
+        source = _source_name(name, field_info)
+        nested, is_many = nested_schema(field_info.annotation)
+        field = by_name.get(source) or by_attname.get(source)
+
+        if field is not None and isinstance(field, FileField):
+            raise Unsupported(f"{model.__name__}.{source} is a file field")
+
+        if field is not None and field.is_relation and source == field.name:
+            if nested is None or is_many:
+                raise Unsupported(f"{model.__name__}.{source} is not serialized as a nested object")
+            path = prefix + field.name + '__'
+            pk_index = columns.add(path + field.related_model._meta.pk.attname)
+            build_child = _compile(field.related_model, nested, path, columns, None)
+            steps.append((name, _nested_getter(pk_index, build_child)))
+        elif field is not None:
+            steps.append((name, _column_getter(columns.add(prefix + field.attname), _coercer(field_info.annotation))))
+        elif source in dependencies:
+            for dependency in dependencies[source]:
+                dependency_field = opts.get_field(dependency)
+                if dependency_field.is_relation:
+                    raise Unsupported(f"{model.__name__}.{source} depends on a relation")
+                row_attrs[dependency_field.attname] = columns.add(prefix + dependency_field.attname)
+            getter = getattr(_row_class(model), source).fget
+            properties.append(name)
+            steps.append((name, _property_getter(getter, _coercer(field_info.annotation))))
+        else:
+            try:
+                relation = opts.get_field(source)
+            except FieldDoesNotExist:
+                relation = None
+            if many is None or relation is None or not relation.one_to_many or nested is None:
+                raise Unsupported(f"{model.__name__}.{source} cannot be read from columns")
+            many.append((name, relation, nested))
+            steps.append((name, None))
+
+    row_class = _row_class(model)
+    attr_items = tuple(row_attrs.items())
+
+    def build(row):
+        obj = None
+        if attr_items:
+            obj = row_class()
+            obj.__dict__.update((attr, row[index]) for attr, index in attr_items)
+        return {name: getter(row, obj) if getter is not None else None for name, getter in steps}
+
+    return build
+
+
+def _column_getter(index, coerce):
+    if coerce is None:
+        return lambda row, obj: row[index]
+    return lambda row, obj: coerce(row[index])
+
+
+def _nested_getter(pk_index, build_child):
+    return lambda row, obj: None if row[pk_index] is None else build_child(row)
+
+
+def _property_getter(fget, coerce):
+    if coerce is None:
+        return lambda row, obj: fget(obj)
+    return lambda row, obj: coerce(fget(obj))
+
+
+class RowEncoder:
+    """Serializes ``values_list()`` rows of ``model`` into ``schema``-shaped dicts."""
+
+    def __init__(self, model, schema, key: str = None):
+        columns = _Columns()
+        self.model = model
+        self.pk_index = columns.add(model._meta.pk.attname)
+        self.key_index = columns.add(key) if key else None
+        self.many = []
+        self.build = _compile(model, schema, '', columns, self.many)
+        self.children = [
+            (name, relation.field.attname, encoder_for(relation.related_model, nested, relation.field.attname))
+            for name, relation, nested in self.many
+        ]
+        if any(child is None for _, _, child in self.children):
+            raise Unsupported(f"a nested list of {model.__name__} cannot be encoded")
+        self.columns = tuple(columns.paths)
+
+    def queryset(self, queryset):
+        """``queryset`` narrowed to the encoder's columns, yielding tuples."""
+        return queryset.values_list(*self.columns)
+
+    def encode(self, rows):
+        rows = list(rows)
+        items = [self.build(row) for row in rows]
+        if self.children and rows:
+            ids = [row[self.pk_index] for row in rows]
+            for name, fk_attname, child in self.children:
+                related = child.model._default_manager.filter(**{f'{fk_attname}__in': ids})
+                child_rows = list(child.queryset(related))
+                grouped = defaultdict(list)
+                for child_row, child_item in zip(child_rows, child.encode(child_rows)):
+                    grouped[child_row[child.key_index]].append(child_item)
+                for row, item in zip(rows, items):
+                    item[name] = grouped.get(row[self.pk_index], [])
+        return items
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def encoder_for(model, schema, key: str = None):
+    """The compiled encoder for ``model``/``schema``, or ``None`` if the fast path cannot serve it."""
+    try:
+        return RowEncoder(model, schema, key)
+    except Unsupported:
+        return None
@@ -0,0 +1,155 @@
+"""
+Delta sync for offline-capable clients.
+
+``GET /sync/<resource>`` pages through the rows of a resource in
+``(updated_at, id)`` order (backed by an index on both columns) together
+with a feed of deletions from :class:`~api.models.sync.Tombstone`. Each
+response carries an opaque ``cursor``; the client stores it and sends it
+back, receiving only what changed or was deleted after it:
+
+1. First sync: no cursor (or ``updated_since=<ISO datetime>`` to start from
+   a known point). With no starting point the tombstone feed starts at the
+   current end, since the client has nothing to delete yet.
+2. While ``has_more`` is true, call again immediately with the new cursor.
+3. Later, call with the last cursor to pick up changes since then.
+
+Items use the resource's list schema with relations as IDs. Cursors older
+than ``settings.API_SYNC_TOMBSTONE_DAYS`` may have missed pruned tombstones
+and are rejected, so the client knows to sync from scratch.
+
+``updated_at`` and tombstone IDs are assigned when a row is written, but the
+row only becomes visible when its transaction commits, so a slow transaction
+can commit *behind* a cursor that was already handed out. Pages therefore
+stop at ``settings.API_SYNC_SETTLE_SECONDS`` before now: rows and
+tombstones written more recently are left for a later call. The guarantee
+is that no change is missed as long as every transaction commits within
+that window; the price is that changes reach clients that much later.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+
+from django.conf import settings
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from api.models.content import Content
+from api.models.document import Document
+from api.models.event import Event
+from api.models.expenses import Expense
+from api.models.payment import Invoice
+from api.models.property import Property
+from api.models.service import ServiceOrder
+from api.models.sync import Tombstone
+from api.utils.projection import plan_for, subset_schema
+from api.utils.row_encoder import encoder_for
+
+
+# resource name -> model; the /sync router pairs each with its list schema
+SYNC_RESOURCES = {
+    'invoices': Invoice,
+    'orders': ServiceOrder,
+    'events': Event,
+    'content': Content,
+    'properties': Property,
+    'documents': Document,
+    'expenses': Expense,
+}
+
+SyncResource = Literal['invoices', 'orders', 'events', 'content', 'properties', 'documents', 'expenses']
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def resource_for(model) -> Optional[str]:
+    for name, resource_model in SYNC_RESOURCES.items():
+        if resource_model is model:
+            return name
+    return None
+
+
+def encode_cursor(position: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        updated_at = datetime.fromisoformat(position['u']) if position['u'] else None
+        issued_at = datetime.fromisoformat(position['s'])
+        position = {'u': updated_at, 'i': int(position['i']), 't': int(position['t']), 's': issued_at}
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor")
+    retention = timedelta(days=getattr(settings, 'API_SYNC_TOMBSTONE_DAYS', 90))
+    if position['s'] < timezone.now() - retention:
+        raise InvalidCursor("Cursor expired; sync again without a cursor")
+    return position
+
+
+def _encode(queryset, schema, limit: int) -> list:
+    encoder = encoder_for(queryset.model, schema)
+    if encoder is not None:
+        return encoder.encode(encoder.queryset(queryset)[:limit])
+    queryset = plan_for(queryset.model, schema).apply(queryset)[:limit]
+    return [schema.model_validate(obj).model_dump() for obj in queryset]
+
+
+def sync_page(resource: str, schema, cursor: str = None, updated_since: datetime = None,
+              limit: int = DEFAULT_LIMIT) -> dict:
+    """
+    One page of changes and deletions for ``resource`` after ``cursor``, items shaped by ``schema``.
+
+    Raises :class:`InvalidCursor` for malformed or expired cursors.
+    """
+    model = SYNC_RESOURCES[resource]
+    limit = max(1, min(limit, MAX_LIMIT))
+    tombstones = Tombstone.objects.filter(resource=resource)
+    # writes after this may still be in uncommitted transactions
+    settled = timezone.now() - timedelta(seconds=getattr(settings, 'API_SYNC_SETTLE_SECONDS', 30))
+
+    if cursor:
+        position = decode_cursor(cursor)
+    else:
+        # the deletion feed starts after the last settled tombstone written before the starting point
+        start = min(updated_since, settled) if updated_since else settled
+        before = tombstones.filter(deleted_at__lte=start)
+        position = {'u': updated_since, 'i': 0, 't': before.aggregate(last=Max('id'))['last'] or 0}
+    tombstones = tombstones.filter(id__gt=position['t'])
+    # the feed follows ID order, so it stops before the first unsettled tombstone
+    unsettled = tombstones.filter(deleted_at__gt=settled).aggregate(first=Min('id'))['first']
+    if unsettled is not None:
+        tombstones = tombstones.filter(id__lt=unsettled)
+
+    rows = model.objects.filter(updated_at__lte=settled)
+    if position['u'] is not None:
+        rows = rows.filter(
+            Q(updated_at__gt=position['u']) | Q(updated_at=position['u'], id__gt=position['i'])
+        )
+    items = _encode(rows.order_by('updated_at', 'id'), subset_schema(schema, expand=()), limit + 1)
+    deleted = list(tombstones.order_by('id').values_list('id', 'object_id')[:limit + 1])
+    has_more = len(items) > limit or len(deleted) > limit
+    items, deleted = items[:limit], deleted[:limit]
+
+    if items:
+        position['u'], position['i'] = items[-1]['updated_at'], items[-1]['id']
+    if deleted:
+        position['t'] = deleted[-1][0]
+    next_cursor = encode_cursor({
+        'u': position['u'].isoformat() if position['u'] else None,
+        'i': position['i'],
+        't': position['t'],
+        's': timezone.now().isoformat(),
+    })
+    return {
+        'items': items,
+        'deleted': [object_id for _, object_id in deleted],
+        'cursor': next_cursor,
+        'has_more': has_more,
+    }
@@ -0,0 +1,156 @@
+"""
+Two-tier cache backend: a bounded in-process L1 in front of a shared L2.
+
+``TieredCache`` is configured as the ``default`` cache and composes two
+other aliases from ``settings.CACHES``:
+
+* ``LOCAL`` (L1) -- a ``LocMemCache`` bounded by ``MAX_ENTRIES``. It evicts
+  least recently used entries, so hot keys are served without a network or
+  disk round trip.
+* ``SHARED`` (L2) -- Redis in production, a file-based cache otherwise; it
+  holds the authoritative copy every process sees.
+
+Reads try L1, then L2 (filling L1 on the way back). Writes go to both.
+Atomic operations (``incr``, ``add``) run on L2 only and drop the L1 copy.
+
+``NAMESPACES`` maps the key prefix before the first ``:`` to a policy::
+
+    'api-response': {'TIMEOUT': 300, 'LOCAL_TIMEOUT': 30}
+
+``TIMEOUT`` applies when a caller does not pass one; ``LOCAL_TIMEOUT``
+caps how long L1 may serve a value another process could have replaced
+(``0`` keeps the namespace out of L1 entirely, as for invalidation
+versions).
+
+:func:`refresh_early` decides on probabilistic early refresh ("XFetch") for
+callers that store how long a value took to compute and when it expires,
+as :mod:`api.utils.response_cache` does: the closer an entry is to expiry,
+and the longer it took to compute, the more likely a reader recomputes it
+early, so a hot key is refreshed by one request instead of expiring under
+all of them at once.
+
+Hit/miss counters are kept per process in :attr:`TieredCache.stats`.
+"""
+
+import math
+import random
+import time
+from collections import Counter
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+_MISSING = object()
+
+DEFAULT_LOCAL_TIMEOUT = 30
+
+
+def refresh_early(delta: float, expires_at, beta: float = 1.0, now: float = None) -> bool:
+    """XFetch: whether to recompute a value that took ``delta`` seconds before ``expires_at``."""
+    if expires_at is None:
+        return False
+    now = time.time() if now is None else now
+    return now - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+class TieredCache(BaseCache):
+    """L1 (in-process LRU) + L2 (shared) cache; see the module docs."""
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.local_alias = options.get('LOCAL', 'local')
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.namespaces = options.get('NAMESPACES', {})
+        self.local_timeout = options.get('LOCAL_TIMEOUT', DEFAULT_LOCAL_TIMEOUT)
+        self.stats = Counter()
+
+    @property
+    def local(self):
+        return caches[self.local_alias]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _policy(self, key):
+        return self.namespaces.get(str(key).split(':', 1)[0], {})
+
+    def _timeouts(self, key, timeout):
+        """``(shared timeout, local timeout)`` for ``key``; a local timeout of 0 skips L1."""
+        policy = self._policy(key)
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = policy.get('TIMEOUT', self.default_timeout)
+        local_timeout = policy.get('LOCAL_TIMEOUT', self.local_timeout)
+        if timeout is not None and local_timeout:
+            local_timeout = min(local_timeout, timeout)
+        return timeout, local_timeout
+
+    def get(self, key, default=None, version=None):
+        _, local_timeout = self._timeouts(key, DEFAULT_TIMEOUT)
+        if local_timeout:
+            value = self.local.get(key, _MISSING, version=version)
+            if value is not _MISSING:
+                self.stats['local_hits'] += 1
+                return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.stats['misses'] += 1
+            return default
+        self.stats['shared_hits'] += 1
+        if local_timeout:
+            self.local.set(key, value, local_timeout, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        local_keys = [key for key in keys if self._timeouts(key, DEFAULT_TIMEOUT)[1]]
+        if local_keys:
+            found = self.local.get_many(local_keys, version=version)
+            self.stats['local_hits'] += len(found)
+        remaining = [key for key in keys if key not in found]
+        if remaining:
+            shared = self.shared.get_many(remaining, version=version)
+            self.stats['shared_hits'] += len(shared)
+            self.stats['misses'] += len(remaining) - len(shared)
+            for key, value in shared.items():
+                local_timeout = self._timeouts(key, DEFAULT_TIMEOUT)[1]
+                if local_timeout:
+                    self.local.set(key, value, local_timeout, version=version)
+            found.update(shared)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout, local_timeout = self._timeouts(key, timeout)
+        self.stats['sets'] += 1
+        self.shared.set(key, value, timeout, version=version)
+        if local_timeout:
+            self.local.set(key, value, local_timeout, version=version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout, _ = self._timeouts(key, timeout)
+        self.local.delete(key, version=version)
+        return self.shared.add(key, value, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout, _ = self._timeouts(key, timeout)
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.incr(key, delta, version=version)
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return self.local.has_key(key, version=version) or self.shared.has_key(key, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
@@ -0,0 +1,90 @@
+"""
+Bulk status transitions with a single conditional ``UPDATE``.
+
+Models opt in with a ``STATUS_TRANSITIONS`` mapping of target status to the
+statuses it may be reached from. :func:`bulk_transition` restricts the
+selected rows to those allowed sources and moves them with one
+``UPDATE ... WHERE status IN (...)``, so rows already in (or past) the target
+status are simply not counted rather than rejected.
+
+``QuerySet.update()`` skips ``save()`` and its signals, so ``auto_now``
+fields are set explicitly, cached responses are invalidated and live
+dashboard streams notified here, and counter-tracked models (see
+:mod:`api.utils.counters`) get their status counters adjusted here from a
+grouped count taken in the same transaction; a concurrent write in between
+is corrected by the next ``reconcile_stats`` run.
+"""
+
+import inspect
+from typing import Callable, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from api.utils import counters, live
+from api.utils.response_cache import invalidate_model
+
+
+def bulk_transition(queryset, target: str, field: str = 'status') -> int:
+    """
+    Move every row of ``queryset`` allowed to reach ``target`` there; return the row count.
+
+    Raises ``ValueError`` if the model does not allow ``target`` as a bulk transition.
+    """
+    model = queryset.model
+    sources = getattr(model, 'STATUS_TRANSITIONS', {}).get(target)
+    if sources is None:
+        raise ValueError(f"Cannot move {model._meta.verbose_name_plural} to '{target}' in bulk")
+
+    queryset = queryset.filter(**{f'{field}__in': sources})
+    values = {field: target}
+    now = timezone.now()
+    for model_field in model._meta.concrete_fields:
+        if getattr(model_field, 'auto_now', False):
+            values[model_field.name] = now
+
+    tracked = counters.TRACKED_MODELS.get(model)
+    with transaction.atomic():
+        if tracked is not None and tracked[1] == field:
+            moves = list(queryset.values_list(field).annotate(count=Count('pk')).order_by())
+            updated = queryset.update(**values)
+            deltas = {counters.status_key(tracked[0], target): updated}
+            for status, count in moves:
+                key = counters.status_key(tracked[0], status)
+                deltas[key] = deltas.get(key, 0) - count
+            counters.adjust(deltas)
+        else:
+            updated = queryset.update(**values)
+        # registered after the UPDATE so caches and live subscribers only see the committed rows
+        invalidate_model(model)
+        live.changed(model)
+    return updated
+
+
+def bulk_status(queryset, payload, filter_queryset: Callable) -> Tuple[int, dict]:
+    """
+    Handle a ``BulkStatusIn`` payload for a route.
+
+    ``filter_queryset`` is the list route's filter helper; ``payload.filters``
+    is passed to it as keyword arguments. Returns ``(status_code, body)``.
+    """
+    if not payload.ids and not payload.filters:
+        return 400, {'detail': "Provide ids and/or filters to select the rows to update"}
+    if payload.ids:
+        queryset = queryset.filter(pk__in=payload.ids)
+    if payload.filters:
+        known = list(inspect.signature(filter_queryset).parameters)[1:]
+        unknown = sorted(set(payload.filters) - set(known))
+        if unknown:
+            return 400, {'detail': f"Unknown filter(s): {', '.join(unknown)}"}
+    try:
+        if payload.filters:
+            queryset = filter_queryset(queryset, **payload.filters)
+        updated = bulk_transition(queryset, payload.status)
+    except ValidationError as e:  # e.g. a malformed date filter
+        return 400, {'detail': e.messages[0]}
+    except ValueError as e:  # e.g. a non-numeric ID filter, or a disallowed target status
+        return 400, {'detail': str(e)}
+    return 200, {'status': payload.status, 'updated': updated}
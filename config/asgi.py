@@ -2,6 +2,9 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve through it (e.g. ``uvicorn config.asgi:application``) to hold the
+long-lived ``/api/v1/stats/stream`` connections on the event loop instead of
+one worker thread each.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
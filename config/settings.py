@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import tempfile
+from importlib.util import find_spec
 from pathlib import Path
 from decouple import config, Csv
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -50,7 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",  # Add WhiteNoise for static files
+    "api.utils.middleware.AsyncWhiteNoiseMiddleware",  # WhiteNoise for static files, async-capable for ASGI
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -58,6 +61,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.utils.replicas.ReplicaMiddleware",  # safe requests read from replicas, when configured
     "api.utils.middleware.ResponseFormaterMiddleware",
 ]
 
@@ -94,6 +98,23 @@ if TRY_LOCAL_DB:
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+
+    # Performance mode for edge and demo installs with concurrent writers: WAL
+    # lets reads run alongside a write, writes take the lock up front (BEGIN
+    # IMMEDIATE) and wait up to the busy timeout for it instead of failing with
+    # "database is locked". The pragmas run on every new connection (see the
+    # bench_sqlite command)
+    if config('SQLITE_PERFORMANCE_MODE', default=True, cast=bool):
+        DATABASES["default"]["OPTIONS"] = {
+            "timeout": config('SQLITE_BUSY_TIMEOUT', default=20, cast=int),
+            "transaction_mode": "IMMEDIATE",
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                f"PRAGMA mmap_size={config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int)};"
+                "PRAGMA temp_store=MEMORY;"
+            ),
+        }
 else:
     # Use PostgreSQL from environment variables
     DATABASES = {
@@ -104,9 +125,45 @@ else:
             "PASSWORD": config('DATABASES_DEFAULT_PASSWORD'),
             "HOST": config('DATABASES_DEFAULT_HOST'),
             "PORT": config('DATABASES_DEFAULT_PORT', default='5432'),
+            # keep connections open across requests, checked before reuse
+            "CONN_MAX_AGE": config('DATABASES_CONN_MAX_AGE', default=60, cast=int),
+            "CONN_HEALTH_CHECKS": config('DATABASES_CONN_HEALTH_CHECKS', default=True, cast=bool),
         }
     }
 
+    # Optional psycopg 3 connection pool, one per worker process and alias: each
+    # server's connection budget is split across WEB_CONCURRENCY workers. Django
+    # requires CONN_MAX_AGE = 0 with a pool (see api.utils.db_connections)
+    DATABASES_POOL = config('DATABASES_POOL', default=False, cast=bool)
+    if DATABASES_POOL and not (find_spec("psycopg") and find_spec("psycopg_pool")):
+        raise ImproperlyConfigured("DATABASES_POOL requires psycopg 3 and psycopg_pool (pip install 'psycopg[pool]')")
+
+    def pool_options(max_connections):
+        """Per-worker pool sizing for a server accepting ``max_connections``."""
+        max_size = max(1, max_connections // config('WEB_CONCURRENCY', default=1, cast=int))
+        return {
+            "pool": {
+                "min_size": min(config('DATABASES_POOL_MIN_SIZE', default=2, cast=int), max_size),
+                "max_size": max_size,
+                "timeout": config('DATABASES_POOL_TIMEOUT', default=10, cast=int),
+            },
+        }
+
+    if DATABASES_POOL:
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"] = pool_options(config('DATABASES_MAX_CONNECTIONS', default=90, cast=int))
+
+    # Streaming read replicas of the default database, as comma-separated hosts;
+    # each becomes a "replica_<n>" alias for safe requests (see api.utils.replicas).
+    # A replica is its own server, so its pool is sized from its own budget
+    for index, host in enumerate(config('DATABASES_REPLICA_HOSTS', default='', cast=Csv()), 1):
+        replica = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+        if DATABASES_POOL:
+            replica["OPTIONS"] = pool_options(config('DATABASES_REPLICA_MAX_CONNECTIONS', default=90, cast=int))
+        DATABASES[f"replica_{index}"] = replica
+
+DATABASE_ROUTERS = ["api.utils.replicas.ReplicaRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -149,6 +206,37 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# API JSON datetime format: "django" (DjangoJSONEncoder compatible), "iso"
+# (full RFC 3339 precision) or a strftime pattern (see api.utils.renderers)
+API_JSON_DATETIME_FORMAT = config('API_JSON_DATETIME_FORMAT', default='django')
+
+# Lifetime in seconds of cached route responses; 0 disables the cache
+# (see api.utils.response_cache)
+API_RESPONSE_CACHE_TIMEOUT = config('API_RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Days deletions are kept for /sync clients; older sync cursors are rejected
+# (see api.utils.sync and the prune_tombstones command)
+API_SYNC_TOMBSTONE_DAYS = config('API_SYNC_TOMBSTONE_DAYS', default=90, cast=int)
+
+# Seconds /sync stays behind now, so rows written by transactions that had not
+# committed yet are not skipped; transactions must commit within this window
+API_SYNC_SETTLE_SECONDS = config('API_SYNC_SETTLE_SECONDS', default=30, cast=int)
+
+# /stats/stream: seconds between full recomputes (to see other processes'
+# writes) and between keep-alive comments (see api.utils.live)
+API_LIVE_REFRESH_SECONDS = config('API_LIVE_REFRESH_SECONDS', default=30, cast=int)
+API_LIVE_HEARTBEAT_SECONDS = config('API_LIVE_HEARTBEAT_SECONDS', default=15, cast=int)
+
+# Read replicas: seconds a client reads from the primary after a write, and the
+# replay lag beyond which a replica is skipped (see api.utils.replicas); the pin
+# is never shorter than the allowed lag plus the 5 s between lag probes
+API_REPLICA_PIN_SECONDS = config('API_REPLICA_PIN_SECONDS', default=15, cast=int)
+API_REPLICA_MAX_LAG_SECONDS = config('API_REPLICA_MAX_LAG_SECONDS', default=10, cast=float)
+
+# Months of payment/expense partitions kept created ahead of today, when those
+# tables are partitioned (see api.utils.partitions and the partitions command)
+API_PARTITION_MONTHS_AHEAD = config('API_PARTITION_MONTHS_AHEAD', default=3, cast=int)
+
 
 
 FLUTTER_LOCAL_ORIGINS = [
@@ -210,3 +298,56 @@ if not DEBUG:
     SECURE_CONTENT_TYPE_NOSNIFF = True
     SECURE_BROWSER_XSS_FILTER = True
     X_FRAME_OPTIONS = 'DENY'
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# "default" is a two-tier cache (see api.utils.tiered_cache): a bounded
+# in-process LRU ("local") in front of a shared cache ("shared") that is
+# Redis when REDIS_URL is set (requires the redis package) and a file-based
+# cache otherwise. Namespace TTLs apply to keys by their prefix. The file-based
+# cache has no atomic incr, so with several processes the /stats/cache hit and
+# miss counts are approximate; use Redis where they matter.
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": config('CACHE_DIR', default=str(Path(tempfile.gettempdir()) / 'bomach-cache')),
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": "api.utils.tiered_cache.TieredCache",
+        "TIMEOUT": 300,
+        "OPTIONS": {
+            "LOCAL": "local",
+            "SHARED": "shared",
+            "LOCAL_TIMEOUT": config('CACHE_LOCAL_TIMEOUT', default=30, cast=int),
+            "NAMESPACES": {
+                # rendered route responses; keys carry their tag versions
+                "api-response": {"TIMEOUT": API_RESPONSE_CACHE_TIMEOUT},
+                # invalidation versions and hit counters must be read from the shared tier
+                "api-tag": {"TIMEOUT": None, "LOCAL_TIMEOUT": 0},
+                "api-stats": {"TIMEOUT": None, "LOCAL_TIMEOUT": 0},
+                # service catalog snapshots by version; each process keeps its own rendered copies
+                "api-catalog": {"TIMEOUT": 24 * 60 * 60, "LOCAL_TIMEOUT": 0},
+                # read-your-writes pins must be seen by every process at once
+                "api-pin": {"LOCAL_TIMEOUT": 0},
+            },
+        },
+    },
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bomach-l1",
+        "OPTIONS": {"MAX_ENTRIES": config('CACHE_LOCAL_MAX_ENTRIES', default=5000, cast=int)},
+    },
+    "shared": SHARED_CACHE,
+}